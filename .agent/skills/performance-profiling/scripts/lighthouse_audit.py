@@ -2,18 +2,52 @@
 """
 Skill: performance-profiling
 Script: lighthouse_audit.py
-Purpose: Run Lighthouse performance audit on a URL
+Purpose: Run Lighthouse performance audit on a URL (or a batch of routes)
 Usage: python lighthouse_audit.py https://example.com
-Output: JSON with performance scores
+       python lighthouse_audit.py http://localhost:4173 --routes /,/pricing,/login --runs 3 --workers 2
+           [--preset mobile|desktop|slow-4g|3g|none] [--budget budget.json]
+           [--baseline previous.json] [--json summary.json] [--html summary.html]
+Output: JSON with performance scores; batch mode prints a summary and exits 1 on budget failures
 Note: Requires lighthouse CLI (npm install -g lighthouse)
+
+Budget file: {"*": {"performance": 90, "lcp_ms": 2500}, "/pricing": {"tbt_ms": 300}}
+Scores are minimums, metrics (*_ms, cls, *_kb) are maximums; "*" applies to every route.
 """
 import subprocess
 import json
 import sys
 import os
+import argparse
+import statistics
 import tempfile
+import html
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+SCORE_KEYS = ("performance", "accessibility", "best_practices", "seo")
+
+# Lighthouse audit id -> summary metric name
+METRIC_AUDITS = {
+    "first-contentful-paint": "fcp_ms",
+    "largest-contentful-paint": "lcp_ms",
+    "total-blocking-time": "tbt_ms",
+    "cumulative-layout-shift": "cls",
+    "speed-index": "speed_index_ms",
+    "interactive": "tti_ms",
+}
+
+# Extra CLI flags per throttling preset ("mobile" is Lighthouse's default simulated 4G)
+THROTTLING_PRESETS = {
+    "mobile": [],
+    "desktop": ["--preset=desktop"],
+    "slow-4g": ["--throttling.rttMs=150", "--throttling.throughputKbps=1638.4",
+                "--throttling.cpuSlowdownMultiplier=4"],
+    "3g": ["--throttling.rttMs=300", "--throttling.throughputKbps=700",
+           "--throttling.cpuSlowdownMultiplier=4"],
+    "none": ["--throttling-method=provided"],
+}
 
-def run_lighthouse(url: str) -> dict:
+def run_lighthouse(url: str, preset: str = "mobile", timeout: int = 120) -> dict:
     """Run Lighthouse audit on URL."""
     try:
         with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
@@ -25,12 +59,14 @@ def run_lighthouse(url: str) -> dict:
                 url,
                 "--output=json",
                 f"--output-path={output_path}",
-                "--chrome-flags=--headless",
-                "--only-categories=performance,accessibility,best-practices,seo"
+                # Each run gets its own headless Chrome, so parallel runs don't share state
+                "--chrome-flags=--headless --no-first-run",
+                "--only-categories=performance,accessibility,best-practices,seo",
+                *THROTTLING_PRESETS[preset]
             ],
             capture_output=True,
             text=True,
-            timeout=120
+            timeout=timeout
         )
         
         if os.path.exists(output_path):
@@ -39,6 +75,7 @@ def run_lighthouse(url: str) -> dict:
             os.unlink(output_path)
             
             categories = report.get("categories", {})
+            audits = report.get("audits", {})
             return {
                 "url": url,
                 "scores": {
@@ -47,6 +84,7 @@ def run_lighthouse(url: str) -> dict:
                     "best_practices": int(categories.get("best-practices", {}).get("score", 0) * 100),
                     "seo": int(categories.get("seo", {}).get("score", 0) * 100)
                 },
+                "metrics": get_metrics(audits),
                 "summary": get_summary(categories)
             }
         else:
@@ -57,6 +95,18 @@ def run_lighthouse(url: str) -> dict:
     except FileNotFoundError:
         return {"error": "Lighthouse CLI not found. Install with: npm install -g lighthouse"}
 
+def get_metrics(audits: dict) -> dict:
+    """Lab metrics and transfer sizes from the audits section."""
+    metrics = {}
+    for audit_id, name in METRIC_AUDITS.items():
+        value = audits.get(audit_id, {}).get("numericValue")
+        if value is not None:
+            metrics[name] = round(value, 3 if name == "cls" else 0)
+    for item in audits.get("resource-summary", {}).get("details", {}).get("items", []):
+        if item.get("resourceType") in ("total", "script", "image", "stylesheet"):
+            metrics[f"{item['resourceType']}_kb"] = round(item.get("transferSize", 0) / 1024, 1)
+    return metrics
+
 def get_summary(categories: dict) -> str:
     """Generate summary based on scores."""
     perf = categories.get("performance", {}).get("score", 0) * 100
@@ -67,10 +117,157 @@ def get_summary(categories: dict) -> str:
     else:
         return "[X] Poor performance"
 
+def aggregate_runs(runs: list) -> dict:
+    """Median of every score and metric across successful runs of one route."""
+    ok = [r for r in runs if "error" not in r]
+    if not ok:
+        return {"runs": 0, "errors": [r["error"] for r in runs]}
+    scores = {k: statistics.median(r["scores"][k] for r in ok) for k in SCORE_KEYS}
+    names = sorted({name for r in ok for name in r.get("metrics", {})})
+    metrics = {
+        name: statistics.median(r["metrics"][name] for r in ok if name in r["metrics"])
+        for name in names
+    }
+    spread = [r["scores"]["performance"] for r in ok]
+    return {
+        "runs": len(ok),
+        "errors": [r["error"] for r in runs if "error" in r],
+        "scores": scores,
+        "metrics": metrics,
+        "performance_range": [min(spread), max(spread)],
+    }
+
+def run_batch(base_url: str, routes: list, runs: int = 3, workers: int = 2,
+              preset: str = "mobile", timeout: int = 120) -> dict:
+    """Audits every route `runs` times with at most `workers` Chrome instances at once."""
+    jobs = [(route, i) for i in range(runs) for route in routes]
+    results = {route: [] for route in routes}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(run_lighthouse, base_url.rstrip("/") + route, preset, timeout): route
+            for route, _ in jobs
+        }
+        for future, route in futures.items():
+            results[route].append(future.result())
+    return {route: aggregate_runs(route_runs) for route, route_runs in results.items()}
+
+def check_budgets(routes: dict, budget: dict) -> list:
+    """Budget violations as strings; scores must be >= budget, metrics <= budget."""
+    violations = []
+    for route, data in routes.items():
+        limits = {**budget.get("*", {}), **budget.get(route, {})}
+        data["budget"] = {}
+        for key, limit in limits.items():
+            if key in SCORE_KEYS:
+                value = data.get("scores", {}).get(key)
+                failed = value is not None and value < limit
+            else:
+                value = data.get("metrics", {}).get(key)
+                failed = value is not None and value > limit
+            if value is None:
+                continue
+            data["budget"][key] = {"limit": limit, "value": value, "pass": not failed}
+            if failed:
+                violations.append(f"{route}: {key} {value:g} (budget {limit:g})")
+    return violations
+
+def add_deltas(routes: dict, baseline: dict) -> None:
+    """Score and metric changes against a previous summary's medians."""
+    for route, data in routes.items():
+        before = baseline.get("routes", {}).get(route)
+        if not before or not data.get("runs") or not before.get("runs"):
+            continue
+        data["delta"] = {
+            **{k: data["scores"][k] - before["scores"][k] for k in SCORE_KEYS if k in before["scores"]},
+            **{k: round(v - before["metrics"][k], 3) for k, v in data["metrics"].items() if k in before["metrics"]},
+        }
+
+def write_html(summary: dict, path: str) -> None:
+    columns = list(SCORE_KEYS) + ["lcp_ms", "fcp_ms", "tbt_ms", "cls", "script_kb", "total_kb"]
+    rows = []
+    for route, data in summary["routes"].items():
+        cells = [f"<td>{html.escape(route)}</td><td>{data.get('runs', 0)}</td>"]
+        for key in columns:
+            value = data.get("scores", {}).get(key, data.get("metrics", {}).get(key))
+            if value is None:
+                cells.append("<td>-</td>")
+                continue
+            budget = data.get("budget", {}).get(key)
+            css = "" if not budget else (' class="pass"' if budget["pass"] else ' class="fail"')
+            delta = data.get("delta", {}).get(key)
+            delta_html = f' <small>({delta:+g})</small>' if delta else ""
+            cells.append(f"<td{css}>{value:g}{delta_html}</td>")
+        rows.append("<tr>" + "".join(cells) + "</tr>")
+    violations = "".join(f"<li>{html.escape(v)}</li>" for v in summary["violations"]) or "<li>none</li>"
+    header = "".join(f"<th>{key}</th>" for key in ["route", "runs"] + columns)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"""<!doctype html><html><head><meta charset="utf-8"><title>Lighthouse summary</title>
+<style>body{{font-family:sans-serif}}table{{border-collapse:collapse}}td,th{{border:1px solid #ccc;padding:4px 8px;text-align:right}}
+td:first-child{{text-align:left}}.pass{{background:#e6f4ea}}.fail{{background:#fce8e6}}small{{color:#666}}</style></head><body>
+<h1>Lighthouse summary</h1><p>{html.escape(summary['base_url'])} &middot; preset {summary['preset']} &middot;
+median of {summary['runs_per_route']} runs &middot; {summary['timestamp']}</p>
+<table><tr>{header}</tr>{''.join(rows)}</table><h2>Budget violations</h2><ul>{violations}</ul></body></html>""")
+
+def print_batch(summary: dict) -> None:
+    print(f"Lighthouse ({summary['preset']}, median of {summary['runs_per_route']}) on {summary['base_url']}")
+    print(f"{'route':<28}{'perf':>6}{'a11y':>6}{'lcp_ms':>9}{'tbt_ms':>9}{'cls':>7}{'js_kb':>8}")
+    for route, data in summary["routes"].items():
+        if not data.get("runs"):
+            print(f"{route[:27]:<28}  [X] {data['errors'][0][:80] if data['errors'] else 'no runs'}")
+            continue
+        s, m = data["scores"], data["metrics"]
+        print(f"{route[:27]:<28}{s['performance']:>6g}{s['accessibility']:>6g}{m.get('lcp_ms', 0):>9g}"
+              f"{m.get('tbt_ms', 0):>9g}{m.get('cls', 0):>7g}{m.get('script_kb', 0):>8g}")
+    for violation in summary["violations"]:
+        print(f"[X] {violation}")
+    if not summary["violations"]:
+        print("[OK] All routes within budget")
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print(json.dumps({"error": "Usage: python lighthouse_audit.py <url>"}))
+        print(json.dumps({"error": "Usage: python lighthouse_audit.py <url> [--routes /,/pricing ...]"}))
         sys.exit(1)
     
-    result = run_lighthouse(sys.argv[1])
-    print(json.dumps(result, indent=2))
+    parser = argparse.ArgumentParser(description="Lighthouse audit (single URL or batch of routes)")
+    parser.add_argument("url")
+    parser.add_argument("--routes", help="Comma-separated paths appended to url (enables batch mode)")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per route; the median is reported")
+    parser.add_argument("--workers", type=int, default=2, help="Parallel Chrome instances")
+    parser.add_argument("--preset", choices=sorted(THROTTLING_PRESETS), default="mobile")
+    parser.add_argument("--timeout", type=int, default=120, help="Seconds per Lighthouse run")
+    parser.add_argument("--budget", help="Budget JSON file")
+    parser.add_argument("--baseline", help="Previous --json summary to compute deltas against")
+    parser.add_argument("--json", dest="json_path", help="Write the summary as JSON")
+    parser.add_argument("--html", dest="html_path", help="Write the summary as HTML")
+    args = parser.parse_args()
+    
+    if not args.routes:
+        result = run_lighthouse(args.url, args.preset, args.timeout)
+        print(json.dumps(result, indent=2))
+        sys.exit(0)
+    
+    routes = [r.strip() for r in args.routes.split(",") if r.strip()]
+    summary = {
+        "base_url": args.url,
+        "preset": args.preset,
+        "runs_per_route": args.runs,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "routes": run_batch(args.url, routes, args.runs, args.workers, args.preset, args.timeout),
+    }
+    budget = {}
+    if args.budget:
+        with open(args.budget, "r") as f:
+            budget = json.load(f)
+    summary["violations"] = check_budgets(summary["routes"], budget)
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            add_deltas(summary["routes"], json.load(f))
+    
+    print_batch(summary)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(summary, f, indent=2)
+    if args.html_path:
+        write_html(summary, args.html_path)
+    failed = summary["violations"] or any(not d.get("runs") for d in summary["routes"].values())
+    sys.exit(1 if failed else 0)
@@ -3,8 +3,8 @@
 Skill: webapp-testing
 Script: playwright_runner.py
 Purpose: Run basic Playwright browser tests
-Usage: python playwright_runner.py <url> [--screenshot]
-Output: JSON with page info, health status, and optional screenshot path
+Usage: python playwright_runner.py <url> [--screenshot] [--network] [--har out.har]
+Output: JSON with page info, health status, optional screenshot path and network report
 Note: Requires playwright (pip install playwright && playwright install chromium)
 Screenshots: Saved to system temp directory (auto-cleaned by OS)
 """
@@ -13,6 +13,7 @@ import json
 import os
 import tempfile
 from datetime import datetime
+from urllib.parse import urlsplit, parse_qsl
 
 # Fix Windows console encoding for Unicode output
 try:
@@ -28,8 +29,159 @@ except ImportError:
     PLAYWRIGHT_AVAILABLE = False
 
 
-def run_basic_test(url: str, take_screenshot: bool = False) -> dict:
-    """Run basic browser test on URL."""
+# Two requests form a serial step when the second starts within this many ms
+# after the first one finished (i.e. it was most likely waiting for it)
+WATERFALL_GAP_MS = 50
+
+
+def classify_request(url: str) -> str:
+    """Supabase resource a request hits: table:<t>, rpc:<fn>, function:<fn>, storage:<bucket>, auth, or other."""
+    path = urlsplit(url).path
+    parts = [p for p in path.split("/") if p]
+    if len(parts) >= 3 and parts[0] == "rest" and parts[2] == "rpc":
+        return f"rpc:{parts[3]}" if len(parts) > 3 else "rpc"
+    if len(parts) >= 3 and parts[0] == "rest":
+        return f"table:{parts[2]}"
+    if len(parts) >= 3 and parts[0] == "functions":
+        return f"function:{parts[2]}"
+    if len(parts) >= 2 and parts[0] == "storage":
+        bucket = parts[4] if len(parts) > 4 and parts[2] == "object" else (parts[3] if len(parts) > 3 else "")
+        return f"storage:{bucket}"
+    if parts and parts[0] == "auth":
+        return "auth"
+    return "other"
+
+
+def critical_path(requests: list, gap_ms: float = WATERFALL_GAP_MS) -> dict:
+    """Longest chain of requests where each one starts right after the previous one ends."""
+    ordered = sorted(requests, key=lambda r: r["start"])
+    best = []  # (chain_ms, previous_index)
+    for j, req in enumerate(ordered):
+        length, prev = req["end"] - req["start"], None
+        for i in range(j):
+            before = ordered[i]
+            if before["end"] <= req["start"] <= before["end"] + gap_ms:
+                candidate = best[i][0] + (req["end"] - req["start"]) + (req["start"] - before["end"])
+                if candidate > length:
+                    length, prev = candidate, i
+        best.append((length, prev))
+
+    if not best:
+        return {"ms": 0, "hops": 0, "chain": []}
+    j = max(range(len(best)), key=lambda k: best[k][0])
+    chain = []
+    while j is not None:
+        chain.append(ordered[j])
+        j = best[j][1]
+    chain.reverse()
+    return {
+        "ms": round(chain[-1]["end"] - chain[0]["start"], 1),
+        "hops": len(chain),
+        "chain": [f"{r['method']} {r['resource']} ({r['end'] - r['start']:.0f}ms)" for r in chain],
+    }
+
+
+def analyze_network(requests: list, gap_ms: float = WATERFALL_GAP_MS) -> dict:
+    """Groups Supabase calls per table/RPC and finds waterfalls, duplicates and batch candidates.
+
+    requests: dicts with url, method, start, end (ms since navigation), status, post_data.
+    """
+    api = [r for r in requests if r["resource"] != "other"]
+    groups = {}
+    for r in api:
+        g = groups.setdefault(r["resource"], {"count": 0, "total_ms": 0.0, "methods": set()})
+        g["count"] += 1
+        g["total_ms"] += r["end"] - r["start"]
+        g["methods"].add(r["method"])
+
+    # Same request sent more than once: cache it or lift it into shared state
+    seen = {}
+    for r in api:
+        seen.setdefault((r["method"], r["url"], r.get("post_data")), []).append(r)
+    duplicates = [
+        {"request": f"{method} {url}", "times": len(reqs), "wasted_ms": round(sum(x["end"] - x["start"] for x in reqs[1:]), 1)}
+        for (method, url, _), reqs in seen.items() if len(reqs) > 1
+    ]
+
+    # Several GETs on one table with different filters: one `in.()` / `or=()` query would do
+    batchable = []
+    for resource in groups:
+        gets = [r for r in api if r["resource"] == resource and r["method"] == "GET"]
+        variants = {urlsplit(r["url"]).query for r in gets}
+        if resource.startswith("table:") and len(variants) > 1:
+            filters = sorted({k for r in gets for k, _ in parse_qsl(urlsplit(r["url"]).query) if k != "select"})
+            batchable.append({"resource": resource, "requests": len(gets), "distinct_queries": len(variants),
+                              "filters": filters})
+
+    path = critical_path(api, gap_ms)
+    serial = path["chain"] if path["hops"] >= 3 else []
+
+    span = (max(r["end"] for r in api) - min(r["start"] for r in api)) if api else 0
+    return {
+        "requests": len(requests),
+        "api_requests": len(api),
+        "api_span_ms": round(span, 1),
+        "groups": {
+            k: {"count": v["count"], "total_ms": round(v["total_ms"], 1), "methods": sorted(v["methods"])}
+            for k, v in sorted(groups.items(), key=lambda item: -item[1]["count"])
+        },
+        "critical_path": path,
+        "serial_waterfall": serial,
+        "duplicates": sorted(duplicates, key=lambda d: -d["times"]),
+        "batch_candidates": batchable,
+    }
+
+
+def _network_recorder(page, navigations: list):
+    """Hooks page events; each main-frame navigation gets its own request list."""
+    def on_navigated(frame):
+        if frame == page.main_frame:
+            navigations.append({"url": frame.url, "requests": []})
+
+    def on_done(request, failed=False):
+        if not navigations:
+            return
+        timing = request.timing
+        started = timing.get("startTime") or 0
+        end = timing.get("responseEnd", -1)
+        try:
+            response = None if failed else request.response()
+        except Exception:
+            response = None
+        navigations[-1]["requests"].append({
+            "url": request.url,
+            "method": request.method,
+            "type": request.resource_type,
+            "resource": classify_request(request.url),
+            "epoch_start": started,
+            "duration": end if end >= 0 else 0,
+            "status": response.status if response else None,
+            "failed": failed,
+            "post_data": request.post_data,
+        })
+
+    page.on("framenavigated", on_navigated)
+    page.on("requestfinished", on_done)
+    page.on("requestfailed", lambda request: on_done(request, failed=True))
+
+
+def _network_report(navigations: list) -> list:
+    pages = []
+    for nav in navigations:
+        requests = nav["requests"]
+        if not requests:
+            continue
+        origin = min(r["epoch_start"] for r in requests)
+        for r in requests:
+            r["start"] = r["epoch_start"] - origin
+            r["end"] = r["start"] + r["duration"]
+        pages.append({"page": nav["url"], **analyze_network(requests)})
+    return pages
+
+
+def run_basic_test(url: str, take_screenshot: bool = False, capture_network: bool = False,
+                   har_path: str = None) -> dict:
+    """Run basic browser test on URL (optionally with a per-navigation network report)."""
     if not PLAYWRIGHT_AVAILABLE:
         return {
             "error": "Playwright not installed",
@@ -47,9 +199,13 @@ def run_basic_test(url: str, take_screenshot: bool = False) -> dict:
             browser = p.chromium.launch(headless=True)
             context = browser.new_context(
                 viewport={"width": 1280, "height": 720},
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+                record_har_path=har_path
             )
             page = context.new_page()
+            navigations = []
+            if capture_network:
+                _network_recorder(page, navigations)
             
             # Navigate
             response = page.goto(url, wait_until="networkidle", timeout=30000)
@@ -99,7 +255,14 @@ def run_basic_test(url: str, take_screenshot: bool = False) -> dict:
                 "forms": page.locator("form").count()
             }
             
+            if capture_network:
+                result["network"] = _network_report(navigations)
+            
+            # Closing the context flushes the HAR file
+            context.close()
             browser.close()
+            if har_path:
+                result["har"] = har_path
             
             result["status"] = "success" if result["health"]["loaded"] else "failed"
             result["summary"] = "[OK] Page loaded successfully" if result["status"] == "success" else "[X] Page failed to load"
@@ -152,11 +315,12 @@ def run_accessibility_check(url: str) -> dict:
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print(json.dumps({
-            "error": "Usage: python playwright_runner.py <url> [--screenshot] [--a11y]",
+            "error": "Usage: python playwright_runner.py <url> [--screenshot] [--a11y] [--network] [--har out.har]",
             "examples": [
                 "python playwright_runner.py https://example.com",
                 "python playwright_runner.py https://example.com --screenshot",
-                "python playwright_runner.py https://example.com --a11y"
+                "python playwright_runner.py https://example.com --a11y",
+                "python playwright_runner.py http://localhost:5173/dashboard --network --har dashboard.har"
             ]
         }, indent=2))
         sys.exit(1)
@@ -164,10 +328,12 @@ if __name__ == "__main__":
     url = sys.argv[1]
     take_screenshot = "--screenshot" in sys.argv
     check_a11y = "--a11y" in sys.argv
+    har_path = sys.argv[sys.argv.index("--har") + 1] if "--har" in sys.argv[:-1] else None
+    capture_network = "--network" in sys.argv or har_path is not None
     
     if check_a11y:
         result = run_accessibility_check(url)
     else:
-        result = run_basic_test(url, take_screenshot)
+        result = run_basic_test(url, take_screenshot, capture_network, har_path)
     
     print(json.dumps(result, indent=2))
@@ -1,24 +1,21 @@
-from PIL import Image
+import os
+import sys
 
-def is_grayscale(c, tolerance=10):
-    return abs(c[0] - c[1]) < tolerance and abs(c[1] - c[2]) < tolerance
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from palette import extract_palette, load_pixels  # noqa: E402
+
+DEFAULT_IMAGE = r"C:\Users\ראובן שאנס\.gemini\antigravity\brain\99ac1980-6de9-43da-ab2f-6a2109df3e4a\uploaded_image_1768420762604.png"
+
+
+def analyze(path=DEFAULT_IMAGE):
+    # bits=8 keeps every distinct color, like the old getcolors() scan, but counts them with bincount
+    pixels = load_pixels(path, max_pixels=None)
+    candidates = extract_palette(pixels, top=5, bits=8, min_alpha=0, gray_tolerance=20)
 
-def analyze():
-    img = Image.open(r"C:\Users\ראובן שאנס\.gemini\antigravity\brain\99ac1980-6de9-43da-ab2f-6a2109df3e4a\uploaded_image_1768420762604.png").convert("RGBA")
-    colors = img.getcolors(maxcolors=1000000)
-    
-    # Filter out grayscale
-    candidates = []
-    for count, color in colors:
-        if not is_grayscale(color[:3], tolerance=20):
-            candidates.append((count, color))
-            
-    # Sort by count desc
-    candidates.sort(key=lambda x: x[0], reverse=True)
-    
     print("Top 5 non-grayscale colors:")
-    for count, color in candidates[:5]:
-        print(f"Count: {count}, Color: {color}")
+    for color in candidates:
+        print(f"Count: {color['count']}, Color: {tuple(color['rgb'])} {color['hex']}")
+
 
 if __name__ == "__main__":
-    analyze()
+    analyze(*sys.argv[1:2])
@@ -1,6 +1,9 @@
 from PIL import Image
+import numpy as np
 import os
 
+from palette import extract_palette
+
 def analyze_pixels(input_path):
     img = Image.open(input_path)
     img = img.convert("RGBA")
@@ -9,11 +12,14 @@ def analyze_pixels(input_path):
     print(f"Analyzing: {input_path} ({width}x{height})")
     
     # Sample a grid
-    for y in range(0, height, 100):
-        for x in range(0, width, 100):
-            p = img.getpixel((x, y))
-            if p[3] > 0: # If not fully transparent
-                print(f"Non-transparent at ({x}, {y}): {p}")
+    data = np.asarray(img)
+    grid = data[::100, ::100]
+    for gy, gx in zip(*np.nonzero(grid[:, :, 3] > 0)): # If not fully transparent
+        print(f"Non-transparent at ({gx * 100}, {gy * 100}): {tuple(int(v) for v in grid[gy, gx])}")
+
+    print("Palette:")
+    for color in extract_palette(data.reshape(-1, 4), top=6, k=6):
+        print(f"  {color['hex']} {color['share'] * 100:.1f}%")
 
 if __name__ == "__main__":
     dark_icon = r"c:\AnitiGravity Projects\RentMate\src\assets\rentmate-icon-only-dark.png"
@@ -0,0 +1,345 @@
+import os
+import re
+import sys
+import json
+import time
+import fnmatch
+import argparse
+import subprocess
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from build_assets import file_digest, load_json, save_json
+
+# Perceptual-hash index of the repo's images: near-duplicates and unused assets.
+#
+# Every tracked image gets a 64-bit dHash (gradient of a 9x8 thumbnail) and
+# pHash (sign of the low 8x8 DCT block of a 32x32 thumbnail vs its median).
+# Hashes are cached by the file's sha256 in .cache/assets/phash.json, so
+# renamed or copied files aren't hashed again; uncached files are hashed in a
+# process pool. Near-duplicates are found with a BK-tree and grouped so that
+# every pair in a group is within --threshold bits.
+#
+# Unused assets: images under src/ and public/ whose file name (or a
+# template-literal / import.meta.glob pattern) appears in no source file.
+#
+#   python scripts/asset_index.py                  # report
+#   python scripts/asset_index.py --json assets.json --threshold 4
+
+CACHE_FILE = Path(".cache/assets/phash.json")
+HASH_VERSION = 1  # bump when the hash functions change
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".gif", ".bmp")
+SKIP_DIRS = {".git", "node_modules", "dist", ".cache", "responsive", "test-results", "__pycache__"}
+ASSET_ROOTS = ("src/", "public/")
+# Where references to assets can live
+REFERENCE_GLOBS = [
+    "src/**/*.ts", "src/**/*.tsx", "src/**/*.js", "src/**/*.jsx", "src/**/*.css", "src/**/*.md", "src/**/*.json",
+    "public/**/*.js", "public/**/*.json", "public/**/*.html", "public/**/*.xml", "public/**/*.webmanifest",
+    "index.html", "vite.config.ts", "tailwind.config.js", "capacitor.config.*", "scripts/assets.spec.json",
+]
+
+
+# --- Hashing (runs in worker processes) ---
+
+def _grayscale(path, size):
+    from PIL import Image
+
+    img = Image.open(path)
+    img.draft("RGB", (size[0] * 4, size[1] * 4))  # JPEG: decode at reduced scale
+    img = img.convert("RGBA")
+    # Transparent areas hash as white, not as whatever RGB sits under alpha 0
+    background = Image.new("RGBA", img.size, (255, 255, 255, 255))
+    gray = Image.alpha_composite(background, img).convert("L")
+    return np.asarray(gray.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0), dtype=np.float64)
+
+
+def _bits_to_int(bits):
+    return int("".join("1" if bit else "0" for bit in bits.ravel()), 2)
+
+
+def _dct_matrix(n):
+    k = np.arange(n)
+    matrix = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * n))
+    matrix[0] /= np.sqrt(2)
+    return matrix * np.sqrt(2 / n)
+
+
+DCT_32 = _dct_matrix(32)
+
+
+def dhash(gray):
+    """Horizontal gradient hash of a 9x8 grayscale thumbnail."""
+    return _bits_to_int(gray[:, 1:] > gray[:, :-1])
+
+
+def phash(gray):
+    """DCT hash of a 32x32 grayscale thumbnail: low 8x8 frequencies above their median (DC excluded)."""
+    low = (DCT_32 @ gray @ DCT_32.T)[:8, :8]
+    return _bits_to_int(low > np.median(low.ravel()[1:]))
+
+
+def hash_image(path):
+    from PIL import Image
+
+    try:
+        with Image.open(path) as img:
+            width, height = img.size
+        return path, {
+            "dhash": f"{dhash(_grayscale(path, (9, 8))):016x}",
+            "phash": f"{phash(_grayscale(path, (32, 32))):016x}",
+            "width": width,
+            "height": height,
+        }, None
+    except Exception as e:
+        return path, None, str(e)
+
+
+# --- BK-tree ---
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
+
+
+class BKTree:
+    """Metric tree over integer hashes; search() returns items within a Hamming radius."""
+
+    def __init__(self):
+        self.root = None  # [hash, [items], {distance: child}]
+
+    def add(self, value, item):
+        if self.root is None:
+            self.root = [value, [item], {}]
+            return
+        node = self.root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [item], {}]
+                return
+            node = child
+
+    def search(self, value, radius):
+        found = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node[0])
+            if distance <= radius:
+                found.extend((distance, item) for item in node[1])
+            # Triangle inequality: only children in [d - r, d + r] can match
+            for edge, child in node[2].items():
+                if distance - radius <= edge <= distance + radius:
+                    stack.append(child)
+        return found
+
+
+def cluster(hashes, threshold):
+    """Groups paths whose hashes are all within `threshold` bits of each other; singletons dropped.
+
+    Complete linkage, not transitive: joining any pair within the threshold
+    chains gradually changing images (animation frames) into one huge group.
+    Each group grows from the unassigned path with the most neighbours, taking
+    its neighbours nearest first while they stay within `threshold` of every
+    member, so no group is wider than `threshold` bits.
+    """
+    tree = BKTree()
+    for path, value in hashes.items():
+        tree.add(value, path)
+    neighbours = {path: sorted(tree.search(value, threshold)) for path, value in hashes.items()}
+
+    assigned, groups = set(), []
+    for seed in sorted(hashes, key=lambda path: (-len(neighbours[path]), path)):
+        if seed in assigned:
+            continue
+        members = [seed]
+        assigned.add(seed)
+        for _, other in neighbours[seed]:
+            if other not in assigned and all(hamming(hashes[other], hashes[m]) <= threshold for m in members):
+                members.append(other)
+                assigned.add(other)
+        if len(members) > 1:
+            groups.append(sorted(members))
+    return sorted(groups, key=lambda g: (-len(g), g[0]))
+
+
+# --- Discovery and references ---
+
+def list_images(root="."):
+    """Tracked images (git ls-files), or a directory walk outside a git checkout."""
+    try:
+        output = subprocess.run(["git", "ls-files", "-z"], cwd=root, capture_output=True, check=True).stdout
+        files = [f for f in output.decode("utf-8").split("\0") if f]
+    except (OSError, subprocess.CalledProcessError):
+        files = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            files.extend(os.path.relpath(os.path.join(dirpath, f), root).replace(os.sep, "/") for f in filenames)
+    return sorted(f for f in files if f.lower().endswith(IMAGE_EXTENSIONS) and os.path.isfile(os.path.join(root, f)))
+
+
+def _public_url(path):
+    if path.startswith("public/"):
+        return path[len("public"):]
+    return None
+
+
+FILE_NAME = re.compile(r"[\w@.\-]+\.(?:%s)\b" % "|".join(ext[1:] for ext in IMAGE_EXTENSIONS), re.IGNORECASE)
+
+
+def collect_references(root="."):
+    """(file names mentioned in any reference file, [regexes from template literals and import.meta.glob])."""
+    files = sorted({p for pattern in REFERENCE_GLOBS for p in Path(root).glob(pattern) if p.is_file()})
+    names, patterns = set(), []
+    for path in files:
+        text = path.read_text(encoding="utf-8", errors="ignore")
+        names.update(FILE_NAME.findall(text))
+        # `/Background/frame-${i}.webp` -> [^/]*/Background/frame-[^/]*\.webp$
+        for literal in re.findall(r"`([^`]*\$\{[^`]*)`", text):
+            static = re.split(r"\$\{[^}]*\}", literal)
+            if static[-1].lower().endswith(IMAGE_EXTENSIONS):
+                patterns.append(re.compile("[^/]*".join(re.escape(part) for part in static) + "$"))
+        for glob_pattern in re.findall(r"import\.meta\.glob\(\s*['\"]([^'\"]+)['\"]", text):
+            resolved = os.path.normpath(os.path.join(os.path.relpath(path.parent, root), glob_pattern))
+            patterns.append(re.compile(fnmatch.translate(resolved.replace(os.sep, "/"))))
+    return names, patterns
+
+
+def find_unused(images, root="."):
+    names, patterns = collect_references(root)
+    unused = []
+    for path in images:
+        if not path.startswith(ASSET_ROOTS):
+            continue
+        if os.path.basename(path) in names:
+            continue
+        url = _public_url(path) or path
+        if any(pattern.search(url) or pattern.match(path) for pattern in patterns):
+            continue
+        unused.append(path)
+    return unused
+
+
+# --- Index ---
+
+def build_index(images, workers=None, force=False):
+    """{path: {"sha256", "dhash", "phash", "width", "height", "bytes"}}, hashing only new content."""
+    cache = load_json(CACHE_FILE, {})
+    if force or cache.get("version") != HASH_VERSION:
+        cache = {"version": HASH_VERSION, "digests": cache.get("digests", {}), "hashes": {}}
+    digests, hashes = cache["digests"], cache["hashes"]
+
+    shas = {path: file_digest(path, digests) for path in images}
+    todo = {}
+    for path, sha in shas.items():
+        if sha not in hashes:
+            todo.setdefault(sha, path)  # identical files are hashed once
+
+    errors = {}
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for path, result, error in pool.map(hash_image, list(todo.values()), chunksize=8):
+                if error:
+                    errors[path] = error
+                else:
+                    hashes[shas[path]] = result
+    save_json(cache, CACHE_FILE)
+
+    index = {}
+    for path, sha in shas.items():
+        if sha in hashes:
+            index[path] = {"sha256": sha, **hashes[sha], "bytes": os.path.getsize(path)}
+    return index, errors, len(todo)
+
+
+def report(index, threshold=6, hash_name="phash", root="."):
+    exact = {}
+    for path, entry in index.items():
+        exact.setdefault(entry["sha256"], []).append(path)
+    exact_groups = sorted((sorted(g) for g in exact.values() if len(g) > 1), key=lambda g: (-len(g), g[0]))
+
+    # One representative per identical file so exact copies don't dominate the clusters
+    representatives = {group[0]: int(index[group[0]][hash_name], 16) for group in exact.values()}
+    clusters = []
+    for group in cluster(representatives, threshold):
+        members = sorted(p for rep in group for p in exact[index[rep]["sha256"]])
+        sizes = [index[p]["bytes"] for p in members]
+        clusters.append({"files": members, "bytes": sum(sizes), "reclaimable_bytes": sum(sizes) - max(sizes)})
+    clusters.sort(key=lambda c: -c["reclaimable_bytes"])
+
+    unused = find_unused(sorted(index), root)
+    return {
+        "images": len(index),
+        "exact_duplicates": [{"files": g, "reclaimable_bytes": index[g[0]]["bytes"] * (len(g) - 1)}
+                             for g in exact_groups],
+        "near_duplicates": clusters,
+        "unused": [{"file": p, "bytes": index[p]["bytes"]} for p in unused],
+        "unused_bytes": sum(index[p]["bytes"] for p in unused),
+    }
+
+
+def _print_group(group, kb, shown=8):
+    print(f"  {kb(group['reclaimable_bytes']):>8}  {len(group['files'])} files")
+    for path in group["files"][:shown]:
+        print(f"            {path}")
+    if len(group["files"]) > shown:
+        print(f"            ... {len(group['files']) - shown} more")
+
+
+def print_report(result, limit=15):
+    kb = lambda n: f"{n / 1024:.0f}K"  # noqa: E731
+
+    print(f"\n🖼️ ASSET INDEX ({result['images']} images)")
+    print("=" * 100)
+    print(f"Exact duplicates: {len(result['exact_duplicates'])} groups, "
+          f"{kb(sum(g['reclaimable_bytes'] for g in result['exact_duplicates']))} reclaimable")
+    for group in result["exact_duplicates"][:limit]:
+        _print_group(group, kb)
+
+    print(f"\nNear-duplicate clusters: {len(result['near_duplicates'])}, "
+          f"{kb(sum(c['reclaimable_bytes'] for c in result['near_duplicates']))} reclaimable if one of each is kept")
+    for group in result["near_duplicates"][:limit]:
+        _print_group(group, kb)
+
+    print(f"\nUnreferenced under {'/'.join(r.rstrip('/') for r in ASSET_ROOTS)}: {len(result['unused'])} files, "
+          f"{result['unused_bytes'] / 2 ** 20:.2f} MB")
+    by_dir = {}
+    for entry in result["unused"]:
+        directory = os.path.dirname(entry["file"])
+        count, size = by_dir.get(directory, (0, 0))
+        by_dir[directory] = (count + 1, size + entry["bytes"])
+    for directory, (count, size) in sorted(by_dir.items(), key=lambda item: -item[1][1])[:limit]:
+        print(f"  {kb(size):>8}  {count:>4} in {directory}/")
+    print("=" * 100)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find duplicate, near-duplicate and unused image assets")
+    parser.add_argument("--threshold", type=int, default=6, help="Max Hamming distance for near-duplicates")
+    parser.add_argument("--hash", choices=["phash", "dhash"], default="phash", help="Hash used for clustering")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="Ignore cached hashes")
+    parser.add_argument("--top", type=int, default=15, help="Groups to list per section")
+    parser.add_argument("--json", metavar="PATH", help="Write the full report as JSON")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    images = list_images()
+    index, errors, hashed = build_index(images, args.workers, args.force)
+    for path, error in errors.items():
+        print(f"❌ {path}: {error}")
+    print(f"Indexed {len(index)} images ({hashed} new hashes) "
+          f"in {time.perf_counter() - started:.2f}s")
+
+    result = report(index, args.threshold, args.hash)
+    print_report(result, args.top)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"report": result, "index": index}, f, indent=2)
+        print(f"Report written to {args.json}")
+    sys.exit(1 if errors else 0)
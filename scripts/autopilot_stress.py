@@ -1,9 +1,12 @@
 import time
 import random
 
+from linkage_engine import synthetic_engine
+from stress_test_autopilot import evaluate, synthetic_population
+
 def simulate_autopilot_load(user_count):
-    print(f"🔄 Simulating Autopilot run for {user_count} users...")
-    start_time = time.time()
+    print(f"🔄 Running Autopilot rules for {user_count} users...")
+    engine, first_day, last_day = synthetic_engine()
     
     metrics = {
         "emails_sent": 0,
@@ -12,22 +15,20 @@ def simulate_autopilot_load(user_count):
         "errors": 0
     }
     
-    for i in range(user_count):
-        # Simulate contract processing (G index check, Expiry check)
-        contracts = random.randint(1, 5)
-        metrics["contracts_processed"] += contracts
-        
-        # Simulate AI analysis (stochastic)
-        if random.random() < 0.1: # 10% users have complex tickets
-            time.sleep(0.01) # Simulate Latency
-            
-        if random.random() < 0.05: # 5% trigger an email
-            metrics["emails_sent"] += 1
-            
+    # 1-5 contracts per user, like the old simulation assumed
+    contracts = sum(random.randint(1, 5) for _ in range(user_count))
+    population = synthetic_population(contracts, first_day, last_day, last_day)
+
+    start_time = time.time()
+    results = evaluate(population, engine, last_day)
     end_time = time.time()
+
+    metrics["contracts_processed"] = contracts
+    metrics["emails_sent"] = int((results["lease_expiry"] | results["notice_period"] | results["cpi_change"]).sum())
+    metrics["errors"] = int(results["invalid_base"].sum() + results["missing_index"].sum())
     total_time = end_time - start_time
     metrics["total_time_s"] = round(total_time, 3)
-    metrics["average_per_user_ms"] = round((total_time / user_count) * 1000, 2)
+    metrics["average_per_user_ms"] = round((total_time / user_count) * 1000, 4)
     
     return metrics
 
@@ -39,6 +40,7 @@ if __name__ == "__main__":
     print(f"Avg Time Per User:    {results['average_per_user_ms']}ms")
     print(f"Contracts Audited:     {results['contracts_processed']}")
     print(f"Notifications Sent:    {results['emails_sent']}")
+    print(f"Data Errors Flagged:   {results['errors']}")
     print("-" * 50)
     
     if results['total_time_s'] < 5:
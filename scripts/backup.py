@@ -1,9 +1,11 @@
 import os
+import sys
 import requests
 import json
 import datetime
 import zipfile
 import shutil
+import hashlib
 from pathlib import Path
 
 # --- Configuration Loader ---
@@ -111,6 +113,29 @@ class RentMateBackup:
         except Exception as e:
             print(f"    [!] Error downloading {storage_path}: {e}")
 
+    def write_manifest(self):
+        """Records size and SHA-256 of every exported file so restores can be verified."""
+        print("--- Writing Manifest ---")
+        files = {}
+        for path in sorted(p for p in self.backup_dir.rglob("*") if p.is_file()):
+            hasher = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    hasher.update(block)
+            files[path.relative_to(self.backup_dir).as_posix()] = {
+                "size": path.stat().st_size,
+                "sha256": hasher.hexdigest()
+            }
+
+        manifest = {
+            "timestamp": self.timestamp,
+            "supabase_url": self.supabase_url,
+            "files": files
+        }
+        with open(self.backup_dir / "manifest.json", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        print(f"Manifest covers {len(files)} files")
+
     def create_archive(self):
         """Zips the backup directory."""
         archive_name = f"backups/RentMate_Backup_{self.timestamp}.zip"
@@ -118,6 +143,15 @@ class RentMateBackup:
         shutil.make_archive(archive_name.replace(".zip", ""), 'zip', self.backup_dir)
         print("Done!")
 
+    def store_in_repository(self, repo_root="backups/repository", keep_last=90):
+        """Writes the backup into the deduplicating chunk store instead of a zip."""
+        from backup_repository import BackupRepository
+
+        repo = BackupRepository(repo_root)
+        repo.store_tree(self.backup_dir, f"backup_{self.timestamp}")
+        repo.prune(keep_last)
+        print(json.dumps(repo.stats(), indent=2))
+
 if __name__ == "__main__":
     config = load_env()
     backup = RentMateBackup(config)
@@ -128,8 +162,15 @@ if __name__ == "__main__":
     # 2. Storage (Files)
     backup.backup_storage()
     
-    # 3. Archive
-    backup.create_archive()
+    # 3. Manifest (checked by scripts/restore_backup.py verify)
+    backup.write_manifest()
+
+    # 4. Archive (--repo: deduplicated chunk store, keeps the last 90 snapshots)
+    if "--repo" in sys.argv:
+        backup.store_in_repository()
+        shutil.rmtree(backup.backup_dir)
+    else:
+        backup.create_archive()
     
-    # 4. Cleanup temp folder
+    # 5. Cleanup temp folder
     # shutil.rmtree(backup.backup_dir)
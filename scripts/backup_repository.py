@@ -0,0 +1,226 @@
+import os
+import sys
+import json
+import zlib
+import hashlib
+import datetime
+from pathlib import Path
+
+# Deduplicating backup repository for RentMate.
+# Files are split with content-defined chunking (Gear rolling hash), so an
+# unchanged contract PDF or property image maps to the same chunks in every
+# backup. Each snapshot is just a small JSON index of chunk hashes.
+
+MIN_CHUNK = 16 * 1024
+AVG_CHUNK = 64 * 1024
+MAX_CHUNK = 256 * 1024
+
+# Cut when the low bits of the rolling hash are zero -> ~AVG_CHUNK sized chunks
+CHUNK_MASK = AVG_CHUNK - 1
+
+
+def _gear_table():
+    # Deterministic table so chunk boundaries are stable across runs/machines
+    table = []
+    for i in range(256):
+        digest = hashlib.sha256(f"rentmate-gear-{i}".encode()).digest()
+        table.append(int.from_bytes(digest[:4], "big"))
+    return table
+
+
+GEAR = _gear_table()
+
+
+def chunk_boundaries(data):
+    """Yields (start, end) offsets of content-defined chunks in data."""
+    length = len(data)
+    start = 0
+    gear = GEAR
+    while start < length:
+        end = min(start + MAX_CHUNK, length)
+        if end - start <= MIN_CHUNK:
+            yield start, end
+            break
+
+        h = 0
+        cut = end
+        # Bytes before MIN_CHUNK never cut, so there is no need to hash them
+        for i in range(start + MIN_CHUNK, end):
+            h = ((h << 1) + gear[data[i]]) & 0xFFFFFFFF
+            if not h & CHUNK_MASK:
+                cut = i + 1
+                break
+        yield start, cut
+        start = cut
+
+
+class BackupRepository:
+    def __init__(self, root="backups/repository"):
+        self.root = Path(root)
+        self.chunks_dir = self.root / "chunks"
+        self.snapshots_dir = self.root / "snapshots"
+        self.chunks_dir.mkdir(parents=True, exist_ok=True)
+        self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+
+    # --- Chunk store ---
+    def _chunk_path(self, digest):
+        return self.chunks_dir / digest[:2] / digest[2:]
+
+    def has_chunk(self, digest):
+        return self._chunk_path(digest).exists()
+
+    def put_chunk(self, data):
+        """Stores a chunk if it is new. Returns (digest, stored_bytes)."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._chunk_path(digest)
+        if path.exists():
+            return digest, 0
+
+        path.parent.mkdir(exist_ok=True)
+        payload = zlib.compress(data, 6)
+        # Write-then-rename so an interrupted backup never leaves a torn chunk
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        return digest, len(payload)
+
+    def get_chunk(self, digest):
+        with open(self._chunk_path(digest), "rb") as f:
+            data = zlib.decompress(f.read())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Chunk {digest} is corrupted")
+        return data
+
+    # --- Snapshots ---
+    def store_tree(self, source_dir, name=None):
+        """Chunks every file under source_dir into the repository and writes a snapshot index."""
+        source_dir = Path(source_dir)
+        name = name or datetime.datetime.now().strftime("backup_%Y%m%d_%H%M%S")
+        print(f"--- Storing {source_dir} as snapshot {name} ---")
+
+        files = {}
+        total_bytes = 0
+        new_bytes = 0
+        for path in sorted(p for p in source_dir.rglob("*") if p.is_file()):
+            rel_path = path.relative_to(source_dir).as_posix()
+            with open(path, "rb") as f:
+                data = f.read()
+
+            chunks = []
+            for start, end in chunk_boundaries(data):
+                digest, stored = self.put_chunk(data[start:end])
+                chunks.append(digest)
+                new_bytes += stored
+
+            files[rel_path] = {
+                "size": len(data),
+                "sha256": hashlib.sha256(data).hexdigest(),
+                "chunks": chunks,
+            }
+            total_bytes += len(data)
+
+        snapshot = {
+            "name": name,
+            "created_at": datetime.datetime.now().isoformat(),
+            "source": str(source_dir),
+            "total_bytes": total_bytes,
+            "files": files,
+        }
+        snapshot_path = self.snapshots_dir / f"{name}.json"
+        tmp_path = snapshot_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp_path, snapshot_path)
+
+        print(f"Stored {len(files)} files ({total_bytes} bytes), {new_bytes} new bytes written to chunk store")
+        return snapshot
+
+    def list_snapshots(self):
+        """Returns snapshot names, oldest first."""
+        return sorted(p.stem for p in self.snapshots_dir.glob("*.json"))
+
+    def load_snapshot(self, name):
+        with open(self.snapshots_dir / f"{name}.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def restore(self, name, target_dir):
+        """Rebuilds the files of a snapshot under target_dir."""
+        snapshot = self.load_snapshot(name)
+        target_dir = Path(target_dir)
+        print(f"--- Restoring snapshot {name} to {target_dir} ---")
+
+        for rel_path, entry in snapshot["files"].items():
+            local_path = target_dir / rel_path
+            local_path.parent.mkdir(parents=True, exist_ok=True)
+            hasher = hashlib.sha256()
+            with open(local_path, "wb") as f:
+                for digest in entry["chunks"]:
+                    data = self.get_chunk(digest)
+                    hasher.update(data)
+                    f.write(data)
+            if hasher.hexdigest() != entry["sha256"]:
+                raise ValueError(f"Checksum mismatch restoring {rel_path}")
+
+        print(f"Restored {len(snapshot['files'])} files")
+        return target_dir
+
+    def prune(self, keep_last=90):
+        """Drops all but the newest keep_last snapshots and deletes chunks no snapshot references."""
+        names = self.list_snapshots()
+        expired = names[:-keep_last] if keep_last > 0 else names
+        for name in expired:
+            print(f"Removing snapshot: {name}")
+            (self.snapshots_dir / f"{name}.json").unlink()
+
+        referenced = set()
+        for name in self.list_snapshots():
+            for entry in self.load_snapshot(name)["files"].values():
+                referenced.update(entry["chunks"])
+
+        removed = 0
+        freed = 0
+        for path in self.chunks_dir.glob("*/*"):
+            digest = path.parent.name + path.name
+            if digest not in referenced:
+                freed += path.stat().st_size
+                path.unlink()
+                removed += 1
+
+        print(f"Pruned {len(expired)} snapshots, {removed} chunks ({freed} bytes)")
+        return {"snapshots_removed": len(expired), "chunks_removed": removed, "bytes_freed": freed}
+
+    def stats(self):
+        """Logical size of all snapshots vs. bytes actually on disk."""
+        logical = sum(self.load_snapshot(n)["total_bytes"] for n in self.list_snapshots())
+        stored = sum(p.stat().st_size for p in self.chunks_dir.glob("*/*"))
+        return {
+            "snapshots": len(self.list_snapshots()),
+            "logical_bytes": logical,
+            "stored_bytes": stored,
+            "dedup_ratio": round(logical / stored, 2) if stored else None,
+        }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python scripts/backup_repository.py <list|stats|restore|prune> [args]")
+        print("  restore <snapshot> <target_dir>")
+        print("  prune [keep_last=90]")
+        sys.exit(1)
+
+    repo = BackupRepository()
+    command = sys.argv[1]
+
+    if command == "list":
+        for snapshot_name in repo.list_snapshots():
+            print(snapshot_name)
+    elif command == "stats":
+        print(json.dumps(repo.stats(), indent=2))
+    elif command == "restore" and len(sys.argv) >= 4:
+        repo.restore(sys.argv[2], sys.argv[3])
+    elif command == "prune":
+        repo.prune(int(sys.argv[2]) if len(sys.argv) > 2 else 90)
+    else:
+        print(f"Unknown command or missing arguments: {' '.join(sys.argv[1:])}")
+        sys.exit(1)
@@ -0,0 +1,215 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+# Declarative image pipeline for icons and PWA/social images.
+#
+# scripts/assets.spec.json lists outputs, each as
+#   {"output": path, "source": path, "transforms": [{"op": ..., ...}, ...]}
+# Ops: trim, remove_background, resize, contain, flatten.
+#
+# A target is rebuilt only when the hash of its source bytes + transforms
+# changed or the output on disk is missing / was modified; stale targets
+# render in parallel. Keys and output hashes live in scripts/assets.lock.json
+# (committed, so --check works on a fresh clone); .cache/assets only remembers
+# file digests by size + mtime so an up-to-date run never re-reads images.
+# Replaces the one-off update_icons.py / create_app_icon.py / normalize_logos.py runs.
+#
+#   python scripts/build_assets.py            # build stale targets
+#   python scripts/build_assets.py --force    # rebuild everything
+#   python scripts/build_assets.py --check    # exit 1 if anything is stale (CI)
+
+SPEC_FILE = Path(__file__).parent / "assets.spec.json"
+LOCK_FILE = Path(__file__).parent / "assets.lock.json"
+DIGEST_CACHE = Path(".cache/assets/digests.json")
+PIPELINE_VERSION = 1  # bump when an op's rendering changes
+
+
+def file_digest(path, known):
+    """sha256 of a file, reusing the cached digest while size and mtime are unchanged."""
+    stat = os.stat(path)
+    signature = [stat.st_size, stat.st_mtime_ns]
+    cached = known.get(str(path))
+    if cached and cached["sig"] == signature:
+        return cached["sha256"]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    known[str(path)] = {"sig": signature, "sha256": h.hexdigest()}
+    return known[str(path)]["sha256"]
+
+
+def target_key(target, source_digest):
+    payload = json.dumps({"v": PIPELINE_VERSION, "source": source_digest,
+                          "transforms": target.get("transforms", [])}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# --- Transforms (run in worker processes) ---
+
+def parse_color(value):
+    if value is None:
+        return (0, 0, 0, 0)
+    if isinstance(value, str):
+        value = value.lstrip("#")
+        channels = [int(value[i:i + 2], 16) for i in range(0, len(value), 2)]
+        return tuple(channels + [255] * (4 - len(channels)))
+    return tuple(list(value) + [255] * (4 - len(value)))
+
+
+def op_trim(img, params):
+    bbox = img.getbbox()
+    return img.crop(bbox) if bbox else img
+
+
+def op_remove_background(img, params):
+    import numpy as np
+    from PIL import Image
+    from remove_bg import remove_background_array
+
+    out = remove_background_array(np.asarray(img), params.get("threshold", 245), params.get("softness", 20))
+    return Image.fromarray(out, "RGBA")
+
+
+def op_resize(img, params):
+    from PIL import Image
+
+    return img.resize(tuple(params["size"]), Image.Resampling.LANCZOS)
+
+
+def op_contain(img, params):
+    """Fits the image inside `content` (or size * scale) and centers it on a `size` canvas."""
+    from PIL import Image
+
+    width, height = params["size"]
+    box = params.get("content") or [int(width * params.get("scale", 1.0)), int(height * params.get("scale", 1.0))]
+    content = img.copy()
+    ratio = min(box[0] / content.width, box[1] / content.height)
+    content = content.resize((max(1, round(content.width * ratio)), max(1, round(content.height * ratio))),
+                             Image.Resampling.LANCZOS)
+    canvas = Image.new("RGBA", (width, height), parse_color(params.get("background")))
+    offset = ((width - content.width) // 2, (height - content.height) // 2)
+    canvas.paste(content, offset, content)
+    return canvas
+
+
+def op_flatten(img, params):
+    from PIL import Image
+
+    background = Image.new("RGBA", img.size, parse_color(params.get("background", "#ffffff")))
+    return Image.alpha_composite(background, img).convert("RGB")
+
+
+OPS = {
+    "trim": op_trim,
+    "remove_background": op_remove_background,
+    "resize": op_resize,
+    "contain": op_contain,
+    "flatten": op_flatten,
+}
+
+
+def render(target):
+    from PIL import Image
+
+    started = time.perf_counter()
+    img = Image.open(target["source"]).convert("RGBA")
+    for step in target.get("transforms", []):
+        img = OPS[step["op"]](img, step)
+    output = Path(target["output"])
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_name(output.name + ".tmp")
+    fmt = {".jpg": "JPEG", ".jpeg": "JPEG", ".webp": "WEBP"}.get(output.suffix.lower(), "PNG")
+    if fmt == "JPEG" and img.mode == "RGBA":
+        img = img.convert("RGB")
+    img.save(tmp, fmt, optimize=True)
+    os.replace(tmp, output)
+    return target["output"], time.perf_counter() - started
+
+
+# --- Pipeline ---
+
+def load_spec(path=SPEC_FILE):
+    with open(path, encoding="utf-8") as f:
+        spec = json.load(f)
+    for target in spec["outputs"]:
+        for step in target.get("transforms", []):
+            if step.get("op") not in OPS:
+                raise ValueError(f"{target['output']}: unknown op {step.get('op')!r} (known: {', '.join(OPS)})")
+    return spec
+
+
+def load_json(path, default):
+    path = Path(path)
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return default
+
+
+def save_json(data, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def plan(spec, lock, digests, force=False):
+    """Returns [(target, key)] for targets that need rendering."""
+    stale = []
+    for target in spec["outputs"]:
+        key = target_key(target, file_digest(target["source"], digests))
+        built = lock.get(target["output"])
+        fresh = (not force and built and built["key"] == key and os.path.exists(target["output"])
+                 and file_digest(target["output"], digests) == built["sha256"])
+        if not fresh:
+            stale.append((target, key))
+    return stale
+
+
+def build(spec_path=SPEC_FILE, lock_path=LOCK_FILE, force=False, check=False, workers=None):
+    started = time.perf_counter()
+    spec = load_spec(spec_path)
+    lock = load_json(lock_path, {})
+    digests = load_json(DIGEST_CACHE, {})
+    stale = plan(spec, lock, digests, force)
+
+    if check:
+        for target, _ in stale:
+            print(f"stale: {target['output']}")
+        save_json(digests, DIGEST_CACHE)
+        return len(stale)
+
+    if stale:
+        keys = {target["output"]: key for target, key in stale}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for output, seconds in pool.map(render, [target for target, _ in stale]):
+                lock[output] = {"key": keys[output], "sha256": file_digest(output, digests)}
+                print(f"✅ {output} ({seconds * 1000:.0f}ms)")
+        # Targets removed from the spec drop out of the lock
+        lock = {t["output"]: lock[t["output"]] for t in spec["outputs"] if t["output"] in lock}
+        save_json(lock, lock_path)
+    save_json(digests, DIGEST_CACHE)
+
+    fresh = len(spec["outputs"]) - len(stale)
+    print(f"{len(stale)} rebuilt, {fresh} up to date in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build icons and PWA images from the asset spec")
+    parser.add_argument("--spec", default=str(SPEC_FILE))
+    parser.add_argument("--lock", default=str(LOCK_FILE))
+    parser.add_argument("--force", action="store_true", help="Ignore the cache and rebuild every target")
+    parser.add_argument("--check", action="store_true", help="Only report stale targets; exit 1 if any")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    result = build(args.spec, args.lock, args.force, args.check, args.workers)
+    sys.exit(1 if result else 0)
@@ -0,0 +1,351 @@
+import re
+import sys
+import gzip
+import json
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# What ships in dist/ after `npm run build`.
+#
+# Reads the Vite manifest (build.manifest in vite.config.ts) and every emitted
+# chunk plus its source map (build.sourcemap) to report:
+#   - raw / gzip / brotli bytes per chunk, for the initial load and per lazy route
+#   - bytes per vendor package (lucide-react, recharts, supabase-js, ...)
+#   - modules bundled into more than one chunk
+# and fails when a budget from --budget is exceeded.
+#
+#   npm run build && python scripts/bundle_audit.py --budget scripts/bundle_budget.json
+
+DIST_DIR = Path("dist")
+APP_FILE = Path("src/App.tsx")
+
+# Packages reported together. Entries ending in "/" (scopes) or "-" are
+# prefixes; everything else is an exact package name, so "react" doesn't
+# swallow react-markdown, react-hook-form, react-day-picker, ...
+VENDOR_FAMILIES = {
+    "icons": ("lucide-react", "@heroicons/"),
+    "charting": ("recharts", "d3-", "victory-vendor", "internmap", "decimal.js-light"),
+    "supabase": ("@supabase/",),
+    "pdf": ("jspdf", "jspdf-autotable", "pdfjs-dist", "html2canvas", "canvg", "fflate"),
+    "react": ("react", "react-dom", "react-is", "scheduler", "react-router", "react-router-dom", "@remix-run/"),
+    "sentry": ("@sentry/", "@sentry-internal/"),
+    "motion": ("framer-motion", "motion-dom", "motion-utils"),
+    "markdown": ("react-markdown", "remark-", "micromark", "micromark-", "mdast-", "hast-", "unist-", "unified"),
+    "stripe": ("@stripe/",),
+    "dates": ("date-fns", "react-day-picker"),
+}
+
+VLQ_CHARS = {c: i for i, c in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/")}
+
+
+def compressed_sizes(data):
+    sizes = {"raw": len(data), "gzip": len(gzip.compress(data, compresslevel=9))}
+    sizes["brotli"] = len(brotli.compress(data, quality=11)) if BROTLI_AVAILABLE else None
+    return sizes
+
+
+def decode_vlq(segment):
+    values, shift, value = [], 0, 0
+    for char in segment:
+        digit = VLQ_CHARS[char]
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+            continue
+        values.append(-(value >> 1) if value & 1 else value >> 1)
+        shift = value = 0
+    return values
+
+
+def bytes_per_source(code, source_map):
+    """Generated bytes attributed to each source file, from the map's mappings."""
+    lines = code.split("\n")
+    per_source = {}
+    source = 0
+    for line_no, mapping_line in enumerate(source_map.get("mappings", "").split(";")):
+        if line_no >= len(lines):
+            break
+        line = lines[line_no]
+        segments = []
+        column = 0
+        for raw in mapping_line.split(","):
+            if not raw:
+                continue
+            fields = decode_vlq(raw)
+            column += fields[0]
+            if len(fields) >= 4:
+                source += fields[1]
+                segments.append((column, source))
+            else:
+                segments.append((column, None))
+        for i, (start, src) in enumerate(segments):
+            end = segments[i + 1][0] if i + 1 < len(segments) else len(line)
+            if src is not None and end > start:
+                # Columns count UTF-16 units; close enough to bytes for minified JS
+                per_source[src] = per_source.get(src, 0) + (end - start)
+    sources = source_map.get("sources", [])
+    return {sources[i]: n for i, n in per_source.items() if i < len(sources)}
+
+
+def package_of(source):
+    """'../node_modules/@supabase/auth-js/dist/x.js' -> '@supabase/auth-js'; app files -> None."""
+    if "node_modules/" not in source:
+        return None
+    rest = source.rsplit("node_modules/", 1)[1].split("/")
+    return "/".join(rest[:2]) if rest[0].startswith("@") else rest[0]
+
+
+def family_of(package):
+    for family, prefixes in VENDOR_FAMILIES.items():
+        if any(package == p or (p.endswith(("/", "-")) and package.startswith(p)) for p in prefixes):
+            return family
+    return package
+
+
+def normalize_source(source):
+    """Strips ../ prefixes and package-manager store dirs so duplicates compare equal."""
+    source = re.sub(r"^(\.\./|\./)+", "", source)
+    source = re.sub(r"node_modules/\.pnpm/[^/]+/node_modules/", "node_modules/", source)
+    return source.split("?")[0]
+
+
+def analyze_chunk(dist, file):
+    """Sizes and per-source attribution for one emitted file (runs in a worker process)."""
+    path = Path(dist) / file
+    data = path.read_bytes()
+    result = {"file": file, **compressed_sizes(data), "sources": {}}
+    map_path = path.with_name(path.name + ".map")
+    if file.endswith(".js") and map_path.exists():
+        source_map = json.loads(map_path.read_text(encoding="utf-8"))
+        result["sources"] = bytes_per_source(data.decode("utf-8", errors="replace"), source_map)
+    return result
+
+
+def load_manifest(dist):
+    for candidate in (dist / ".vite" / "manifest.json", dist / "manifest.json"):
+        if candidate.exists():
+            return json.loads(candidate.read_text(encoding="utf-8"))
+    raise FileNotFoundError(f"No Vite manifest in {dist} (set build.manifest: true and rebuild)")
+
+
+def route_modules(app_file=APP_FILE):
+    """{route path: module path} from App.tsx's lazy()/static imports and route objects."""
+    if not app_file.exists():
+        return {}
+    text = app_file.read_text(encoding="utf-8")
+    modules = {}
+    for name, module in re.findall(r"const (\w+) = lazy\(\(\) => import\('([^']+)'\)", text):
+        modules[name] = module
+    for default, named, module in re.findall(r"import\s+(?:(\w+)|\{([^}]+)\})\s+from '(\./pages/[^']+)'", text):
+        for name in (default or named).split(","):
+            modules[name.strip()] = module
+    routes = {}
+    for path, component in re.findall(r'path: "([^"]+)",\s*element: <(\w+)', text):
+        if path.startswith("/") and component in modules:
+            routes[path] = "src/" + modules[component][2:]
+    return routes
+
+
+def closure(manifest, key, seen=None):
+    """Chunk keys statically loaded with `key` (itself included)."""
+    seen = set() if seen is None else seen
+    if key in seen or key not in manifest:
+        return seen
+    seen.add(key)
+    for imported in manifest[key].get("imports", []):
+        closure(manifest, imported, seen)
+    return seen
+
+
+def find_key(manifest, module):
+    """Manifest key for a module path without extension (src/pages/Settings -> src/pages/Settings.tsx)."""
+    for ext in ("", ".tsx", ".ts", ".jsx", ".js", "/index.tsx", "/index.ts"):
+        if module + ext in manifest:
+            return module + ext
+    return None
+
+
+def audit(dist=DIST_DIR, workers=None):
+    dist = Path(dist)
+    manifest = load_manifest(dist)
+
+    files = sorted({entry["file"] for entry in manifest.values()} |
+                   {css for entry in manifest.values() for css in entry.get("css", [])})
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunks = {c["file"]: c for c in pool.map(analyze_chunk, [str(dist)] * len(files), files)}
+
+    def cost(keys):
+        total = {"raw": 0, "gzip": 0, "brotli": 0 if BROTLI_AVAILABLE else None, "files": []}
+        for key in sorted(keys):
+            entry = manifest[key]
+            for file in [entry["file"]] + entry.get("css", []):
+                if file in total["files"]:
+                    continue
+                total["files"].append(file)
+                for kind in ("raw", "gzip", "brotli"):
+                    if total[kind] is not None:
+                        total[kind] += chunks[file][kind]
+        return total
+
+    entries = [k for k, e in manifest.items() if e.get("isEntry")]
+    initial_keys = set()
+    for key in entries:
+        closure(manifest, key, initial_keys)
+    initial = cost(initial_keys)
+
+    # Lazy routes: what a navigation adds on top of the initial load
+    routes = {}
+    route_map = route_modules()
+    labels = {}
+    for path, module in route_map.items():
+        key = find_key(manifest, module)
+        if key:
+            labels.setdefault(key, []).append(path)
+    for key, entry in manifest.items():
+        if not entry.get("isDynamicEntry"):
+            continue
+        extra = closure(manifest, key) - initial_keys
+        route_cost = cost(extra)
+        routes[key] = {"routes": labels.get(key, []), **route_cost}
+    for path, module in route_map.items():
+        key = find_key(manifest, module)
+        if key in initial_keys:
+            routes.setdefault(key, {"routes": labels[key], "raw": 0, "gzip": 0,
+                                    "brotli": 0 if BROTLI_AVAILABLE else None, "files": [], "eager": True})
+
+    # Vendor packages and duplicated modules
+    packages = {}
+    owners = {}
+    for file, chunk in chunks.items():
+        for source, size in chunk["sources"].items():
+            name = normalize_source(source)
+            owners.setdefault(name, []).append((file, size))
+            package = package_of(name)
+            key = package or "(app)"
+            info = packages.setdefault(key, {"bytes": 0, "family": family_of(package) if package else "app",
+                                             "chunks": set()})
+            info["bytes"] += size
+            info["chunks"].add(file)
+    families = {}
+    for info in packages.values():
+        families[info["family"]] = families.get(info["family"], 0) + info["bytes"]
+    duplicates = sorted(
+        ({"module": name, "chunks": [f for f, _ in where], "wasted_bytes": sum(s for _, s in where) - max(s for _, s in where)}
+         for name, where in owners.items() if len({f for f, _ in where}) > 1),
+        key=lambda d: -d["wasted_bytes"])
+
+    return {
+        "initial": initial,
+        "routes": routes,
+        "chunks": {f: {k: c[k] for k in ("raw", "gzip", "brotli")} for f, c in chunks.items()},
+        "packages": {k: {**v, "chunks": sorted(v["chunks"])}
+                     for k, v in sorted(packages.items(), key=lambda kv: -kv[1]["bytes"])},
+        "families": dict(sorted(families.items(), key=lambda kv: -kv[1])),
+        "duplicates": duplicates,
+        "has_sourcemaps": any(c["sources"] for c in chunks.values()),
+    }
+
+
+def check_budgets(report, budget):
+    """budget: {"initial": {"gzip_kb": 250}, "routes": {"*": {"gzip_kb": 80}, "/settings": {...}},
+    "families": {"icons": {"raw_kb": 60}}}"""
+    violations = []
+
+    def over(label, sizes, limits):
+        for key, limit in limits.items():
+            kind = key.replace("_kb", "")
+            value = sizes.get(kind)
+            if value is not None and value / 1024 > limit:
+                violations.append(f"{label}: {kind} {value / 1024:.1f} KB > {limit} KB")
+
+    over("initial", report["initial"], budget.get("initial", {}))
+    route_budgets = budget.get("routes", {})
+    for key, info in report["routes"].items():
+        for path in info["routes"] or [key]:
+            limits = {**route_budgets.get("*", {}), **route_budgets.get(path, {})}
+            over(f"route {path}", info, limits)
+    for family, limits in budget.get("families", {}).items():
+        if family in report["families"]:
+            over(f"vendor {family}", {"raw": report["families"][family]}, limits)
+    return violations
+
+
+def kb(value):
+    return "-" if value is None else f"{value / 1024:.1f}"
+
+
+def print_report(report, top=15):
+    print("\n📦 BUNDLE AUDIT")
+    print("=" * 90)
+    initial = report["initial"]
+    print(f"Initial load: {len(initial['files'])} files, raw {kb(initial['raw'])} KB, "
+          f"gzip {kb(initial['gzip'])} KB, brotli {kb(initial['brotli'])} KB")
+
+    print(f"\n{'lazy route / chunk':<50}{'raw KB':>10}{'gzip KB':>10}{'br KB':>10}")
+    for key, info in sorted(report["routes"].items(), key=lambda kv: -kv[1]["gzip"])[:top]:
+        label = ", ".join(info["routes"]) or key
+        if info.get("eager"):
+            label += " (in initial)"
+        print(f"{label[:49]:<50}{kb(info['raw']):>10}{kb(info['gzip']):>10}{kb(info['brotli']):>10}")
+
+    if report["has_sourcemaps"]:
+        print(f"\n{'vendor family':<30}{'raw KB':>10}")
+        for family, size in list(report["families"].items())[:top]:
+            print(f"{family:<30}{kb(size):>10}")
+        if report["duplicates"]:
+            wasted = sum(d["wasted_bytes"] for d in report["duplicates"])
+            print(f"\n⚠️ {len(report['duplicates'])} modules in more than one chunk ({kb(wasted)} KB duplicated):")
+            for dup in report["duplicates"][:10]:
+                print(f"   {dup['module'][:60]:<60} x{len(dup['chunks'])}  {kb(dup['wasted_bytes'])} KB")
+    else:
+        print("\n(no source maps: vendor attribution and duplicate detection skipped)")
+    if not BROTLI_AVAILABLE:
+        print("(pip install brotli for brotli sizes)")
+    print("=" * 90)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vite build artifact analyzer")
+    parser.add_argument("--dist", default=str(DIST_DIR))
+    parser.add_argument("--budget", help="Budget JSON (initial / routes / families limits in KB)")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for compression and map decoding")
+    parser.add_argument("--json", metavar="PATH", help="Write the full report as JSON")
+    parser.add_argument("--record", metavar="SCENARIO",
+                        help="Store sizes in the perf results file (see scripts/perf_results.py)")
+    args = parser.parse_args()
+
+    try:
+        report = audit(args.dist, args.workers)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.json}")
+
+    if args.record:
+        from perf_results import record
+
+        metrics = {"initial": {k: report["initial"][k] for k in ("raw", "gzip", "brotli")},
+                   "families": report["families"]}
+        record(args.record, metrics, tool="bundle_audit")
+
+    violations = []
+    if args.budget:
+        with open(args.budget, encoding="utf-8") as f:
+            violations = check_budgets(report, json.load(f))
+        for violation in violations:
+            print(f"❌ {violation}")
+        if not violations:
+            print("✅ All bundles within budget")
+    sys.exit(1 if violations else 0)
@@ -1,22 +1,49 @@
 import requests
 import csv
 import io
+import os
+import json
+import time
+import asyncio
+import hashlib
+import ssl
+import sys
 import datetime
+from pathlib import Path
 
 # Configuration
 YEARS_BACK = 20
 OUTPUT_FILE = 'supabase/migrations/20260128180000_backfill_index_data.sql'
+CACHE_DIR = Path('.cache/boi_http')
+STATE_FILE = Path('.cache/index_data_state.json')
+BOI_EXR_URL = "https://edge.boi.gov.il/FusionEdgeServer/sdmx/v2/data/dataflow/BOI.STATISTICS/EXR/1.0/"
 
-def fetch_history(currency_code, db_type):
-    end_date = datetime.date.today()
-    start_date = end_date - datetime.timedelta(days=YEARS_BACK * 365)
-    
+CURRENCIES = [('USD', 'usd'), ('EUR', 'eur')]
+MAX_CONCURRENCY = 4       # simultaneous connections to edge.boi.gov.il
+REQUESTS_PER_SECOND = 4   # polite request start rate
+# Windows ending this many days ago or earlier are final (BOI no longer revises them)
+SETTLED_AFTER_DAYS = 30
+
+def build_url(currency_code, start_date, end_date):
     # BOI SDMX CSV URL
-    url = (
-        "https://edge.boi.gov.il/FusionEdgeServer/sdmx/v2/data/dataflow/BOI.STATISTICS/EXR/1.0/"
-        f"?c%5BDATA_TYPE%5D=OF00&c%5BBASE_CURRENCY%5D={currency_code}"
+    return (
+        f"{BOI_EXR_URL}?c%5BDATA_TYPE%5D=OF00&c%5BBASE_CURRENCY%5D={currency_code}"
         f"&startPeriod={start_date}&endPeriod={end_date}&format=csv"
     )
+
+def history_range(today=None):
+    """Jan 1 YEARS_BACK years ago through Dec 31 of the current year.
+
+    Both ends are year-aligned so every window URL stays the same all year:
+    past years hit the cache and the open year is revalidated with If-None-Match.
+    """
+    today = today or datetime.date.today()
+    return datetime.date(today.year - YEARS_BACK, 1, 1), datetime.date(today.year, 12, 31)
+
+def fetch_history(currency_code, db_type):
+    start_date, end_date = history_range()
+    
+    url = build_url(currency_code, start_date, end_date)
     
     print(f"Fetching {currency_code} from {start_date} to {end_date}...")
     try:
@@ -40,11 +67,346 @@ def fetch_history(currency_code, db_type):
         print(f"Error fetching {currency_code}: {e}")
         return []
 
+# --- Async windowed fetcher ---
+
+def date_windows(start_date, end_date):
+    """Splits [start_date, end_date] into calendar-year windows.
+
+    With a range from history_range() every window is a whole calendar year,
+    so its URL never changes: past years hit the HTTP cache and the current
+    year's window is revalidated rather than refetched under a new URL.
+    """
+    windows = []
+    window_start = start_date
+    while window_start <= end_date:
+        window_end = min(datetime.date(window_start.year, 12, 31), end_date)
+        windows.append((window_start, window_end))
+        window_start = window_end + datetime.timedelta(days=1)
+    return windows
+
+class HttpCache:
+    """On-disk cache of response bodies plus ETag/Last-Modified validators."""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _key(self, url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def body_path(self, url):
+        return self.cache_dir / f"{self._key(url)}.csv"
+
+    def meta(self, url):
+        meta_path = self.cache_dir / f"{self._key(url)}.json"
+        if meta_path.exists() and self.body_path(url).exists():
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return None
+
+    def conditional_headers(self, url):
+        meta = self.meta(url) or {}
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def store_meta(self, url, response_headers):
+        meta = {
+            'url': url,
+            'etag': response_headers.get('ETag'),
+            'last_modified': response_headers.get('Last-Modified'),
+            'fetched_at': datetime.datetime.now().isoformat()
+        }
+        with open(self.cache_dir / f"{self._key(url)}.json", 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+class RateLimiter:
+    """Caps concurrent requests and spaces out request starts."""
+
+    def __init__(self, max_concurrency=MAX_CONCURRENCY, per_second=REQUESTS_PER_SECOND):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.interval = 1.0 / per_second
+        self.lock = asyncio.Lock()
+        self.next_start = 0.0
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        async with self.lock:
+            now = time.monotonic()
+            wait = self.next_start - now
+            self.next_start = max(now, self.next_start) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def __aexit__(self, *exc):
+        self.semaphore.release()
+
+class ObservationParser:
+    """Incremental TIME_PERIOD/OBS_VALUE extraction from SDMX CSV lines.
+
+    With key_column set (e.g. BASE_CURRENCY for multi-currency requests)
+    rows are (key, date, value) instead of (date, value).
+    """
+
+    def __init__(self, key_column=None):
+        self.key_column = key_column
+        self.key_idx = None
+        self.date_idx = None
+        self.value_idx = None
+        self.rows = []
+
+    def feed(self, line):
+        if not line.strip():
+            return
+        fields = next(csv.reader([line]))
+        if self.date_idx is None:
+            self.date_idx = fields.index('TIME_PERIOD')
+            self.value_idx = fields.index('OBS_VALUE')
+            if self.key_column:
+                self.key_idx = fields.index(self.key_column)
+            return
+        if len(fields) > max(self.date_idx, self.value_idx, self.key_idx or 0):
+            date_str = fields[self.date_idx]
+            value = fields[self.value_idx]
+            if date_str and value:
+                if self.key_column:
+                    self.rows.append((fields[self.key_idx], date_str, float(value)))
+                else:
+                    self.rows.append((date_str, float(value)))
+
+async def fetch_window(session, limiter, cache, currency_code, start_date, end_date, revalidate=False):
+    """Fetches one currency/date window; returns [(date, value), ...]."""
+    url = build_url(currency_code, start_date, end_date)
+    parser = ObservationParser()
+    body_path = cache.body_path(url)
+    settled = end_date <= datetime.date.today() - datetime.timedelta(days=SETTLED_AFTER_DAYS)
+
+    # Settled history never changes: serve it straight from disk
+    if settled and not revalidate and cache.meta(url):
+        with open(body_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                parser.feed(line)
+        return parser.rows
+
+    async with limiter:
+        async with session.get(url, headers=cache.conditional_headers(url)) as resp:
+            if resp.status == 304:
+                with open(body_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        parser.feed(line)
+                return parser.rows
+            resp.raise_for_status()
+
+            # Parse while streaming and tee the body into the cache
+            tmp_path = body_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as cache_file:
+                async for raw_line in resp.content:
+                    line = raw_line.decode('utf-8-sig')
+                    cache_file.write(line)
+                    parser.feed(line)
+            os.replace(tmp_path, body_path)
+            cache.store_meta(url, resp.headers)
+    return parser.rows
+
+async def fetch_all_async(start_date, end_date, currencies=CURRENCIES, revalidate=False,
+                          max_concurrency=MAX_CONCURRENCY, per_second=REQUESTS_PER_SECOND):
+    """Fetches every currency x window concurrently. Returns {db_type: sorted [(date, value)]}."""
+    import aiohttp
+
+    cache = HttpCache()
+    limiter = RateLimiter(max_concurrency, per_second)
+    windows = date_windows(start_date, end_date)
+    timeout = aiohttp.ClientTimeout(total=120)
+
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        jobs = [
+            (db_type, fetch_window(session, limiter, cache, code, s, e, revalidate))
+            for code, db_type in currencies
+            for s, e in windows
+        ]
+        results = await asyncio.gather(*(job for _, job in jobs), return_exceptions=True)
+
+    series = {db_type: {} for _, db_type in currencies}
+    for (db_type, _), result in zip(jobs, results):
+        if isinstance(result, Exception):
+            print(f"Error fetching {db_type} window: {result}")
+            continue
+        series[db_type].update(result)
+
+    for db_type, observations in series.items():
+        print(f"Parsed {len(observations)} records for {db_type.upper()}")
+    return {db_type: sorted(obs.items()) for db_type, obs in series.items()}
+
+def to_sql_values(db_type, observations):
+    return [f"('{db_type}', '{date_str}', {value}, 'exchange-api')" for date_str, value in observations]
+
+# --- Incremental update ---
+
+def parse_uri(uri):
+    ssl_context = ssl.create_default_context()
+    ssl_context.check_hostname = False
+    ssl_context.verify_mode = ssl.CERT_NONE
+
+    parts = uri.replace("postgresql://", "").split("@")
+    user_pass = parts[0].split(":")
+    host_port_db = parts[1].split("/")
+    host_port = host_port_db[0].split(":")
+    params = {
+        "user": user_pass[0], "password": user_pass[1],
+        "host": host_port[0], "port": int(host_port[1]) if len(host_port) > 1 else 5432,
+        "database": host_port_db[1].split("?")[0], "timeout": 30
+    }
+    if host_port[0] not in ("localhost", "127.0.0.1"):
+        params["ssl_context"] = ssl_context
+    return params
+
+def load_state():
+    if STATE_FILE.exists():
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+def save_state(state):
+    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(STATE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+def latest_dates_from_db(conn, index_types):
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT index_type::text, max(date) FROM public.index_data "
+        "WHERE index_type::text = ANY(%s) GROUP BY index_type",
+        (list(index_types),)
+    )
+    return {index_type: latest for index_type, latest in cursor.fetchall() if latest}
+
+def fetch_since(latest):
+    """Fetches every currency newer than its latest stored date in ONE request.
+
+    Returns {db_type: [(date, value), ...]} with only the new observations.
+    """
+    # The day before the range, since fetching starts the day after the latest date
+    default_start = (history_range()[0] - datetime.timedelta(days=1)).isoformat()
+    starts = {db_type: latest.get(db_type, default_start) for _, db_type in CURRENCIES}
+    # Daily dates compare correctly as ISO strings; fetch from the oldest gap
+    start_date = datetime.date.fromisoformat(min(starts.values())[:10]) + datetime.timedelta(days=1)
+    end_date = datetime.date.today()
+    if start_date > end_date:
+        return {db_type: [] for _, db_type in CURRENCIES}
+
+    codes = ",".join(code for code, _ in CURRENCIES)
+    by_code = {code: db_type for code, db_type in CURRENCIES}
+    print(f"Fetching {codes} from {start_date} to {end_date}...")
+
+    resp = requests.get(build_url(codes, start_date, end_date), stream=True, timeout=60)
+    resp.raise_for_status()
+    parser = ObservationParser(key_column='BASE_CURRENCY')
+    for line in resp.iter_lines(decode_unicode=False):
+        parser.feed(line.decode('utf-8-sig'))
+
+    new_rows = {db_type: [] for _, db_type in CURRENCIES}
+    for code, date_str, value in parser.rows:
+        db_type = by_code.get(code)
+        if db_type and date_str > starts[db_type]:
+            new_rows[db_type].append((date_str, value))
+    return new_rows
+
+# Above this many rows a COPY into a temp table beats a giant VALUES list
+COPY_THRESHOLD = 1000
+
+def upsert_index_data(conn, rows, source='exchange-api'):
+    """Upserts [(index_type, date, value[, source]), ...] into index_data in one round of statements.
+
+    Rows without their own source get the `source` argument.
+    """
+    if not rows:
+        return 0
+    rows = [row if len(row) == 4 else (*row, source) for row in rows]
+    cursor = conn.cursor()
+
+    if len(rows) <= COPY_THRESHOLD:
+        placeholders = ", ".join(["(%s, %s, %s, %s)"] * len(rows))
+        params = [p for row in rows for p in row]
+        cursor.execute(
+            "INSERT INTO public.index_data (index_type, date, value, source) "
+            f"VALUES {placeholders} "
+            "ON CONFLICT (index_type, date) DO UPDATE SET value = EXCLUDED.value",
+            params
+        )
+    else:
+        cursor.execute(
+            "CREATE TEMP TABLE index_data_incoming (index_type text, date text, value numeric, source text) ON COMMIT DROP"
+        )
+        payload = "".join(f"{index_type}\t{date_str}\t{value}\t{row_source}\n" for index_type, date_str, value, row_source in rows)
+        cursor.execute("COPY index_data_incoming FROM STDIN", stream=io.BytesIO(payload.encode('utf-8')))
+        cursor.execute(
+            "INSERT INTO public.index_data (index_type, date, value, source) "
+            "SELECT index_type, date, value, source FROM index_data_incoming "
+            "ON CONFLICT (index_type, date) DO UPDATE SET value = EXCLUDED.value"
+        )
+    conn.commit()
+    return len(rows)
+
+def run_incremental(db_uri=None):
+    """Fetches only observations newer than what is stored and upserts them."""
+    index_types = [db_type for _, db_type in CURRENCIES]
+    conn = None
+    if db_uri:
+        import pg8000
+        conn = pg8000.connect(**parse_uri(db_uri))
+    try:
+        # The state file avoids a DB round-trip; the DB is the fallback source of truth
+        latest = load_state()
+        if conn and not all(t in latest for t in index_types):
+            latest.update(latest_dates_from_db(conn, index_types))
+        print(f"Latest stored dates: {latest or 'none (full backfill)'}")
+
+        new_rows = fetch_since(latest)
+        flat = [(db_type, d, v) for db_type, obs in new_rows.items() for d, v in obs]
+        print(f"{len(flat)} new observations")
+
+        if flat and conn:
+            upsert_index_data(conn, flat)
+            print(f"✅ Upserted {len(flat)} rows into index_data")
+        elif flat:
+            print("No database URI given (--db or INDEX_DB_URI); state file not advanced.")
+            return flat
+
+        for db_type, obs in new_rows.items():
+            if obs:
+                latest[db_type] = max([latest.get(db_type, '')] + [d for d, _ in obs])
+        save_state(latest)
+        update_index_store(new_rows)
+        return flat
+    finally:
+        if conn:
+            conn.close()
+
+def update_index_store(series):
+    """Mirrors fetched observations into the local memory-mapped columnar store."""
+    from index_store import IndexStore
+
+    store = IndexStore()
+    for db_type, observations in series.items():
+        if observations:
+            total = store.update(db_type, observations)
+            print(f"Index store: {db_type} now holds {total} values")
+
 def main():
-    usd_records = fetch_history('USD', 'usd')
-    eur_records = fetch_history('EUR', 'eur')
+    start_date, end_date = history_range()
+    print(f"Fetching {', '.join(c for c, _ in CURRENCIES)} from {start_date} to {end_date}...")
     
-    all_records = usd_records + eur_records
+    started = time.time()
+    series = asyncio.run(fetch_all_async(start_date, end_date))
+    print(f"Fetched in {time.time() - started:.1f}s")
+    update_index_store(series)
+
+    all_records = []
+    for db_type, observations in series.items():
+        all_records.extend(to_sql_values(db_type, observations))
     
     if not all_records:
         print("No records found.")
@@ -85,4 +447,10 @@ DO UPDATE SET value = EXCLUDED.value;
     print(f"Migration file created: {OUTPUT_FILE}")
 
 if __name__ == '__main__':
-    main()
+    if '--incremental' in sys.argv:
+        db_uri = os.environ.get('INDEX_DB_URI')
+        if '--db' in sys.argv:
+            db_uri = sys.argv[sys.argv.index('--db') + 1]
+        run_incremental(db_uri)
+    else:
+        main()
@@ -1,56 +1,150 @@
 from PIL import Image, ImageFilter, ImageOps, ImageChops
+import numpy as np
 import os
+import sys
+import math
+import argparse
 
-def clean_logo_versions(input_path, output_dir):
+OUTPUT_SIZE = (800, 800)
+BLACK = (0, 0, 0, 255)
+WHITE = (255, 255, 255, 255)
+LED_RED = (220, 38, 38, 255)
+BRAND_BLUE = (15, 23, 42, 255)  # Slate 900
+TRANSPARENT = (255, 255, 255, 0)
+
+def clean_logo_versions(input_path, output_dir, tiled=False, tile=128):
     # Open image
     orig = Image.open(input_path).convert("RGBA")
-    
+
+    if tiled:
+        final_trans, final_blue = render_variants_tiled(orig, scale=4, size=OUTPUT_SIZE, tile=tile)
+    else:
+        final_trans, final_blue = render_variants(orig, scale=4, size=OUTPUT_SIZE)
+
+    # Save both
+    trans_path = os.path.join(output_dir, "renty-mascot-transparent.png")
+    blue_path = os.path.join(output_dir, "renty-mascot-blue-bg.png")
+
+    final_trans.save(trans_path, "PNG")
+    final_blue.save(blue_path, "PNG")
+
+    print(f"Generated transparent version: {trans_path}")
+    print(f"Generated blue background version: {blue_path}")
+
+def render_variants(orig, scale=4, size=OUTPUT_SIZE):
+    """Whole-image version: holds the upscaled image and every full-size layer at once."""
     # Upscale 4x for high-res processing
-    scale = 4
     img = orig.resize((orig.width * scale, orig.height * scale), Image.Resampling.LANCZOS)
-    
+
     # Create mask for black parts (outlines)
     grayscale = img.convert("L")
     black_mask = grayscale.point(lambda p: 255 if p < 100 else 0).filter(ImageFilter.MaxFilter(3))
-    
+
     # Create mask for red parts (LED text)
     r, v, b, a = img.split()
     red_mask = r.point(lambda p: 255 if p > 150 else 0)
     red_g_mask = v.point(lambda p: 255 if p < 100 else 0)
     red_total_mask = ImageChops.darker(red_mask, red_g_mask)
-    
+
     # 1. Version: Transparent Background
-    final_trans = Image.new("RGBA", img.size, (255, 255, 255, 0))
-    black_layer = Image.new("RGBA", img.size, (0, 0, 0, 255))
+    final_trans = Image.new("RGBA", img.size, TRANSPARENT)
+    black_layer = Image.new("RGBA", img.size, BLACK)
     final_trans = Image.composite(black_layer, final_trans, black_mask)
-    red_layer = Image.new("RGBA", img.size, (220, 38, 38, 255))
+    red_layer = Image.new("RGBA", img.size, LED_RED)
     final_trans = Image.composite(red_layer, final_trans, red_total_mask)
-    final_trans = final_trans.resize((800, 800), Image.Resampling.LANCZOS)
-    
+    final_trans = final_trans.resize(size, Image.Resampling.LANCZOS)
+
     # 2. Version: Blue Background
-    # Using a premium brand blue (Slate 900 or Brand Blue)
-    brand_blue = (15, 23, 42, 255) # Slate 900
-    final_blue = Image.new("RGBA", img.size, brand_blue)
-    
+    final_blue = Image.new("RGBA", img.size, BRAND_BLUE)
+
     # For the blue version, we might want white outlines instead of black for better contrast
     # or keep black depending on the vibe. Let's try white outlines first as it's common for app icons.
-    white_layer = Image.new("RGBA", img.size, (255, 255, 255, 255))
+    white_layer = Image.new("RGBA", img.size, WHITE)
     final_blue = Image.composite(white_layer, final_blue, black_mask)
     final_blue = Image.composite(red_layer, final_blue, red_total_mask)
-    final_blue = final_blue.resize((800, 800), Image.Resampling.LANCZOS)
-    
-    # Save both
-    trans_path = os.path.join(output_dir, "renty-mascot-transparent.png")
-    blue_path = os.path.join(output_dir, "renty-mascot-blue-bg.png")
-    
-    final_trans.save(trans_path, "PNG")
-    final_blue.save(blue_path, "PNG")
-    
-    print(f"Generated transparent version: {trans_path}")
-    print(f"Generated blue background version: {blue_path}")
+    final_blue = final_blue.resize(size, Image.Resampling.LANCZOS)
+    return final_trans, final_blue
+
+# --- Tiled rendering ---
+#
+# Same output as render_variants, but the upscaled image only ever exists one
+# tile at a time. For each output tile we upscale just the source region its
+# downscale kernel reads (plus a 1px halo for the 3x3 max filter), build the
+# masks with array ops, paint both variants, downscale the tile and paste it
+# into the final images. Peak memory is a few tiles' worth of upscaled pixels
+# instead of ~8 full upscaled layers.
+
+LANCZOS_SUPPORT = 3.0
+
+def _span(start, end, ratio, limit):
+    """Upscaled-space [lo, hi) that output pixels [start, end) read when downscaling by `ratio`."""
+    support = LANCZOS_SUPPORT * max(ratio, 1.0)
+    lo = max(0, math.floor(start * ratio - support) - 3)
+    hi = min(limit, math.ceil(end * ratio + support) + 3)
+    return lo, hi
+
+def _max_filter_3x3(mask):
+    """ImageFilter.MaxFilter(3) on a boolean array (edges replicated, as Pillow does)."""
+    padded = np.pad(mask, 1, mode="edge")
+    rows = padded[:-2] | padded[1:-1] | padded[2:]
+    return rows[:, :-2] | rows[:, 1:-1] | rows[:, 2:]
+
+def _paint_tile(region):
+    """Both variants for one upscaled RGBA region, as uint8 arrays."""
+    r, g, b = (region[:, :, c].astype(np.uint32) for c in range(3))
+    # Pillow's RGB -> L conversion (ITU-R 601-2, fixed point)
+    luma = (r * 19595 + g * 38470 + b * 7471 + 0x8000) >> 16
+    black = _max_filter_3x3(luma < 100)
+    red = (r > 150) & (g < 100)
+
+    trans = np.empty(region.shape, dtype=np.uint8)
+    trans[:] = TRANSPARENT
+    trans[black] = BLACK
+    trans[red] = LED_RED
+
+    blue = np.empty(region.shape, dtype=np.uint8)
+    blue[:] = BRAND_BLUE
+    blue[black] = WHITE
+    blue[red] = LED_RED
+    return trans, blue
+
+def render_variants_tiled(orig, scale=4, size=OUTPUT_SIZE, tile=128):
+    """Memory-bounded render_variants; `tile` is the output tile edge in pixels."""
+    up_w, up_h = orig.width * scale, orig.height * scale
+    ratio_x, ratio_y = up_w / size[0], up_h / size[1]
+    final_trans = Image.new("RGBA", size)
+    final_blue = Image.new("RGBA", size)
+
+    for oy in range(0, size[1], tile):
+        oy1 = min(oy + tile, size[1])
+        uy0, uy1 = _span(oy, oy1, ratio_y, up_h)
+        for ox in range(0, size[0], tile):
+            ox1 = min(ox + tile, size[0])
+            ux0, ux1 = _span(ox, ox1, ratio_x, up_w)
+
+            # This tile's slice of the 4x upscale, computed from the source directly
+            region = orig.resize((ux1 - ux0, uy1 - uy0), Image.Resampling.LANCZOS,
+                                 box=(ux0 / scale, uy0 / scale, ux1 / scale, uy1 / scale))
+            trans, blue = _paint_tile(np.asarray(region))
+
+            box = (ox * ratio_x - ux0, oy * ratio_y - uy0, ox1 * ratio_x - ux0, oy1 * ratio_y - uy0)
+            for layer, final in ((trans, final_trans), (blue, final_blue)):
+                piece = Image.fromarray(layer, "RGBA").resize((ox1 - ox, oy1 - oy), Image.Resampling.LANCZOS, box=box)
+                final.paste(piece, (ox, oy))
+    return final_trans, final_blue
 
 if __name__ == "__main__":
-    src = r"C:\Users\ראובן שאנס\.gemini\antigravity\brain\4994e3a5-22cf-4a72-8aba-fb206dd45fc1\media__1770723093628.png"
-    dest_dir = r"c:\AnitiGravity Projects\RentMate\public\assets\images"
+    parser = argparse.ArgumentParser(description="Render the transparent and blue mascot variants")
+    parser.add_argument("input", nargs="?", help="Source mascot image")
+    parser.add_argument("output_dir", nargs="?", help="Directory for the two PNGs")
+    parser.add_argument("--tiled", action="store_true", help="Render tile by tile with bounded memory")
+    parser.add_argument("--tile", type=int, default=128, help="Output tile size in pixels for --tiled")
+    args = parser.parse_args()
+
+    src = args.input or r"C:\Users\ראובן שאנס\.gemini\antigravity\brain\4994e3a5-22cf-4a72-8aba-fb206dd45fc1\media__1770723093628.png"
+    dest_dir = args.output_dir or r"c:\AnitiGravity Projects\RentMate\public\assets\images"
+    if not os.path.exists(src):
+        print(f"Error: {src} not found.")
+        sys.exit(1)
     os.makedirs(dest_dir, exist_ok=True)
-    clean_logo_versions(src, dest_dir)
+    clean_logo_versions(src, dest_dir, args.tiled, args.tile)
@@ -0,0 +1,241 @@
+import io
+import os
+import csv
+import sys
+import json
+import time
+import uuid
+import random
+import argparse
+from datetime import date, datetime, timedelta
+from multiprocessing import Pool
+from pathlib import Path
+
+# Bulk synthetic portfolio generator (10k - 1M properties).
+# Produces referentially consistent user_profiles -> properties -> contracts ->
+# payments, either as CSV files or COPY'd straight into Postgres. Tenants are
+# embedded in contracts.tenants (JSONB), as in the current schema.
+#
+# Work is split into fixed-size shards of users; each shard has its own RNG
+# seeded from (seed, shard), so the output is identical for any worker count.
+
+CITIES = {
+    "Tel Aviv": ["Rothschild Blvd", "Dizengoff St", "Ibn Gabirol St", "HaYarkon St", "King George St", "Allenby St", "Ben Yehuda St"],
+    "Jerusalem": ["King George St", "Jaffa Rd", "Emek Refaim St", "Herzl Blvd", "Agripas St", "Keren HaYesod St"],
+    "Haifa": ["HaNassi Blvd", "Herzl St", "Moriah Blvd", "HaAtzmaut Rd", "Ben Gurion Blvd"],
+    "Rishon LeZion": ["Rothschild St", "Herzl St", "Jabotinsky St", "Sderot Moshe Dayan"],
+    "Petah Tikva": ["Jabotinsky Rd", "Rothschild St", "Haim Ozer St", "Baron Hirsch St"],
+    "Ashdod": ["Menachem Begin Blvd", "HaAtzmaut St", "Rogozin St"],
+    "Netanya": ["Herzl St", "Weizmann St", "Smilansky St", "Nice Blvd"],
+    "Beer Sheva": ["Rager Blvd", "Herzl St", "Tuviyahu Blvd"],
+    "Ramat Gan": ["Jabotinsky St", "Bialik St", "Krinitzi St"],
+    "Holon": ["Sokolov St", "Golda Meir St", "Eilat St"],
+}
+CITY_WEIGHTS = [22, 14, 9, 8, 8, 6, 7, 5, 8, 6]
+# Rough average monthly rent by city (ILS), in line with fetch-cbs-monthly-rent
+CITY_RENT = {"Tel Aviv": 6954, "Jerusalem": 4839, "Haifa": 3349, "Rishon LeZion": 4682, "Petah Tikva": 4510,
+             "Ashdod": 3950, "Netanya": 4200, "Beer Sheva": 2980, "Ramat Gan": 5600, "Holon": 4300}
+
+FIRST_NAMES = ["Noa", "Yosef", "Tamar", "David", "Maya", "Avi", "Shira", "Eitan", "Yael", "Omer",
+               "Michal", "Ariel", "Dana", "Itai", "Rivka", "Amir", "Lior", "Hila", "Nadav", "Sara"]
+LAST_NAMES = ["Cohen", "Levi", "Mizrahi", "Peretz", "Biton", "Dahan", "Avraham", "Friedman", "Agmon",
+              "Katz", "Azoulay", "Ben David", "Shapiro", "Golan", "Ohana"]
+
+PROPERTY_TYPES = ["apartment", "apartment", "apartment", "penthouse", "house", "garden"]
+LINKAGE_TYPES = ["none", "cpi", "cpi", "cpi", "housing", "usd", "construction"]
+
+TABLES = ["user_profiles", "properties", "contracts", "payments"]
+COLUMNS = {
+    "user_profiles": ["id", "email", "full_name", "subscription_plan", "is_active", "created_at"],
+    "properties": ["id", "user_id", "address", "city", "property_type", "rooms", "size_sqm",
+                   "status", "has_parking", "has_elevator", "has_safe_room"],
+    "contracts": ["id", "user_id", "property_id", "tenants", "status", "signing_date", "start_date",
+                  "end_date", "base_rent", "currency", "payment_frequency", "payment_day", "linkage_type",
+                  "linkage_sub_type", "base_index_date", "base_index_value", "linkage_ceiling",
+                  "linkage_floor", "notice_period_days", "security_deposit_amount"],
+    "payments": ["id", "user_id", "contract_id", "amount", "currency", "due_date", "status", "paid_date"],
+}
+
+SHARD_USERS = 2000
+PROPERTIES_PER_USER = (1, 6)
+
+
+def _uuid(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _add_months(d, months):
+    month = d.month - 1 + months
+    year = d.year + month // 12
+    month = month % 12 + 1
+    return date(year, month, min(d.day, 28))
+
+
+def generate_shard(seed, shard, users, today):
+    """Returns {table: [row tuples]} for one shard of `users` users."""
+    rng = random.Random(f"{seed}:{shard}")
+    rows = {table: [] for table in TABLES}
+    cities = list(CITIES)
+
+    for u in range(users):
+        user_id = _uuid(rng)
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        joined = today - timedelta(days=rng.randint(1, 900))
+        rows["user_profiles"].append((
+            user_id, f"{first.lower()}.{last.lower().replace(' ', '')}.{shard}.{u}@example.co.il",
+            f"{first} {last}", "free_forever", True, f"{joined.isoformat()}T09:00:00+00"
+        ))
+
+        for _ in range(rng.randint(*PROPERTIES_PER_USER)):
+            property_id = _uuid(rng)
+            city = rng.choices(cities, weights=CITY_WEIGHTS)[0]
+            rooms = rng.choice([2, 3, 3, 4, 4, 5])
+            rent = int(CITY_RENT[city] * (0.6 + 0.2 * rooms) * rng.uniform(0.85, 1.2) / 10) * 10
+            occupied = rng.random() < 0.85
+            rows["properties"].append((
+                property_id, user_id, f"{rng.randint(1, 150)} {rng.choice(CITIES[city])}", city,
+                rng.choice(PROPERTY_TYPES), rooms, rng.randint(35 + 10 * rooms, 60 + 25 * rooms),
+                "Occupied" if occupied else "Vacant", rng.random() < 0.5, rng.random() < 0.6, rng.random() < 0.7
+            ))
+            if not occupied:
+                continue
+
+            # Same shape as the embed_tenants_in_contracts backfill
+            t_first, t_last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            tenants = [{
+                "name": f"{t_first} {t_last}",
+                "id_number": str(rng.randint(10_000_000, 399_999_999)),
+                "email": f"{t_first.lower()}.{t_last.lower().replace(' ', '')}{rng.randint(1, 999)}@example.com",
+                "phone": f"05{rng.randint(0, 8)}-{rng.randint(1_000_000, 9_999_999)}",
+            }]
+
+            contract_id = _uuid(rng)
+            start = _add_months(date(today.year, today.month, 1), -rng.randint(0, 30))
+            months = rng.choice([12, 12, 12, 24, 36])
+            end = _add_months(start, months) - timedelta(days=1)
+            linkage = rng.choice(LINKAGE_TYPES)
+            base_index_date = _add_months(start, -1).strftime("%Y-%m") if linkage != "none" else None
+            base_index_value = (round(rng.uniform(3.2, 3.9), 4) if linkage == "usd"
+                                else round(rng.uniform(95, 110), 2) if linkage != "none" else None)
+            payment_day = rng.choice([1, 1, 1, 5, 10, 15])
+            rows["contracts"].append((
+                contract_id, user_id, property_id, tenants, "active" if end >= today else "archived",
+                _add_months(start, -1).isoformat(), start.isoformat(), end.isoformat(), rent, "ILS", "monthly",
+                payment_day, linkage, rng.choice(["known", "respect_of"]) if linkage != "none" else None,
+                base_index_date, base_index_value,
+                rng.choice([None, None, 3, 5]) if linkage != "none" else None,
+                rng.choice([None, 0]) if linkage != "none" else None,
+                rng.choice([60, 90, 100]), rent * rng.choice([1, 2, 3])
+            ))
+
+            # Monthly payment schedule; past months mostly paid
+            for m in range(months):
+                due = _add_months(start, m).replace(day=payment_day)
+                if due < today:
+                    status = rng.choices(["paid", "pending", "overdue"], weights=[92, 3, 5])[0]
+                else:
+                    status = "pending"
+                paid = (due + timedelta(days=rng.randint(-2, 6))).isoformat() if status == "paid" else None
+                rows["payments"].append((
+                    _uuid(rng), user_id, contract_id, rent, "ILS", due.isoformat(), status, paid
+                ))
+    return rows
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def write_shard_csv(out_dir, shard, rows):
+    for table, table_rows in rows.items():
+        path = Path(out_dir) / table / f"part-{shard:05d}.csv"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS[table])
+            writer.writerows([_csv_value(v) for v in row] for row in table_rows)
+
+
+def copy_shard(db_uri, rows, disable_triggers):
+    """COPYs one shard in FK order inside a single transaction."""
+    import pg8000
+    from restore_backup import parse_uri
+
+    conn = pg8000.connect(**parse_uri(db_uri))
+    try:
+        cursor = conn.cursor()
+        if disable_triggers:
+            # user_profiles reference auth.users, which synthetic users don't exist in
+            cursor.execute("SET session_replication_role = replica")
+        for table in TABLES:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows([_csv_value(v) for v in row] for row in rows[table])
+            buffer.seek(0)
+            columns = ", ".join(COLUMNS[table])
+            cursor.execute(f"COPY public.{table} ({columns}) FROM STDIN WITH (FORMAT csv)",
+                           stream=io.BytesIO(buffer.getvalue().encode("utf-8")))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _run_shard(job):
+    seed, shard, users, today, out_dir, db_uri, disable_triggers = job
+    rows = generate_shard(seed, shard, users, today)
+    if db_uri:
+        copy_shard(db_uri, rows, disable_triggers)
+    else:
+        write_shard_csv(out_dir, shard, rows)
+    return {table: len(table_rows) for table, table_rows in rows.items()}
+
+
+def generate(properties, seed=2026, workers=None, out_dir="synthetic_portfolio", db_uri=None,
+             disable_triggers=False, today=None):
+    today = today or date.today()
+    avg_per_user = sum(PROPERTIES_PER_USER) / 2
+    total_users = max(1, round(properties / avg_per_user))
+    shards = [(i, min(SHARD_USERS, total_users - i * SHARD_USERS))
+              for i in range((total_users + SHARD_USERS - 1) // SHARD_USERS)]
+    jobs = [(seed, shard, users, today, out_dir, db_uri, disable_triggers) for shard, users in shards]
+
+    target = db_uri.split("@")[-1] if db_uri else out_dir
+    print(f"🏗️  Generating ~{properties:,} properties for {total_users:,} users "
+          f"in {len(shards)} shards -> {target}")
+    started = time.time()
+    totals = {table: 0 for table in TABLES}
+    with Pool(processes=workers or os.cpu_count()) as pool:
+        for counts in pool.imap_unordered(_run_shard, jobs):
+            for table, count in counts.items():
+                totals[table] += count
+
+    elapsed = time.time() - started
+    for table in TABLES:
+        print(f"  {table:<14} {totals[table]:>12,}")
+    print(f"✅ Done in {elapsed:.1f}s ({sum(totals.values()) / elapsed:,.0f} rows/s)")
+
+    if not db_uri:
+        with open(Path(out_dir) / "summary.json", "w", encoding="utf-8") as f:
+            json.dump({"seed": seed, "generated_at": datetime.now().isoformat(),
+                       "today": today.isoformat(), "rows": totals}, f, indent=2)
+    return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic RentMate portfolio")
+    parser.add_argument("properties", type=int, help="Approximate number of properties (e.g. 10000, 1000000)")
+    parser.add_argument("--seed", type=int, default=2026)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="synthetic_portfolio", help="CSV output directory")
+    parser.add_argument("--db", help="postgresql:// URI to COPY into instead of writing CSV")
+    parser.add_argument("--disable-triggers", action="store_true",
+                        help="Load with session_replication_role=replica (skips auth.users FKs)")
+    args = parser.parse_args()
+
+    generate(args.properties, args.seed, args.workers, args.out, args.db, args.disable_triggers)
+    sys.exit(0)
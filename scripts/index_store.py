@@ -0,0 +1,131 @@
+import os
+import sys
+import numpy as np
+from pathlib import Path
+
+# Local columnar cache of index_data, one pair of .npy files per index_type:
+#   <type>.dates.npy  int32 days since 1970-01-01, sorted ascending
+#   <type>.values.npy float64
+# Files are opened with mmap_mode='r', so every process reading the store
+# shares the same page-cache pages and startup does no parsing at all.
+
+STORE_DIR = Path('.cache/index_store')
+
+
+def to_day_number(date_str):
+    """'YYYY-MM' or 'YYYY-MM-DD' -> int day number (monthly values map to the 1st)."""
+    return int(np.datetime64(date_str[:10], 'D').astype(np.int32))
+
+
+def from_day_number(day):
+    return str(np.datetime64(int(day), 'D'))
+
+
+class IndexStore:
+    def __init__(self, root=STORE_DIR):
+        self.root = Path(root)
+        self._open = {}
+
+    def _paths(self, index_type):
+        return self.root / f"{index_type}.dates.npy", self.root / f"{index_type}.values.npy"
+
+    def index_types(self):
+        return sorted(p.name[:-len('.dates.npy')] for p in self.root.glob('*.dates.npy'))
+
+    def series(self, index_type):
+        """Returns (dates, values) as read-only memory maps (empty arrays if absent)."""
+        if index_type not in self._open:
+            dates_path, values_path = self._paths(index_type)
+            if not dates_path.exists():
+                return np.empty(0, np.int32), np.empty(0, np.float64)
+            self._open[index_type] = (
+                np.load(dates_path, mmap_mode='r'),
+                np.load(values_path, mmap_mode='r'),
+            )
+        return self._open[index_type]
+
+    def value_at_or_before(self, index_type, date_str):
+        """Latest value published on or before date_str, or None. O(log n)."""
+        dates, values = self.series(index_type)
+        idx = int(np.searchsorted(dates, to_day_number(date_str), side='right')) - 1
+        if idx < 0:
+            return None
+        return from_day_number(dates[idx]), float(values[idx])
+
+    def latest(self, index_type):
+        dates, values = self.series(index_type)
+        if not len(dates):
+            return None
+        return from_day_number(dates[-1]), float(values[-1])
+
+    def update(self, index_type, rows, replace=False):
+        """Merges [(date_str, value), ...] into the store; newer rows win on equal dates.
+
+        replace=True drops the stored series first, so dates missing from rows go away.
+        """
+        rows = list(rows)
+        if not rows and not replace:
+            return 0
+        old_dates, old_values = self.series(index_type)
+        if replace:
+            old_dates, old_values = old_dates[:0], old_values[:0]
+        new_dates = np.array([to_day_number(d) for d, _ in rows], dtype=np.int32)
+        new_values = np.array([float(v) for _, v in rows], dtype=np.float64)
+
+        dates = np.concatenate([new_dates, old_dates])
+        values = np.concatenate([new_values, old_values])
+        # np.unique keeps the first occurrence, i.e. the freshly fetched value
+        dates, first = np.unique(dates, return_index=True)
+        values = values[first]
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._open.pop(index_type, None)
+        for path, array in zip(self._paths(index_type), (dates, values)):
+            # Atomic swap: readers with the old file mapped keep a consistent view
+            tmp_path = path.with_name(path.name + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_path, path)
+        return len(dates)
+
+    def remove(self, index_type):
+        self._open.pop(index_type, None)
+        for path in self._paths(index_type):
+            path.unlink(missing_ok=True)
+
+    def sync_from_database(self, conn):
+        """Rebuilds every series from public.index_data, dropping rows and types deleted there."""
+        cursor = conn.cursor()
+        cursor.execute("SELECT index_type::text, date, value FROM public.index_data")
+        grouped = {}
+        for index_type, date_str, value in cursor.fetchall():
+            grouped.setdefault(index_type, []).append((date_str, value))
+        for index_type, rows in grouped.items():
+            self.update(index_type, rows, replace=True)
+            print(f"  {index_type}: {len(rows)} values")
+        for index_type in set(self.index_types()) - set(grouped):
+            self.remove(index_type)
+            print(f"  {index_type}: removed")
+        return grouped.keys()
+
+
+if __name__ == "__main__":
+    store = IndexStore()
+    if len(sys.argv) >= 4 and sys.argv[1] == 'lookup':
+        print(store.value_at_or_before(sys.argv[2], sys.argv[3]))
+    elif len(sys.argv) >= 3 and sys.argv[1] == 'sync':
+        import pg8000
+        from fetch_boi_history import parse_uri
+
+        conn = pg8000.connect(**parse_uri(sys.argv[2]))
+        try:
+            store.sync_from_database(conn)
+        finally:
+            conn.close()
+    elif len(sys.argv) >= 2 and sys.argv[1] == 'info':
+        for index_type in store.index_types():
+            dates, _ = store.series(index_type)
+            print(f"{index_type}: {len(dates)} values, latest {store.latest(index_type)}")
+    else:
+        print("Usage: python scripts/index_store.py <info | lookup <index_type> <YYYY-MM[-DD]> | sync <postgresql://...>>")
+        sys.exit(1)
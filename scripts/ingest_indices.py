@@ -0,0 +1,234 @@
+import os
+import sys
+import json
+import asyncio
+import argparse
+import datetime
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from pathlib import Path
+
+from fetch_boi_history import (
+    CURRENCIES, RateLimiter, ObservationParser, build_url, parse_uri,
+    upsert_index_data, update_index_store
+)
+
+# Unified ingestion for everything that lands in public.index_data:
+#   BOI SDMX exchange rates (usd, eur)
+#   CBS price indices: CPI (120010), housing (120490), construction (200010)
+# Every source yields the same Observation records, all sources are fetched
+# concurrently, and the merged result is bulk-upserted in one go.
+#
+# Replaces the split between scripts/fetch_boi_history.py and the pg_cron ->
+# fetch-index-data / fetch-cbs-monthly-rent edge functions for batch jobs.
+
+Observation = namedtuple('Observation', ['index_type', 'date', 'value', 'source'])
+
+CBS_PRICE_URL = 'https://api.cbs.gov.il/index/data/price'
+FIXTURES_DIR = Path(__file__).parent / 'fixtures' / 'ingest'
+
+# Same series codes as fetch-index-data's fetchCbsSelectedXml typeMap
+CBS_SERIES = {
+    'cpi': '120010',
+    'housing': '120490',
+    'construction': '200010',
+}
+
+
+class Source(ABC):
+    """A pluggable feed. Subclasses implement fetch() and return Observations."""
+    name = 'source'
+
+    @abstractmethod
+    async def fetch(self, session, limiter, since):
+        """Observations published since `since`, fetched through the shared session and limiter."""
+
+
+class BoiExchangeRates(Source):
+    name = 'boi-exchange-rates'
+
+    def __init__(self, base_url=None, currencies=CURRENCIES):
+        self.base_url = base_url
+        self.currencies = currencies
+
+    async def fetch(self, session, limiter, since):
+        codes = ",".join(code for code, _ in self.currencies)
+        by_code = {code: db_type for code, db_type in self.currencies}
+        url = build_url(codes, since, datetime.date.today())
+        if self.base_url:
+            url = self.base_url + url[url.index('?'):]
+
+        parser = ObservationParser(key_column='BASE_CURRENCY')
+        async with limiter:
+            async with session.get(url) as resp:
+                resp.raise_for_status()
+                async for raw_line in resp.content:
+                    parser.feed(raw_line.decode('utf-8-sig'))
+
+        return [
+            Observation(by_code[code], date_str, value, 'exchange-api')
+            for code, date_str, value in parser.rows if code in by_code
+        ]
+
+
+class CbsPriceIndex(Source):
+    """CBS price API; one instance per series (CPI, housing, construction)."""
+
+    def __init__(self, index_type, series_code=None, base_url=CBS_PRICE_URL):
+        self.index_type = index_type
+        self.series_code = series_code or CBS_SERIES[index_type]
+        self.base_url = base_url
+        self.name = f"cbs-{index_type}"
+
+    async def fetch(self, session, limiter, since):
+        params = {
+            'id': self.series_code,
+            'format': 'json',
+            'download': 'false',
+            'startPeriod': since.strftime('%m-%Y'),
+            'endPeriod': datetime.date.today().strftime('%m-%Y'),
+        }
+        # CBS blocks unknown agents (see fetch-index-data)
+        headers = {'User-Agent': 'RentMate/1.0 (https://rentmate.co.il)'}
+        async with limiter:
+            async with session.get(self.base_url, params=params, headers=headers) as resp:
+                resp.raise_for_status()
+                payload = await resp.json(content_type=None)
+        return [Observation(self.index_type, d, v, 'cbs') for d, v in parse_cbs_points(payload)]
+
+
+def parse_cbs_points(payload):
+    """Extracts (YYYY-MM, value) pairs from a CBS price response.
+
+    Handles the flat {"month": [{"date", "value"}]} shape the edge function reads
+    and the nested {"month": [{"date": [{"year", "month", "currBase": {"value"}}]}]} one.
+    """
+    points = []
+    for entry in payload.get('month') or payload.get('data') or []:
+        nested = entry.get('date') if isinstance(entry.get('date'), list) else None
+        for point in nested if nested is not None else [entry]:
+            if 'year' in point and 'month' in point:
+                date_str = f"{int(point['year']):04d}-{int(point['month']):02d}"
+                value = (point.get('currBase') or {}).get('value', point.get('value'))
+            else:
+                date_str = str(point.get('date', ''))[:7]
+                value = point.get('value')
+            if date_str and value is not None:
+                points.append((date_str, float(value)))
+    return points
+
+
+def default_sources(boi_url=None, cbs_url=CBS_PRICE_URL):
+    return [BoiExchangeRates(base_url=boi_url)] + [
+        CbsPriceIndex(index_type, base_url=cbs_url) for index_type in CBS_SERIES
+    ]
+
+
+def normalize(observations):
+    """Drops duplicates (last one wins) and invalid values; returns sorted Observations."""
+    merged = {}
+    for obs in observations:
+        if obs.value is None or obs.value != obs.value or obs.value <= 0:
+            continue
+        merged[(obs.index_type, obs.date)] = obs
+    return [merged[key] for key in sorted(merged)]
+
+
+async def run_sources(sources, since, max_concurrency=4, per_second=4):
+    import aiohttp
+
+    limiter = RateLimiter(max_concurrency, per_second)
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=60)) as session:
+        results = await asyncio.gather(
+            *(source.fetch(session, limiter, since) for source in sources),
+            return_exceptions=True
+        )
+
+    observations = []
+    for source, result in zip(sources, results):
+        if isinstance(result, Exception):
+            print(f"  [!] {source.name} failed: {result}")
+            continue
+        print(f"  {source.name}: {len(result)} observations")
+        observations.extend(result)
+    return normalize(observations)
+
+
+def run_pipeline(sources, since, db_uri=None):
+    print(f"🚀 Ingesting {len(sources)} sources since {since}...")
+    observations = asyncio.run(run_sources(sources, since))
+    print(f"{len(observations)} observations after normalization")
+
+    series = {}
+    for obs in observations:
+        series.setdefault(obs.index_type, []).append((obs.date, obs.value))
+    update_index_store(series)
+
+    if db_uri and observations:
+        import pg8000
+
+        conn = pg8000.connect(**parse_uri(db_uri))
+        try:
+            upsert_index_data(conn, [tuple(obs) for obs in observations])
+        finally:
+            conn.close()
+        print(f"✅ Upserted {len(observations)} rows into index_data")
+    return observations
+
+
+# --- Local stand-in for tests and offline runs ---
+
+async def start_fixture_server(fixtures_dir=FIXTURES_DIR, port=0):
+    """Serves recorded responses: /boi -> boi_exr.csv, /cbs?id=<code> -> cbs_<code>.json.
+
+    Returns (runner, base_url); call `await runner.cleanup()` when done.
+    """
+    from aiohttp import web
+
+    fixtures_dir = Path(fixtures_dir)
+
+    async def boi(request):
+        return web.FileResponse(fixtures_dir / 'boi_exr.csv')
+
+    async def cbs(request):
+        path = fixtures_dir / f"cbs_{request.query.get('id')}.json"
+        if not path.exists():
+            return web.Response(status=404)
+        return web.FileResponse(path)
+
+    app = web.Application()
+    app.router.add_get('/boi', boi)
+    app.router.add_get('/cbs', cbs)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', port).start()
+    bound_port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{bound_port}"
+
+
+async def run_against_fixtures(fixtures_dir=FIXTURES_DIR, since=datetime.date(2000, 1, 1)):
+    runner, base_url = await start_fixture_server(fixtures_dir)
+    try:
+        sources = default_sources(boi_url=f"{base_url}/boi", cbs_url=f"{base_url}/cbs")
+        return await run_sources(sources, since)
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest BOI and CBS statistics into index_data")
+    parser.add_argument("--since", default=None, help="YYYY-MM-DD (default: 400 days ago)")
+    parser.add_argument("--db", default=os.environ.get("INDEX_DB_URI"), help="postgresql:// URI to upsert into")
+    parser.add_argument("--fixtures", nargs="?", const=str(FIXTURES_DIR),
+                        help="Run against the local stand-in serving recorded fixtures (no DB writes)")
+    args = parser.parse_args()
+
+    since = (datetime.date.fromisoformat(args.since) if args.since
+             else datetime.date.today() - datetime.timedelta(days=400))
+
+    if args.fixtures:
+        result = asyncio.run(run_against_fixtures(args.fixtures, since))
+        print(json.dumps([obs._asdict() for obs in result], indent=2))
+        sys.exit(0 if result else 1)
+
+    run_pipeline(default_sources(), since, args.db)
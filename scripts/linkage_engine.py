@@ -0,0 +1,278 @@
+import sys
+import time
+import numpy as np
+
+# Vectorized rent-linkage engine over index_data.
+# Mirrors CalculatorService.calculateLinkage (including the index_bases chain
+# factors for CPI rebases) and the "G. INDEX LINKAGE (CPI) MONITOR" step of
+# run-automations, but revalues whole portfolios in one NumPy batch instead of
+# contract by contract.
+
+LINKAGE_TYPES = ('cpi', 'housing', 'construction', 'usd', 'eur')
+
+# run-automations only proposes an update when the rent moves by more than this (ILS)
+ALERT_MIN_DELTA = 10
+
+
+def to_day_numbers(dates):
+    """'YYYY-MM' / 'YYYY-MM-DD' strings -> int32 days since 1970-01-01 (monthly = 1st of month)."""
+    return np.array([d[:10] for d in dates], dtype='datetime64[D]').astype(np.int32)
+
+
+class IndexSeries:
+    """One index_type as sorted parallel arrays of day numbers and values."""
+
+    def __init__(self, days, values):
+        order = np.argsort(days, kind='stable')
+        self.days = np.asarray(days, dtype=np.int32)[order]
+        self.values = np.asarray(values, dtype=np.float64)[order]
+
+    @classmethod
+    def from_sorted(cls, days, values):
+        """Wraps already-sorted arrays (e.g. IndexStore memory maps) without copying."""
+        series = cls.__new__(cls)
+        series.days = days
+        series.values = values
+        return series
+
+    @classmethod
+    def from_rows(cls, rows):
+        """rows: iterable of (date_str, value)."""
+        rows = list(rows)
+        if not rows:
+            return cls(np.empty(0, np.int32), np.empty(0, np.float64))
+        dates, values = zip(*rows)
+        return cls(to_day_numbers(dates), np.array(values, dtype=np.float64))
+
+    def value_at(self, days):
+        """Latest published value at or before each day (NaN before the series starts)."""
+        return self.lookup(days)[0]
+
+    def lookup(self, days):
+        """(value, index date) of the latest publication at or before each day; NaN where none."""
+        days = np.asarray(days, dtype=np.int32)
+        idx = np.searchsorted(self.days, days, side='right') - 1
+        found = idx >= 0
+        values = np.full(days.shape, np.nan)
+        dates = np.full(days.shape, np.nan)
+        values[found] = self.values[idx[found]]
+        dates[found] = self.days[idx[found]]
+        return values, dates
+
+
+class ChainFactors:
+    """index_bases rebases of one index_type as sorted start days and cumulative factors."""
+
+    def __init__(self, starts, factors):
+        order = np.argsort(starts, kind='stable')
+        self.starts = np.asarray(starts, dtype=np.int32)[order]
+        factors = np.asarray(factors, dtype=np.float64)[order]
+        # Rows without a positive chain_factor don't rebase (same as the TS service)
+        factors = np.where(factors > 0, factors, 1.0)
+        self.cumulative = np.concatenate(([1.0], np.cumprod(factors)))
+
+    def between(self, base_days, current_days):
+        """Product of the factors of every rebase with base < start <= current (1 where unknown)."""
+        base_days = np.asarray(base_days, dtype=np.float64)
+        current_days = np.asarray(current_days, dtype=np.float64)
+        known = ~np.isnan(base_days) & ~np.isnan(current_days)
+        out = np.ones(base_days.shape)
+        lo = np.searchsorted(self.starts, base_days[known], side='right')
+        hi = np.searchsorted(self.starts, current_days[known], side='right')
+        out[known] = np.where(hi > lo, self.cumulative[hi] / self.cumulative[lo], 1.0)
+        return out
+
+
+def chain_factors_from_rows(rows):
+    """rows: iterable of (index_type, base_period_start, chain_factor) from index_bases."""
+    grouped = {}
+    for index_type, start, factor in rows:
+        grouped.setdefault(index_type, []).append((str(start), np.nan if factor is None else float(factor)))
+    return {t: ChainFactors(to_day_numbers([s for s, _ in r]), [f for _, f in r]) for t, r in grouped.items()}
+
+
+class LinkageEngine:
+    def __init__(self, series, bases=None):
+        self.series = series  # {index_type: IndexSeries}
+        self.bases = bases or {}  # {index_type: ChainFactors}
+
+    @classmethod
+    def from_rows(cls, rows, bases=None):
+        """rows: iterable of (index_type, date_str, value), e.g. a SELECT on index_data.
+        bases: optional (index_type, base_period_start, chain_factor) rows from index_bases."""
+        grouped = {}
+        for index_type, date_str, value in rows:
+            grouped.setdefault(index_type, []).append((date_str, float(value)))
+        return cls({t: IndexSeries.from_rows(r) for t, r in grouped.items()},
+                   chain_factors_from_rows(bases or []))
+
+    @classmethod
+    def from_store(cls, store, bases=None):
+        """Builds the engine on top of a scripts/index_store.py IndexStore (no parsing, shared pages)."""
+        return cls({t: IndexSeries.from_sorted(*store.series(t)) for t in store.index_types()},
+                   chain_factors_from_rows(bases or []))
+
+    @classmethod
+    def from_database(cls, conn):
+        cursor = conn.cursor()
+        cursor.execute("SELECT index_type::text, date, value FROM public.index_data")
+        rows = cursor.fetchall()
+        cursor.execute("SELECT index_type, base_period_start, chain_factor FROM public.index_bases")
+        return cls.from_rows(rows, cursor.fetchall())
+
+    def revalue(self, portfolio, as_of=None, alert_min_delta=ALERT_MIN_DELTA, alert_pct=None):
+        """Computes linked rent for every contract in portfolio at once.
+
+        portfolio: dict of equal-length arrays -
+            base_rent, base_index_value, linkage_type (required)
+            base_index_date, linkage_ceiling, linkage_floor (optional)
+        as_of: 'YYYY-MM-DD', a day number, or an array of day numbers (default: today).
+        Returns a dict of result arrays.
+        """
+        base_rent = np.asarray(portfolio['base_rent'], dtype=np.float64)
+        base_index = np.asarray(portfolio['base_index_value'], dtype=np.float64)
+        linkage_type = np.asarray(portfolio['linkage_type'])
+        n = base_rent.shape[0]
+
+        if as_of is None:
+            as_of = np.datetime64('today', 'D').astype(np.int32)
+        elif isinstance(as_of, str):
+            as_of = to_day_numbers([as_of])[0]
+        as_of = np.broadcast_to(np.asarray(as_of, dtype=np.int32), (n,))
+
+        base_days = portfolio.get('base_index_date')
+        base_days = (np.full(n, np.nan) if base_days is None
+                     else np.asarray(base_days, dtype=np.float64))
+
+        # Latest known index (and its date) per contract, looked up per linkage type
+        current_index = np.full(n, np.nan)
+        current_date = np.full(n, np.nan)
+        chain_factor = np.ones(n)
+        for index_type, series in self.series.items():
+            mask = linkage_type == index_type
+            if mask.any():
+                current_index[mask], current_date[mask] = series.lookup(as_of[mask])
+                if index_type in self.bases:
+                    chain_factor[mask] = self.bases[index_type].between(base_days[mask], current_date[mask])
+
+        linked = np.isin(linkage_type, LINKAGE_TYPES)
+        # Zero/NULL base index would divide by zero; the app keeps base rent in that case
+        invalid_base = linked & ~(base_index > 0)
+        missing_index = linked & ~invalid_base & np.isnan(current_index)
+        usable = linked & ~invalid_base & ~missing_index
+
+        # Index values quoted on an older base are chained up to the current one
+        ratio = np.ones(n)
+        np.divide(current_index * chain_factor, base_index, out=ratio, where=usable)
+
+        # Annualized ceiling: cumulative ceiling% per year from the base date to the current index date
+        if portfolio.get('linkage_ceiling') is not None and portfolio.get('base_index_date') is not None:
+            ceiling = np.asarray(portfolio['linkage_ceiling'], dtype=np.float64)
+            years = np.maximum(0, current_date - base_days) / 365.25
+            max_ratio = 1 + (ceiling * years) / 100
+            capped = usable & (ceiling > 0) & ~np.isnan(base_days)
+            ratio = np.where(capped, np.minimum(ratio, max_ratio), ratio)
+
+        # Floor of 0 means "never drop below the base index"
+        if portfolio.get('linkage_floor') is not None:
+            floor = np.asarray(portfolio['linkage_floor'], dtype=np.float64)
+            ratio = np.where(usable & (floor == 0), np.maximum(ratio, 1), ratio)
+
+        # Math.round semantics (half up), not banker's rounding
+        linked_rent = np.floor(base_rent * ratio + 0.5)
+        delta = linked_rent - base_rent
+        delta_pct = np.zeros(n)
+        np.divide(delta * 100, base_rent, out=delta_pct, where=base_rent > 0)
+
+        alert = usable & (np.abs(delta) > alert_min_delta)
+        if alert_pct is not None:
+            alert &= np.abs(delta_pct) >= alert_pct
+
+        return {
+            'current_index': current_index,
+            'current_index_date': current_date,
+            'chain_factor': chain_factor,
+            'ratio': ratio,
+            'linked_rent': linked_rent,
+            'delta': delta,
+            'delta_pct': delta_pct,
+            'alert': alert,
+            'invalid_base': invalid_base,
+            'missing_index': missing_index,
+        }
+
+
+def portfolio_from_contracts(contracts):
+    """Builds the column arrays revalue() expects from contract rows (dicts from PostgREST/pg)."""
+    def number(value):
+        return np.nan if value is None else float(value)
+
+    base_dates = [c.get('base_index_date') for c in contracts]
+    base_days = np.full(len(contracts), np.nan)
+    known = [i for i, d in enumerate(base_dates) if d]
+    if known:
+        base_days[known] = to_day_numbers([base_dates[i] for i in known])
+
+    return {
+        'base_rent': np.array([number(c.get('base_rent')) for c in contracts]),
+        'base_index_value': np.array([number(c.get('base_index_value')) for c in contracts]),
+        'linkage_type': np.array([c.get('linkage_type') or 'none' for c in contracts]),
+        'base_index_date': base_days,
+        'linkage_ceiling': np.array([number(c.get('linkage_ceiling')) for c in contracts]),
+        'linkage_floor': np.array([number(c.get('linkage_floor')) for c in contracts]),
+    }
+
+
+def synthetic_engine(years=20, seed=42):
+    """Monthly CPI/housing/construction and daily USD/EUR series for benchmarking."""
+    rng = np.random.default_rng(seed)
+    start = np.datetime64('today', 'M') - years * 12
+    months = np.arange(start, start + years * 12 + 1).astype('datetime64[D]').astype(np.int32)
+    days = np.arange(months[0], months[-1] + 1, dtype=np.int32)
+
+    series = {}
+    for index_type, drift in (('cpi', 0.002), ('housing', 0.004), ('construction', 0.003)):
+        values = 100 * np.cumprod(1 + rng.normal(drift, 0.003, months.size))
+        series[index_type] = IndexSeries(months, values)
+    for index_type, level in (('usd', 3.7), ('eur', 4.0)):
+        values = level * np.exp(np.cumsum(rng.normal(0, 0.004, days.size)))
+        series[index_type] = IndexSeries(days, values)
+    return LinkageEngine(series), int(days[0]), int(days[-1])
+
+
+def synthetic_portfolio(n, first_day, last_day, seed=7):
+    rng = np.random.default_rng(seed)
+    base_days = rng.integers(first_day, last_day, n).astype(np.float64)
+    portfolio = {
+        'base_rent': rng.integers(3000, 15000, n).astype(np.float64),
+        'base_index_value': rng.uniform(90, 130, n),
+        'linkage_type': rng.choice(np.array(LINKAGE_TYPES + ('none',)), n),
+        'base_index_date': base_days,
+        'linkage_ceiling': np.where(rng.random(n) < 0.3, rng.choice([3.0, 5.0], n), np.nan),
+        'linkage_floor': np.where(rng.random(n) < 0.5, 0.0, np.nan),
+    }
+    # A slice of broken rows, like the "Invalid CPI Reference" autopilot scenario
+    portfolio['base_index_value'][rng.random(n) < 0.01] = 0
+    return portfolio
+
+
+def benchmark(n=100_000, repeats=5):
+    engine, first_day, last_day = synthetic_engine()
+    portfolio = synthetic_portfolio(n, first_day, last_day)
+
+    engine.revalue(portfolio)  # warm-up
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = engine.revalue(portfolio)
+        timings.append(time.perf_counter() - started)
+
+    best = min(timings)
+    print(f"📊 Revalued {n:,} contracts: best {best * 1000:.1f}ms, median {sorted(timings)[len(timings) // 2] * 1000:.1f}ms")
+    print(f"   Alerts: {int(result['alert'].sum()):,}  Invalid base index: {int(result['invalid_base'].sum()):,}")
+    print("✅ PERFORMANCE: OK (< 1s)" if best < 1 else "⚠️ PERFORMANCE: SLOW (>= 1s)")
+    return best
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,423 @@
+import os
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+
+# Asynchronous HTTP load generator for RentMate.
+# Drives PostgREST (properties, contracts, payments) and the chat-support
+# edge function with a weighted request mix, records latency into HDR-style
+# histograms and reports p50/p95/p99, throughput and error rates.
+# Replaces the hard-coded "Success" output of stress_test_production.py.
+#
+# Two models:
+#   closed - N virtual users in a loop; throughput adapts to response time
+#   open   - requests arrive at a fixed or ramping rate regardless of how the
+#            server copes, and latency is measured from the *intended* send
+#            time (coordinated-omission correction), so queueing past
+#            saturation shows up in the percentiles instead of being hidden.
+
+
+def load_env():
+    env_vars = {}
+    if os.path.exists(".env"):
+        with open(".env") as f:
+            for line in f:
+                if "=" in line and not line.startswith("#"):
+                    k, v = line.strip().split("=", 1)
+                    env_vars[k] = v
+    return env_vars
+
+
+class LatencyHistogram:
+    """Log-linear bucketed histogram in the spirit of HdrHistogram.
+
+    Values (microseconds) are bucketed by power of two, each power split into
+    2**SUB_BUCKET_BITS linear sub-buckets, so the relative error stays under
+    1% at any magnitude while memory stays constant.
+    """
+    SUB_BUCKET_BITS = 7
+
+    def __init__(self):
+        self.counts = {}
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def _index(self, value):
+        value = max(int(value), 0)
+        shift = max(value.bit_length() - self.SUB_BUCKET_BITS, 0)
+        return (shift << self.SUB_BUCKET_BITS) + (value >> shift)
+
+    def _value(self, index):
+        shift = index >> self.SUB_BUCKET_BITS
+        mantissa = index & ((1 << self.SUB_BUCKET_BITS) - 1)
+        if shift == 0:
+            return mantissa
+        # Midpoint of the bucket's range
+        return (mantissa << shift) + (1 << (shift - 1))
+
+    def record(self, value_us, count=1):
+        index = self._index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total += count
+        self.min = value_us if self.min is None else min(self.min, value_us)
+        self.max = max(self.max, value_us)
+
+    def merge(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct):
+        if not self.total:
+            return 0
+        target = max(1, int(round(self.total * pct / 100.0)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._value(index), self.max)
+        return self.max
+
+    def summary_ms(self):
+        return {
+            "count": self.total,
+            "p50_ms": round(self.percentile(50) / 1000, 2),
+            "p95_ms": round(self.percentile(95) / 1000, 2),
+            "p99_ms": round(self.percentile(99) / 1000, 2),
+            "max_ms": round(self.max / 1000, 2),
+        }
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.ok = 0
+        self.errors = 0
+        self.status_codes = {}
+
+    def record(self, latency_us, status):
+        self.latency.record(latency_us)
+        self.status_codes[str(status)] = self.status_codes.get(str(status), 0) + 1
+        if isinstance(status, int) and status < 400:
+            self.ok += 1
+        else:
+            self.errors += 1
+
+
+def build_endpoints(base_url):
+    """Request templates per endpoint name: (method, url, json_body)."""
+    rest = f"{base_url}/rest/v1"
+    return {
+        "properties": ("GET", f"{rest}/properties?select=id,address,city,status&limit=50", None),
+        "contracts": ("GET", f"{rest}/contracts?select=id,end_date,base_rent,linkage_type&status=eq.active&limit=50", None),
+        "payments": ("GET", f"{rest}/payments?select=id,amount,due_date,status&order=due_date.desc&limit=50", None),
+        "chat-support": ("POST", f"{base_url}/functions/v1/chat-support", {
+            "messages": [{"role": "user", "content": "מתי מתעדכן מדד המחירים לצרכן?"}],
+            "hasAiConsent": True
+        }),
+    }
+
+
+def auth_headers(api_key, user_jwt=None):
+    return {
+        "apikey": api_key,
+        "Authorization": f"Bearer {user_jwt or api_key}",
+        "Content-Type": "application/json",
+    }
+
+
+DEFAULT_MIX = {"properties": 40, "contracts": 30, "payments": 25, "chat-support": 5}
+
+
+def positive_float(text):
+    value = float(text)
+    if not value > 0:
+        raise argparse.ArgumentTypeError(f"must be > 0, got {text}")
+    return value
+
+
+def parse_mix(text):
+    """'properties=40,payments=60' -> {'properties': 40, 'payments': 60}"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+class LoadGenerator:
+    def __init__(self, endpoints, headers, mix=None, timeout_s=30, seed=None):
+        self.endpoints = endpoints
+        self.headers = headers
+        self.mix = {k: v for k, v in (mix or DEFAULT_MIX).items() if k in endpoints and v > 0}
+        self.timeout_s = timeout_s
+        self.rng = random.Random(seed)
+        self.stats = {name: EndpointStats() for name in self.mix}
+        self.timeline = {}  # second since start -> EndpointStats (open model)
+        self.max_send_lag_ms = 0.0
+
+    def pick(self):
+        names = list(self.mix)
+        return self.rng.choices(names, weights=[self.mix[n] for n in names])[0]
+
+    async def issue(self, session, name, started=None, bucket=None):
+        """Sends one request; latency is measured from `started` (defaults to now)."""
+        import aiohttp
+
+        method, url, body = self.endpoints[name]
+        started = time.perf_counter() if started is None else started
+        try:
+            async with session.request(method, url, json=body, headers=self.headers) as resp:
+                await resp.read()
+                status = resp.status
+        except asyncio.TimeoutError:
+            status = "timeout"
+        except aiohttp.ClientError as e:
+            status = type(e).__name__
+        latency_us = (time.perf_counter() - started) * 1_000_000
+        self.stats[name].record(latency_us, status)
+        if bucket is not None:
+            self.timeline.setdefault(bucket, EndpointStats()).record(latency_us, status)
+
+    async def _closed_worker(self, session, deadline):
+        while time.perf_counter() < deadline:
+            await self.issue(session, self.pick())
+
+    async def run_closed(self, concurrency, duration_s):
+        """Closed model: `concurrency` virtual users each send the next request after the last returns."""
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout_s)
+        started = time.perf_counter()
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            deadline = started + duration_s
+            await asyncio.gather(*(self._closed_worker(session, deadline) for _ in range(concurrency)))
+        return self.report(time.perf_counter() - started)
+
+    async def run_open(self, rate, duration_s, ramp_to=None, max_in_flight=1000):
+        """Open model: issue requests at `rate`/s (linearly ramping to `ramp_to`) for duration_s.
+
+        Sends never wait for responses. If max_in_flight requests are already
+        outstanding the next send waits for a slot, but its latency still
+        counts from the intended send time.
+        """
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=max_in_flight)
+        timeout = aiohttp.ClientTimeout(total=self.timeout_s)
+        slots = asyncio.Semaphore(max_in_flight)
+        tasks = []
+
+        async def send(session, name, intended, bucket):
+            try:
+                await self.issue(session, name, started=intended, bucket=bucket)
+            finally:
+                slots.release()
+
+        started = time.perf_counter()
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            for offset in arrival_schedule(rate, duration_s, ramp_to):
+                intended = started + offset
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await slots.acquire()
+                self.max_send_lag_ms = max(self.max_send_lag_ms, (time.perf_counter() - intended) * 1000)
+                tasks.append(asyncio.create_task(send(session, self.pick(), intended, int(offset))))
+            await asyncio.gather(*tasks)
+
+        report = self.report(time.perf_counter() - started)
+        report["model"] = {"type": "open", "rate": rate, "ramp_to": ramp_to,
+                           "max_in_flight": max_in_flight,
+                           "max_send_lag_ms": round(self.max_send_lag_ms, 1)}
+        report["timeline"] = [
+            {"second": second, "sent": stats.ok + stats.errors, "errors": stats.errors,
+             **stats.latency.summary_ms()}
+            for second, stats in sorted(self.timeline.items())
+        ]
+        return report
+
+    def report(self, elapsed_s):
+        total = EndpointStats()
+        endpoints = {}
+        for name, stats in self.stats.items():
+            total.latency.merge(stats.latency)
+            total.ok += stats.ok
+            total.errors += stats.errors
+            count = stats.ok + stats.errors
+            endpoints[name] = {
+                **stats.latency.summary_ms(),
+                "throughput_rps": round(count / elapsed_s, 1) if elapsed_s else 0,
+                "error_rate": round(stats.errors / count, 4) if count else 0,
+                "status_codes": stats.status_codes,
+            }
+        count = total.ok + total.errors
+        return {
+            "elapsed_s": round(elapsed_s, 2),
+            "total": {
+                **total.latency.summary_ms(),
+                "throughput_rps": round(count / elapsed_s, 1) if elapsed_s else 0,
+                "error_rate": round(total.errors / count, 4) if count else 0,
+            },
+            "endpoints": endpoints,
+        }
+
+
+def arrival_schedule(rate, duration_s, ramp_to=None):
+    """Yields intended send offsets (seconds) for a constant or linearly ramping rate.
+
+    With a ramp, arrivals so far are N(t) = r0*t + (r1 - r0)*t^2 / (2T); the
+    i-th request goes out where N(t) = i.
+    """
+    r0 = float(rate)
+    r1 = float(ramp_to if ramp_to is not None else rate)
+    slope = (r1 - r0) / duration_s
+    # N(T); past it a downward ramp's discriminant goes negative before t reaches T
+    total = (r0 + r1) * duration_s / 2
+    i = 0
+    while i < total:
+        if abs(slope) < 1e-12:
+            t = i / r0
+        else:
+            # Solve slope/2 * t^2 + r0 * t - i = 0 for the positive root
+            t = (-r0 + math.sqrt(max(0.0, r0 * r0 + 2 * slope * i))) / slope
+        if t >= duration_s:
+            return
+        yield t
+        i += 1
+
+
+def print_report(report):
+    print("\n📊 LOAD TEST REPORT")
+    print("-" * 78)
+    print(f"{'endpoint':<16}{'count':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>10}")
+    rows = list(report["endpoints"].items()) + [("TOTAL", report["total"])]
+    for name, s in rows:
+        print(f"{name:<16}{s['count']:>8}{s['throughput_rps']:>9}{s['p50_ms']:>10}"
+              f"{s['p95_ms']:>10}{s['p99_ms']:>10}{s['error_rate'] * 100:>9.2f}%")
+    print("-" * 78)
+
+    if report.get("timeline"):
+        model = report["model"]
+        print(f"Open model: {model['rate']} -> {model['ramp_to'] or model['rate']} req/s, "
+              f"max send lag {model['max_send_lag_ms']} ms (latency measured from intended send time)")
+        print(f"{'second':>8}{'sent':>8}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+        for row in report["timeline"]:
+            print(f"{row['second']:>8}{row['sent']:>8}{row['p50_ms']:>10}{row['p99_ms']:>10}{row['errors']:>8}")
+
+
+# --- Local stand-in ---
+
+async def start_stand_in_server(port=0, base_delay_ms=5, jitter_ms=10, error_rate=0.0, seed=1, capacity=None):
+    """Minimal PostgREST/edge-function look-alike with configurable latency and errors.
+
+    capacity limits how many requests are serviced at once (like a pooler with
+    that many connections); the rest queue, which is what saturation looks like.
+    Returns (runner, base_url); call `await runner.cleanup()` when done.
+    """
+    from aiohttp import web
+
+    rng = random.Random(seed)
+    pool = asyncio.Semaphore(capacity) if capacity else None
+
+    async def handler(request):
+        if pool:
+            async with pool:
+                await asyncio.sleep((base_delay_ms + rng.random() * jitter_ms) / 1000)
+        else:
+            await asyncio.sleep((base_delay_ms + rng.random() * jitter_ms) / 1000)
+        if rng.random() < error_rate:
+            return web.json_response({"message": "stand-in failure"}, status=503)
+        if request.method == "POST":
+            return web.json_response({"response": "ok"})
+        return web.json_response([{"id": i} for i in range(10)])
+
+    app = web.Application()
+    app.router.add_route("*", "/rest/v1/{table}", handler)
+    app.router.add_route("*", "/functions/v1/{name}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner, f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="RentMate HTTP load generator")
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed")
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users (closed model)")
+    parser.add_argument("--rate", type=positive_float, default=50, help="Arrivals per second (open model)")
+    parser.add_argument("--ramp-to", type=positive_float, default=None,
+                        help="Ramp the arrival rate linearly to this value over the run (open model)")
+    parser.add_argument("--max-in-flight", type=int, default=1000,
+                        help="Cap on outstanding requests (open model)")
+    parser.add_argument("--duration", type=positive_float, default=30, help="Seconds to run")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="Weighted endpoints, e.g. properties=40,contracts=30,payments=25,chat-support=5")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--stand-in", action="store_true", help="Run against a local stand-in server")
+    parser.add_argument("--stand-in-capacity", type=int, default=None,
+                        help="Concurrent requests the stand-in services before queueing")
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON")
+    parser.add_argument("--record", metavar="SCENARIO",
+                        help="Store the run in the perf results file (see scripts/perf_results.py)")
+    return parser
+
+
+async def run(args):
+    runner = None
+    if args.stand_in:
+        runner, base_url = await start_stand_in_server(capacity=args.stand_in_capacity)
+        api_key, user_jwt = "stand-in", None
+    else:
+        env = load_env()
+        base_url = env.get("VITE_SUPABASE_URL", "").rstrip("/")
+        api_key = env.get("VITE_SUPABASE_ANON_KEY", "")
+        user_jwt = env.get("LOAD_TEST_USER_JWT") or os.environ.get("LOAD_TEST_USER_JWT")
+        if not base_url:
+            print("❌ VITE_SUPABASE_URL not set (use --stand-in for a local run).")
+            return None
+
+    try:
+        generator = LoadGenerator(build_endpoints(base_url),
+                                  auth_headers(api_key, user_jwt), args.mix, args.timeout)
+        if args.mode == "open":
+            ramp = f" ramping to {args.ramp_to}" if args.ramp_to is not None else ""
+            print(f"🚀 Load test on {base_url}: {args.rate} req/s{ramp} for {args.duration}s (open model)")
+            return await generator.run_open(args.rate, args.duration, args.ramp_to, args.max_in_flight)
+        print(f"🚀 Load test on {base_url}: {args.concurrency} users for {args.duration}s")
+        return await generator.run_closed(args.concurrency, args.duration)
+    finally:
+        if runner:
+            await runner.cleanup()
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    report = asyncio.run(run(args))
+    if report is None:
+        return 1
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.json}")
+    if args.record:
+        from perf_results import record
+
+        entry = record(args.record, report, tool="load_generator",
+                       meta={"mode": args.mode, "stand_in": args.stand_in})
+        print(f"Recorded as {args.record} @ {entry['commit']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
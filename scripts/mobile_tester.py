@@ -2,15 +2,67 @@
 import sys
 import json
 import os
+import time
+import asyncio
 import tempfile
 from datetime import datetime
 
 try:
     from playwright.sync_api import sync_playwright
+    from playwright.async_api import async_playwright
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
 
+# Device matrix: (label, Playwright device descriptor, extra context options)
+HEBREW = {"locale": "he-IL", "timezone_id": "Asia/Jerusalem"}
+DEVICE_MATRIX = [
+    ("iPhone 12", "iPhone 12", {}),
+    ("iPhone SE", "iPhone SE", {}),
+    ("Pixel 5", "Pixel 5", {}),
+    ("Galaxy S9+", "Galaxy S9+", {}),
+    ("iPhone 12 (he-IL)", "iPhone 12", HEBREW),
+    ("Pixel 5 (he-IL)", "Pixel 5", HEBREW),
+]
+
+# Layout shifts and long tasks from the first byte on
+METRICS_SCRIPT = """
+(() => {
+  const m = window.__mobileMetrics = { cls: 0, longTasks: 0, tbt: 0, lcp: null };
+  const observe = (type, cb) => {
+    try { new PerformanceObserver(l => l.getEntries().forEach(cb)).observe({ type, buffered: true }); } catch (e) {}
+  };
+  observe('layout-shift', e => { if (!e.hadRecentInput) m.cls += e.value; });
+  observe('longtask', e => { m.longTasks += 1; m.tbt += Math.max(0, e.duration - 50); });
+  observe('largest-contentful-paint', e => { m.lcp = e.startTime; });
+})();
+"""
+
+# One round trip instead of a bounding_box() call per button
+PAGE_AUDIT_SCRIPT = """
+() => {
+  const nav = performance.getEntriesByType('navigation')[0] || {};
+  const m = window.__mobileMetrics || {};
+  const small = [...document.querySelectorAll('button, a, [role=button]')]
+    .map(el => ({ el, r: el.getBoundingClientRect() }))
+    .filter(({ r }) => r.width > 0 && r.height > 0 && (r.width < 44 || r.height < 44))
+    .map(({ el, r }) => ({ text: (el.innerText || el.getAttribute('aria-label') || '').trim().slice(0, 40),
+                           size: `${Math.round(r.width)}x${Math.round(r.height)}` }));
+  return {
+    title: document.title,
+    dir: document.documentElement.dir || getComputedStyle(document.documentElement).direction,
+    lang: document.documentElement.lang,
+    button_count: document.querySelectorAll('button').length,
+    link_count: document.querySelectorAll('a').length,
+    horizontal_overflow: document.documentElement.scrollWidth > window.innerWidth,
+    dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+    load_ms: nav.loadEventEnd,
+    lcp_ms: m.lcp, cls: m.cls, long_tasks: m.longTasks, tbt_ms: m.tbt,
+    small_targets: small
+  };
+}
+"""
+
 def run_mobile_test(url: str, device_name: str = "iPhone 12") -> dict:
     if not PLAYWRIGHT_AVAILABLE:
         return {"error": "Playwright not installed"}
@@ -74,11 +126,97 @@ def run_mobile_test(url: str, device_name: str = "iPhone 12") -> dict:
     
     return result
 
+async def _test_device(browser, playwright, url, label, device_name, extra, screenshot_dir):
+    result = {"url": url, "device": label, "status": "pending"}
+    started = time.perf_counter()
+    context = await browser.new_context(**playwright.devices[device_name], **extra)
+    try:
+        await context.add_init_script(METRICS_SCRIPT)
+        page = await context.new_page()
+
+        nav_start = time.perf_counter()
+        response = await page.goto(url, wait_until="load", timeout=30000)
+        # Interaction-ready: something tappable is on screen and the main thread is idle
+        await page.locator("button, a, [role=button]").first.wait_for(state="visible", timeout=15000)
+        await page.evaluate("() => new Promise(r => window.requestIdleCallback ? requestIdleCallback(r, { timeout: 2000 }) : setTimeout(r))")
+        ready_ms = (time.perf_counter() - nav_start) * 1000
+
+        audit = await page.evaluate(PAGE_AUDIT_SCRIPT)
+        small_targets = audit.pop("small_targets")
+        result["metrics"] = {
+            **audit,
+            "interaction_ready_ms": round(ready_ms, 1),
+            "status_code": response.status if response else None,
+        }
+        result["accessibility"] = {
+            "small_touch_targets": small_targets,
+            "target_health": "Pass" if len(small_targets) == 0 else "Fail"
+        }
+        if extra.get("locale", "").startswith("he") and audit["dir"] != "rtl":
+            result["warnings"] = [f"Hebrew locale rendered with dir={audit['dir']!r}"]
+
+        slug = "".join(c if c.isalnum() else "_" for c in label).strip("_")
+        screenshot_path = os.path.join(screenshot_dir, f"mobile_{slug}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png")
+        await page.screenshot(path=screenshot_path, full_page=True)
+        result["screenshot"] = screenshot_path
+        result["status"] = "success"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+    finally:
+        await context.close()
+    result["elapsed_s"] = round(time.perf_counter() - started, 2)
+    return result
+
+
+async def _run_matrix(url, matrix):
+    screenshot_dir = os.path.join(tempfile.gettempdir(), "maestro_mobile_tests")
+    os.makedirs(screenshot_dir, exist_ok=True)
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            return await asyncio.gather(*(
+                _test_device(browser, p, url, label, device_name, extra, screenshot_dir)
+                for label, device_name, extra in matrix
+            ))
+        finally:
+            await browser.close()
+
+
+def run_mobile_matrix(url: str, matrix: list = None) -> dict:
+    """Tests every device profile concurrently in its own context of one shared browser."""
+    if not PLAYWRIGHT_AVAILABLE:
+        return {"error": "Playwright not installed"}
+
+    started = time.perf_counter()
+    devices = asyncio.run(_run_matrix(url, matrix or DEVICE_MATRIX))
+    wall = time.perf_counter() - started
+    return {
+        "url": url,
+        "timestamp": datetime.now().isoformat(),
+        "wall_time_s": round(wall, 2),
+        "sum_of_devices_s": round(sum(d["elapsed_s"] for d in devices), 2),
+        "slowest_device": max(devices, key=lambda d: d["elapsed_s"])["device"],
+        "status": "success" if all(d["status"] == "success" for d in devices) else "failed",
+        "devices": devices,
+    }
+
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python mobile_tester.py <url>")
+        print("Usage: python mobile_tester.py <url> [--matrix] [--devices 'iPhone 12,Pixel 5 (he-IL)']")
         sys.exit(1)
     
     url = sys.argv[1]
-    result = run_mobile_test(url)
+    if "--matrix" in sys.argv or "--devices" in sys.argv:
+        matrix = DEVICE_MATRIX
+        if "--devices" in sys.argv[:-1]:
+            wanted = [d.strip() for d in sys.argv[sys.argv.index("--devices") + 1].split(",")]
+            matrix = [row for row in DEVICE_MATRIX if row[0] in wanted]
+            if not matrix:
+                print(f"Unknown devices; choose from: {', '.join(row[0] for row in DEVICE_MATRIX)}")
+                sys.exit(1)
+        result = run_mobile_matrix(url, matrix)
+    else:
+        result = run_mobile_test(url)
     print(json.dumps(result, indent=2))
@@ -0,0 +1,205 @@
+import os
+import sys
+import json
+import time
+import glob
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+# Dominant-color palettes for brand assets.
+#
+# Pixels are quantized to a 2^bits per-channel grid and histogrammed with a
+# single np.bincount; each bin reports the mean of the pixels that fell into
+# it, so colors are exact for flat artwork and not snapped to the grid. The
+# optional k-means pass runs on the (few thousand) occupied bins weighted by
+# their counts rather than on pixels, so it costs about as much as the
+# histogram. Large images are sampled on a stride down to MAX_PIXELS.
+#
+#   python scripts/palette.py src/assets/logo.png             # one image
+#   python scripts/palette.py --k 6 --json palettes.json     # all brand assets
+#
+# The JSON has a "colors" object shaped like tailwind.config.js theme colors:
+#   colors: { ...require('./palettes.json').colors }
+
+BRAND_ASSETS = ["src/assets/*.png", "src/assets/brand/*.png", "public/*.png"]
+MAX_PIXELS = 1_000_000
+DEFAULT_BITS = 5  # 32 levels per channel, 32768 bins
+
+
+def load_pixels(path, max_pixels=MAX_PIXELS):
+    """RGBA uint8 pixels of an image as an (N, 4) array, strided down to about max_pixels."""
+    img = Image.open(path).convert("RGBA")
+    data = np.asarray(img)
+    step = max(1, int(np.ceil(np.sqrt(data.shape[0] * data.shape[1] / max_pixels)))) if max_pixels else 1
+    return data[::step, ::step].reshape(-1, 4)
+
+
+def histogram(pixels, bits=DEFAULT_BITS, min_alpha=128):
+    """Returns (counts, mean_rgb) for every occupied bin of the color grid."""
+    if min_alpha:
+        visible = pixels[:, 3] >= min_alpha
+        if not visible.all():
+            pixels = pixels[visible]
+    channels = [pixels[:, c] for c in range(3)]
+    shift = 8 - bits
+    index = (channels[0] >> shift).astype(np.uint32) << (2 * bits)
+    index |= (channels[1] >> shift).astype(np.uint32) << bits
+    index |= channels[2] >> shift
+
+    size = 1 << (3 * bits)
+    if size > len(index):
+        # Fine grids are mostly empty; compact the bins before histogramming
+        _, index = np.unique(index, return_inverse=True)
+        size = int(index.max()) + 1 if len(index) else 0
+    counts = np.bincount(index, minlength=size)
+    occupied = np.flatnonzero(counts)
+    sums = np.stack([np.bincount(index, weights=channel, minlength=size)[occupied] for channel in channels], axis=1)
+    return counts[occupied], sums / counts[occupied, None]
+
+
+def is_grayscale(colors, tolerance=20):
+    """True where R~G and G~B within tolerance, over an (N, 3) array."""
+    colors = np.asarray(colors, dtype=np.float64)
+    return (np.abs(colors[:, 0] - colors[:, 1]) < tolerance) & (np.abs(colors[:, 1] - colors[:, 2]) < tolerance)
+
+
+def nearest(colors, centers):
+    # |x - c|^2 without the |x|^2 term, which doesn't change the argmin
+    return (centers ** 2).sum(axis=1)[None, :] - 2 * colors @ centers.T
+
+
+def kmeans(colors, weights, k, iterations=20):
+    """Weighted k-means over histogram bins.
+
+    Seeds deterministically like k-means++: the heaviest bin, then repeatedly the
+    bin with the largest weight * squared distance to the nearest seed, so
+    neighbouring shades of one color don't take several seeds.
+    """
+    seeds = [int(np.argmax(weights))]
+    closest = ((colors - colors[seeds[0]]) ** 2).sum(axis=1)
+    while len(seeds) < k:
+        score = weights * closest
+        if not score.any():
+            break
+        seeds.append(int(np.argmax(score)))
+        closest = np.minimum(closest, ((colors - colors[seeds[-1]]) ** 2).sum(axis=1))
+    centers = colors[seeds].astype(np.float64)
+    for _ in range(iterations):
+        labels = nearest(colors, centers).argmin(axis=1)
+        totals = np.bincount(labels, weights=weights, minlength=len(centers))
+        updated = np.stack([np.bincount(labels, weights=weights * colors[:, c], minlength=len(centers))
+                            for c in range(3)], axis=1)
+        keep = totals > 0
+        updated[keep] /= totals[keep, None]
+        updated[~keep] = centers[~keep]
+        if np.allclose(updated, centers, atol=0.5):
+            centers = updated
+            break
+        centers = updated
+    totals = np.bincount(nearest(colors, centers).argmin(axis=1), weights=weights, minlength=len(centers))
+    return centers, totals
+
+
+def to_hex(rgb):
+    return "#{:02X}{:02X}{:02X}".format(*(int(round(v)) for v in rgb))
+
+
+def extract_palette(pixels, top=8, bits=DEFAULT_BITS, k=0, min_alpha=128, gray_tolerance=None):
+    """Dominant colors, most common first: [{"hex", "rgb", "count", "share"}].
+
+    k > 0 merges the histogram into k k-means clusters; gray_tolerance drops
+    near-gray colors (as analyze_colors did) before ranking.
+    """
+    counts, colors = histogram(pixels, bits, min_alpha)
+    if gray_tolerance is not None and len(colors):
+        keep = ~is_grayscale(colors, gray_tolerance)
+        counts, colors = counts[keep], colors[keep]
+    total = counts.sum()
+    if not total:
+        return []
+    weights = counts.astype(np.float64)
+    if k:
+        colors, weights = kmeans(colors, weights, min(k, len(colors)))
+
+    order = np.argsort(-weights)[:top]
+    return [{
+        "hex": to_hex(colors[i]),
+        "rgb": [int(round(v)) for v in colors[i]],
+        "count": int(weights[i]),
+        "share": round(float(weights[i] / total), 4),
+    } for i in order if weights[i] > 0]
+
+
+def analyze_file(job):
+    path, options = job
+    started = time.perf_counter()
+    try:
+        palette = extract_palette(load_pixels(path, options.pop("max_pixels", MAX_PIXELS)), **options)
+        return path, palette, None, time.perf_counter() - started
+    except Exception as e:
+        return path, [], str(e), time.perf_counter() - started
+
+
+def analyze_batch(paths, workers=None, **options):
+    """Palettes for many images across a process pool: {path: palette}, plus errors."""
+    palettes, errors = {}, {}
+    jobs = [(path, dict(options)) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path, palette, error, seconds in pool.map(analyze_file, jobs):
+            if error:
+                errors[path] = error
+                print(f"❌ {path}: {error}")
+            else:
+                palettes[path] = palette
+                swatches = " ".join(color["hex"] for color in palette)
+                print(f"✅ {path} ({seconds * 1000:.0f}ms) {swatches}")
+    return palettes, errors
+
+
+def tailwind_colors(palettes):
+    """{"logo-brand": {"DEFAULT": "#..", "1": "#..", ...}} keyed by file stem."""
+    colors = {}
+    for path, palette in palettes.items():
+        if palette:
+            shades = {str(i + 1): color["hex"] for i, color in enumerate(palette)}
+            colors[Path(path).stem] = {"DEFAULT": palette[0]["hex"], **shades}
+    return colors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract dominant color palettes from images")
+    parser.add_argument("images", nargs="*", help=f"Images or globs (default: {', '.join(BRAND_ASSETS)})")
+    parser.add_argument("--top", type=int, default=8, help="Colors per palette")
+    parser.add_argument("--k", type=int, default=0, help="Merge into k clusters with k-means (0 = histogram only)")
+    parser.add_argument("--bits", type=int, default=DEFAULT_BITS, help="Quantization bits per channel (1-8)")
+    parser.add_argument("--min-alpha", type=int, default=128, help="Ignore pixels more transparent than this")
+    parser.add_argument("--no-gray", type=int, nargs="?", const=20, default=None, metavar="TOLERANCE",
+                        help="Drop near-gray colors")
+    parser.add_argument("--max-pixels", type=int, default=MAX_PIXELS, help="Sample larger images down to this")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--json", metavar="PATH", help="Write palettes and Tailwind colors as JSON")
+    args = parser.parse_args()
+
+    if not 1 <= args.bits <= 8:
+        parser.error("--bits must be between 1 and 8")
+    paths = sorted({p for pattern in (args.images or BRAND_ASSETS) for p in glob.glob(pattern)
+                    if os.path.isfile(p)})
+    if not paths:
+        print("No images found.")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    palettes, errors = analyze_batch(paths, args.workers, top=args.top, bits=args.bits, k=args.k,
+                                     min_alpha=args.min_alpha, gray_tolerance=args.no_gray,
+                                     max_pixels=args.max_pixels)
+    print(f"{len(palettes)} palettes in {time.perf_counter() - started:.2f}s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"palettes": palettes, "colors": tailwind_colors(palettes)}, f, indent=2)
+        print(f"Palettes written to {args.json}")
+    sys.exit(1 if errors else 0)
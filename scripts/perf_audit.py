@@ -1,40 +1,258 @@
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
+import sys
 import time
 import json
+import asyncio
+import argparse
 
-def audit_performance(url):
-    results = {}
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_context().new_page()
-        
-        # Stress Navigate: Measure timing
-        start_time = time.time()
-        page.goto(url, wait_until="networkidle")
-        end_time = time.time()
-        
-        load_time = (end_time - start_time) * 1000
-        
-        # Performance Metrics via CDP
-        client = page.context.new_cdp_session(page)
-        client.send("Performance.enable")
-        metrics = client.send("Performance.getMetrics")
-        
-        results["load_time_ms"] = load_time
-        results["metrics"] = {m["name"]: m["value"] for m in metrics["metrics"]}
-        
-        # Health Check
-        results["status"] = "Excellent" if load_time < 2000 else "Average"
-        
-        browser.close()
+# Default crawl: the authenticated pages users spend their time on.
+# Contract pages need an id, add them with --contract-id or --routes.
+DEFAULT_ROUTES = ["/dashboard", "/properties", "/payments"]
+
+# Web Vitals "good" / "poor" thresholds, judged at p75 like CrUX does
+THRESHOLDS = {
+    "lcp_ms": (2500, 4000),
+    "cls": (0.1, 0.25),
+    "inp_ms": (200, 500),
+    "tbt_ms": (200, 600),
+}
+
+# Installed before any page script runs; collects vitals into window.__vitals
+VITALS_SCRIPT = """
+(() => {
+  const v = window.__vitals = {
+    lcp: null, fcp: null, cls: 0, inp: null, tbt: 0,
+    longTasks: 0, longTaskMs: 0, _session: 0, _sessionStart: 0, _sessionLast: 0
+  };
+  const observe = (type, cb, extra) => {
+    try { new PerformanceObserver(list => list.getEntries().forEach(cb))
+            .observe({ type, buffered: true, ...extra }); } catch (e) {}
+  };
+  observe('paint', e => { if (e.name === 'first-contentful-paint') v.fcp = e.startTime; });
+  observe('largest-contentful-paint', e => { v.lcp = e.renderTime || e.loadTime || e.startTime; });
+  // CLS: largest session window (gap < 1s, window < 5s), ignoring input-driven shifts
+  observe('layout-shift', e => {
+    if (e.hadRecentInput) return;
+    if (v._session && e.startTime - v._sessionLast < 1000 && e.startTime - v._sessionStart < 5000) {
+      v._session += e.value;
+    } else {
+      v._session = e.value;
+      v._sessionStart = e.startTime;
+    }
+    v._sessionLast = e.startTime;
+    v.cls = Math.max(v.cls, v._session);
+  });
+  observe('longtask', e => {
+    v.longTasks += 1;
+    v.longTaskMs += e.duration;
+    v.tbt += Math.max(0, e.duration - 50);
+  });
+  observe('event', e => {
+    if (e.interactionId) v.inp = Math.max(v.inp || 0, e.duration);
+  }, { durationThreshold: 16 });
+})();
+"""
+
+COLLECT_SCRIPT = """
+() => {
+  const nav = performance.getEntriesByType('navigation')[0] || {};
+  const v = window.__vitals || {};
+  return {
+    lcp_ms: v.lcp, fcp_ms: v.fcp, cls: v.cls, inp_ms: v.inp, tbt_ms: v.tbt,
+    long_tasks: v.longTasks, long_task_ms: v.longTaskMs,
+    ttfb_ms: nav.responseStart, dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+    load_event_ms: nav.loadEventEnd, transfer_kb: (nav.transferSize || 0) / 1024,
+    resources: performance.getEntriesByType('resource').length
+  };
+}
+"""
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list (None for an empty list)."""
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    rank = (len(values) - 1) * pct / 100
+    lo = int(rank)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (rank - lo)
+
+
+def rate(metric, value):
+    if value is None or metric not in THRESHOLDS:
+        return None
+    good, poor = THRESHOLDS[metric]
+    return "good" if value <= good else "poor" if value > poor else "needs improvement"
+
+
+async def measure_route(browser, base_url, route, storage_state=None, settle_ms=1000):
+    """One cold navigation in a fresh context; returns the metric sample for this run."""
+    context = await browser.new_context(storage_state=storage_state)
+    try:
+        await context.add_init_script(VITALS_SCRIPT)
+        page = await context.new_page()
+        client = await context.new_cdp_session(page)
+        await client.send("Performance.enable")
+
+        start_time = time.perf_counter()
+        await page.goto(base_url + route, wait_until="networkidle")
+        load_time = (time.perf_counter() - start_time) * 1000
+
+        # A keyboard interaction so INP has something to measure; LCP stops at first input
+        await page.wait_for_timeout(settle_ms)
+        await page.keyboard.press("Tab")
+        await page.wait_for_timeout(200)
+
+        sample = await page.evaluate(COLLECT_SCRIPT)
+        metrics = {m["name"]: m["value"] for m in (await client.send("Performance.getMetrics"))["metrics"]}
+        sample.update({
+            "load_time_ms": load_time,
+            "js_heap_mb": metrics.get("JSHeapUsedSize", 0) / 2 ** 20,
+            "dom_nodes": metrics.get("Nodes"),
+            "script_duration_ms": metrics.get("ScriptDuration", 0) * 1000,
+            "layout_duration_ms": metrics.get("LayoutDuration", 0) * 1000,
+            "final_url": page.url,
+        })
+        return sample
+    finally:
+        await context.close()
+
+
+async def audit_routes(base_url, routes, runs=5, parallel=4, storage_state=None, settle_ms=1000):
+    """Visits every route `runs` times across up to `parallel` contexts of one browser.
+
+    Returns {route: {"runs": [sample, ...], "errors": [...]}}.
+    """
+    results = {route: {"runs": [], "errors": []} for route in routes}
+    semaphore = asyncio.Semaphore(parallel)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+
+        async def one(route):
+            async with semaphore:
+                try:
+                    results[route]["runs"].append(
+                        await measure_route(browser, base_url, route, storage_state, settle_ms))
+                except Exception as e:
+                    results[route]["errors"].append(str(e))
+
+        # Interleave routes so a slow backend moment doesn't land on one page only
+        await asyncio.gather(*(one(route) for _ in range(runs) for route in routes))
+        await browser.close()
     return results
 
+
+def summarize(results):
+    """Per route and metric: median, p75, p95, min, max, plus a p75 Web Vitals rating."""
+    summary = {}
+    for route, data in results.items():
+        runs = data["runs"]
+        names = [k for k in (runs[0] if runs else {}) if k != "final_url"]
+        stats = {}
+        for name in names:
+            values = [run[name] for run in runs if run.get(name) is not None]
+            if not values:
+                continue
+            stats[name] = {
+                "median": round(percentile(values, 50), 2),
+                "p75": round(percentile(values, 75), 2),
+                "p95": round(percentile(values, 95), 2),
+                "min": round(min(values), 2),
+                "max": round(max(values), 2),
+            }
+            rating = rate(name, stats[name]["p75"])
+            if rating:
+                stats[name]["rating"] = rating
+        redirected = sorted({run["final_url"] for run in runs if not run["final_url"].endswith(route)})
+        summary[route] = {"runs": len(runs), "errors": data["errors"], "metrics": stats, "redirected_to": redirected}
+    return summary
+
+
+def print_summary(summary):
+    columns = ["load_time_ms", "lcp_ms", "cls", "inp_ms", "tbt_ms", "long_tasks", "js_heap_mb"]
+    print("\n📊 PERFORMANCE AUDIT (median / p95)")
+    print("=" * 120)
+    print(f"{'route':<22}{'runs':>5}" + "".join(f"{c:>13}" for c in columns))
+    print("-" * 120)
+    for route, data in sorted(summary.items(),
+                              key=lambda item: -item[1]["metrics"].get("lcp_ms", {}).get("median", 0)):
+        cells = []
+        for c in columns:
+            stat = data["metrics"].get(c)
+            cells.append(f"{stat['median']:g}/{stat['p95']:g}" if stat else "-")
+        print(f"{route[:21]:<22}{data['runs']:>5}" + "".join(f"{cell:>13}" for cell in cells))
+        poor = [m for m, s in data["metrics"].items() if s.get("rating") == "poor"]
+        if poor:
+            print(f"{'':<27}❌ poor at p75: {', '.join(poor)}")
+        if data["redirected_to"]:
+            print(f"{'':<27}⚠️ redirected to {', '.join(data['redirected_to'])} (pass --storage-state?)")
+        for error in data["errors"][:3]:
+            print(f"{'':<27}❌ {error.splitlines()[0]}")
+    print("=" * 120)
+
+
+def audit_performance(url):
+    """Single cold load of one URL (the original audit), kept for quick checks."""
+    run = asyncio.run(audit_routes(url, [""], runs=1, parallel=1))[""]
+    if not run["runs"]:
+        raise RuntimeError(run["errors"][0])
+    sample = run["runs"][0]
+    sample["status"] = "Excellent" if sample["load_time_ms"] < 2000 else "Average"
+    return sample
+
+
 if __name__ == "__main__":
-    url = "http://localhost:5173"
-    print(f"🕵️ Auditing {url}...")
+    parser = argparse.ArgumentParser(description="Frontend performance audit")
+    parser.add_argument("url", nargs="?", default="http://localhost:5173")
+    parser.add_argument("--routes", default=",".join(DEFAULT_ROUTES), help="Comma-separated paths")
+    parser.add_argument("--contract-id", action="append", default=[],
+                        help="Also audit /contracts/<id> (repeatable)")
+    parser.add_argument("--runs", type=int, default=5, help="Cold loads per route")
+    parser.add_argument("--parallel", type=int, default=4, help="Concurrent browser contexts")
+    parser.add_argument("--settle", type=int, default=1000, help="ms to wait after networkidle")
+    parser.add_argument("--storage-state", default=None,
+                        help="Playwright storage state JSON of a logged-in session")
+    parser.add_argument("--json", metavar="PATH", help="Write raw runs and the summary as JSON")
+    parser.add_argument("--record", metavar="SCENARIO",
+                        help="Store each route in the perf results file as SCENARIO:<route> "
+                             "(see scripts/perf_results.py)")
+    args = parser.parse_args()
+
+    base_url = args.url.rstrip("/")
+    routes = [r.strip() for r in args.routes.split(",") if r.strip()]
+    routes += [f"/contracts/{cid}" for cid in args.contract_id]
+
+    print(f"🕵️ Auditing {len(routes)} routes on {base_url} ({args.runs} runs each, {args.parallel} in parallel)...")
     try:
-        report = audit_performance(url)
-        print(json.dumps(report, indent=2))
-        print("\n✅ Stress Test: Frontend handles rapid navigation and heavy assets successfully.")
+        results = asyncio.run(audit_routes(base_url, routes, args.runs, args.parallel,
+                                           args.storage_state, args.settle))
     except Exception as e:
         print(f"❌ Performance Audit Failed: {e}")
+        sys.exit(1)
+
+    summary = summarize(results)
+    print_summary(summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "runs": results}, f, indent=2)
+        print(f"Report written to {args.json}")
+
+    if args.record:
+        from perf_results import record
+
+        recorded = 0
+        for route, data in results.items():
+            if not data["runs"]:
+                continue
+            metrics = {name: stat["median"] for name, stat in summary[route]["metrics"].items()}
+            samples = {name: [run[name] for run in data["runs"] if run.get(name) is not None]
+                       for name in metrics}
+            record(f"{args.record}:{route}", metrics, samples, tool="perf_audit",
+                   meta={"url": base_url + route, "runs": args.runs})
+            recorded += 1
+        print(f"Recorded {recorded} of {len(routes)} routes as {args.record}:<route>")
+
+    failed = any(not data["runs"] for data in results.values())
+    sys.exit(1 if failed else 0)
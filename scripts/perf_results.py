@@ -0,0 +1,352 @@
+import os
+import sys
+import json
+import math
+import fnmatch
+import argparse
+import datetime
+import subprocess
+from pathlib import Path
+
+# Performance results store and regression gate.
+#
+# Every audit / load / stress run can append one record to a JSON-lines file:
+#   {"commit", "dirty", "branch", "timestamp", "scenario", "tool",
+#    "metrics": {name: number}, "samples": {name: [numbers]}, "meta": {...}}
+#
+# `compare` takes one value per recorded run (the run's scalar metric) for a
+# baseline commit and a candidate commit per scenario and metric, runs a
+# one-sided Mann-Whitney U test in the "worse" direction and exits 1 when a
+# metric regressed significantly. Runs are the unit of comparison, so
+# run-to-run variance is what the test measures: record several runs per
+# commit (with 4+ runs on each side a shift can reach p < 0.05). "samples"
+# are stored for inspection only.
+#
+#   python scripts/perf_results.py list
+#   python scripts/perf_results.py compare --baseline main
+#   python lighthouse_audit.py http://localhost:5173 | python scripts/perf_results.py ingest --scenario lighthouse:/ --tool lighthouse
+
+RESULTS_FILE = Path(os.environ.get("PERF_RESULTS_FILE", ".cache/perf_results.jsonl"))
+
+# Direction of every metric the recorders emit, as (glob on the flattened name,
+# "higher" | "lower" | None); the first match wins. None, and names matching
+# nothing, are not compared: counts, tallies and run configuration.
+METRIC_DIRECTIONS = [
+    ("*status_codes.*", None),
+    ("model.*", None),
+    ("elapsed_s", None),
+    ("*count", None),
+    ("*score*", "higher"),
+    ("*throughput_rps", "higher"),
+    ("*per_s", "higher"),
+    ("*speedup", "higher"),
+    ("*_ms", "lower"),
+    ("*.seconds", "lower"),
+    ("*error_rate", "lower"),
+    ("*_kb", "lower"),
+    ("*_mb", "lower"),
+    ("cls", "lower"),
+    ("long_tasks", "lower"),
+    ("dom_nodes", "lower"),
+    ("resources", "lower"),
+    ("initial.*", "lower"),
+    ("families.*", "lower"),
+]
+
+ALPHA = 0.05
+MIN_EFFECT = 0.05  # ignore significant but tiny shifts (< 5% of the baseline median)
+EXACT_LIMIT = 400  # n1 * n2 up to which the exact U distribution is used
+MIN_RUNS = 3
+
+
+def git(*args):
+    try:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def current_commit():
+    commit = git("rev-parse", "--short=12", "HEAD")
+    return {
+        "commit": commit or "unknown",
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")) if commit else False,
+        "branch": git("rev-parse", "--abbrev-ref", "HEAD"),
+    }
+
+
+def resolve_commit(ref):
+    """Turns a branch / tag / sha prefix into the short sha records are keyed by."""
+    return git("rev-parse", "--short=12", ref) or ref
+
+
+def flatten(data, prefix=""):
+    """{"a": {"b": 1}, "c": "x"} -> {"a.b": 1}; keeps numeric leaves only."""
+    out = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            out.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+            out[name] = value
+    return out
+
+
+def record(scenario, metrics, samples=None, tool=None, meta=None, path=None):
+    """Appends one run to the results file and returns the stored record."""
+    path = Path(path or RESULTS_FILE)
+    entry = {
+        **current_commit(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "scenario": scenario,
+        "tool": tool,
+        "metrics": flatten(metrics),
+        "samples": {k: [float(v) for v in vs] for k, vs in (samples or {}).items() if vs},
+        "meta": meta or {},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, sort_keys=True) + "\n")
+    return entry
+
+
+def load(path=None, scenario=None, commit=None):
+    path = Path(path or RESULTS_FILE)
+    if not path.exists():
+        return []
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if scenario and entry.get("scenario") != scenario:
+                continue
+            if commit and not entry.get("commit", "").startswith(commit):
+                continue
+            entries.append(entry)
+    return entries
+
+
+def direction(metric):
+    """"higher" or "lower" is better, or None when the metric isn't compared."""
+    for pattern, better in METRIC_DIRECTIONS:
+        if fnmatch.fnmatchcase(metric, pattern):
+            return better
+    return None
+
+
+def run_values(entries, metric):
+    """One value of a metric per recorded run."""
+    return [entry["metrics"][metric] for entry in entries if metric in entry.get("metrics", {})]
+
+
+# --- Mann-Whitney U ---
+
+def _ranks(values):
+    """Average ranks (1-based) with ties sharing the mean rank."""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+
+def _exact_cdf(u, n1, n2):
+    """P(U <= u) under H0 for untied samples (counts of arrangements, dynamic programming)."""
+    # counts[i][j] holds the distribution of U for sizes (i, j) as a list indexed by U
+    counts = [[None] * (n2 + 1) for _ in range(n1 + 1)]
+    for i in range(n1 + 1):
+        for j in range(n2 + 1):
+            if i == 0 or j == 0:
+                counts[i][j] = [1]
+                continue
+            # Largest value belongs to sample 1 (adds j to U) or to sample 2
+            a, b = counts[i - 1][j], counts[i][j - 1]
+            dist = [0] * (i * j + 1)
+            for k, c in enumerate(a):
+                dist[k + j] += c
+            for k, c in enumerate(b):
+                dist[k] += c
+            counts[i][j] = dist
+    dist = counts[n1][n2]
+    return sum(dist[:int(math.floor(u)) + 1]) / sum(dist)
+
+
+def mann_whitney(candidate, baseline):
+    """One-sided test that `candidate` tends to be larger than `baseline`.
+
+    Returns (U, p). Exact for small untied samples, otherwise the normal
+    approximation with tie and continuity correction.
+    """
+    n1, n2 = len(candidate), len(baseline)
+    if not n1 or not n2:
+        return None, 1.0
+    ranks = _ranks(list(candidate) + list(baseline))
+    u = sum(ranks[:n1]) - n1 * (n1 + 1) / 2
+
+    tied = len(set(candidate) | set(baseline)) < n1 + n2
+    if not tied and n1 * n2 <= EXACT_LIMIT:
+        # P(U >= u) = 1 - P(U <= u - 1)
+        return u, 1 - _exact_cdf(u - 1, n1, n2) if u > 0 else 1.0
+
+    n = n1 + n2
+    tie_sizes = {}
+    for value in list(candidate) + list(baseline):
+        tie_sizes[value] = tie_sizes.get(value, 0) + 1
+    tie_term = sum(t ** 3 - t for t in tie_sizes.values()) / (n * (n - 1))
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term)
+    if variance <= 0:
+        return u, 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def median(values):
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def compare(baseline, candidate=None, path=None, scenario=None, alpha=ALPHA, min_effect=MIN_EFFECT,
+            metrics=None):
+    """Compares every (scenario, metric) recorded for both commits.
+
+    metrics: optional glob patterns ("total.p*_ms", "latency_ms") limiting the metrics compared.
+    Returns a list of rows: scenario, metric, baseline/candidate medians over
+    runs, change, p and verdict ("regression", "improvement", "ok", "too few runs").
+    """
+    baseline = resolve_commit(baseline)
+    candidate = resolve_commit(candidate or "HEAD")
+    entries = load(path, scenario)
+
+    rows = []
+    scenarios = sorted({e["scenario"] for e in entries})
+    for name in scenarios:
+        base_runs = [e for e in entries if e["scenario"] == name and e["commit"].startswith(baseline)]
+        cand_runs = [e for e in entries if e["scenario"] == name and e["commit"].startswith(candidate)]
+        if not base_runs or not cand_runs:
+            continue
+        names = set()
+        for e in base_runs + cand_runs:
+            names |= {n for n in e.get("metrics", {}) if direction(n)}
+        if metrics:
+            names = {n for n in names if any(fnmatch.fnmatch(n, pattern) for pattern in metrics)}
+
+        for metric in sorted(names):
+            base = run_values(base_runs, metric)
+            cand = run_values(cand_runs, metric)
+            row = {"scenario": name, "metric": metric, "baseline_n": len(base), "candidate_n": len(cand)}
+            if not base or not cand:
+                continue
+            base_med, cand_med = median(base), median(cand)
+            change = (cand_med - base_med) / abs(base_med) if base_med else 0.0
+            higher_better = direction(metric) == "higher"
+            # Test in the "worse" direction: larger latencies, smaller scores
+            if higher_better:
+                _, p_worse = mann_whitney([-v for v in cand], [-v for v in base])
+                _, p_better = mann_whitney(cand, base)
+                worse_effect = -change
+            else:
+                _, p_worse = mann_whitney(cand, base)
+                _, p_better = mann_whitney([-v for v in cand], [-v for v in base])
+                worse_effect = change
+
+            if len(base) < MIN_RUNS or len(cand) < MIN_RUNS:
+                verdict = "too few runs"
+            elif p_worse < alpha and worse_effect > min_effect:
+                verdict = "regression"
+            elif p_better < alpha and -worse_effect > min_effect:
+                verdict = "improvement"
+            else:
+                verdict = "ok"
+            row.update({
+                "baseline_median": round(base_med, 3),
+                "candidate_median": round(cand_med, 3),
+                "change_pct": round(change * 100, 2),
+                "p_value": round(min(p_worse, p_better), 4),
+                "verdict": verdict,
+            })
+            rows.append(row)
+    return rows
+
+
+def print_comparison(rows, baseline, candidate):
+    print(f"\n📊 PERFORMANCE COMPARISON {baseline} -> {candidate}")
+    print("=" * 110)
+    print(f"{'scenario':<28}{'metric':<38}{'baseline':>11}{'candidate':>11}{'change':>9}{'p':>8}  verdict")
+    print("-" * 110)
+    icons = {"regression": "❌", "improvement": "✅", "ok": "  ", "too few runs": "⚠️"}
+    for row in rows:
+        print(f"{row['scenario'][:27]:<28}{row['metric'][:37]:<38}{row['baseline_median']:>11}"
+              f"{row['candidate_median']:>11}{row['change_pct']:>8}%{row['p_value']:>8}  "
+              f"{icons[row['verdict']]} {row['verdict']}")
+    regressions = sum(row["verdict"] == "regression" for row in rows)
+    print("=" * 110)
+    print(f"{regressions} significant regression(s) across {len(rows)} metric(s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Performance results store and regression gate")
+    parser.add_argument("--file", default=None, help=f"Results file (default: {RESULTS_FILE})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest = sub.add_parser("ingest", help="Record a JSON report (file or stdin)")
+    ingest.add_argument("report", nargs="?", help="JSON file; reads stdin when omitted")
+    ingest.add_argument("--scenario", required=True)
+    ingest.add_argument("--tool", default=None)
+
+    listing = sub.add_parser("list", help="Show stored runs")
+    listing.add_argument("--scenario", default=None)
+
+    cmp = sub.add_parser("compare", help="Compare a candidate commit against a baseline")
+    cmp.add_argument("--baseline", required=True, help="Commit, branch or tag")
+    cmp.add_argument("--candidate", default="HEAD")
+    cmp.add_argument("--scenario", default=None)
+    cmp.add_argument("--alpha", type=float, default=ALPHA)
+    cmp.add_argument("--min-effect", type=float, default=MIN_EFFECT,
+                     help="Minimum relative change of the median to count (0.05 = 5%%)")
+    cmp.add_argument("--metric", action="append", default=None,
+                     help="Glob of metrics to compare, repeatable (default: all)")
+    cmp.add_argument("--json", action="store_true", help="Print the comparison as JSON")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "ingest":
+        text = open(args.report, encoding="utf-8").read() if args.report else sys.stdin.read()
+        report = json.loads(text)
+        if "error" in report:
+            print(f"❌ Not recording a failed run: {report['error']}")
+            return 1
+        samples = report.pop("samples", None) if isinstance(report.get("samples"), dict) else None
+        entry = record(args.scenario, report, samples, tool=args.tool, path=args.file)
+        print(f"✅ Recorded {len(entry['metrics'])} metrics for {args.scenario} @ {entry['commit']}")
+        return 0
+
+    if args.command == "list":
+        for entry in load(args.file, args.scenario):
+            dirty = "+" if entry.get("dirty") else " "
+            print(f"{entry['timestamp']}  {entry['commit']}{dirty} {entry['scenario']:<32} "
+                  f"{len(entry['metrics'])} metrics, {sum(map(len, entry['samples'].values()))} samples")
+        return 0
+
+    rows = compare(args.baseline, args.candidate, args.file, args.scenario, args.alpha, args.min_effect,
+                   args.metric)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_comparison(rows, args.baseline, args.candidate)
+    if not rows:
+        print("⚠️ No scenario has results for both commits.")
+    return 1 if any(row["verdict"] == "regression" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
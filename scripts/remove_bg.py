@@ -1,32 +1,111 @@
 from PIL import Image
+import numpy as np
 import os
+import sys
+import time
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+TRANSPARENT_WHITE = np.array([255, 255, 255, 0], dtype=np.uint8).view(np.uint32)[0]
+
+
+def remove_background_array(data, threshold=245, softness=20):
+    """Makes near-white pixels of an RGBA uint8 array transparent.
+
+    Pixels whose darkest channel is above `threshold` become fully transparent;
+    the `softness` levels below it fade out linearly, so anti-aliased edges keep
+    a smooth alpha instead of a jagged white fringe. softness=0 is the old hard cut.
+    """
+    data = np.ascontiguousarray(data)
+    darkest = np.minimum(np.minimum(data[:, :, 0], data[:, :, 1]), data[:, :, 2])
+    out = data.copy()
+
+    background = darkest > threshold
+    if softness > 0:
+        # Only the thin ramp band needs float math
+        partial = ~background & (darkest > threshold - softness)
+        if partial.any():
+            # Strictly inside (0, 1): darkest == threshold keeps 1/(softness+1), never 0
+            keep = ((threshold - darkest[partial].astype(np.float32) + 1) / (softness + 1))[:, None]
+            pixels = data[partial].astype(np.float32)
+            # Edge pixels were blended over white; un-blend them so no white halo remains
+            pixels[:, :3] = np.clip((pixels[:, :3] - 255.0 * (1 - keep)) / keep, 0, 255)
+            pixels[:, 3:] *= keep
+            out[partial] = np.round(pixels).astype(np.uint8)
+
+    # One 32-bit write per pixel instead of a 4-channel fancy-index assignment
+    np.copyto(out.view(np.uint32)[:, :, 0], TRANSPARENT_WHITE, where=background)
+    return out
+
+
+def remove_background(input_path, output_path, threshold=245, softness=20):
+    img = Image.open(input_path).convert("RGBA")
+    out = remove_background_array(np.asarray(img), threshold, softness)
+    Image.fromarray(out, "RGBA").save(output_path, "PNG")
+    return output_path
+
+
+def _process(job):
+    input_path, output_path, threshold, softness = job
+    started = time.perf_counter()
+    try:
+        remove_background(input_path, output_path, threshold, softness)
+        return input_path, None, time.perf_counter() - started
+    except Exception as e:
+        return input_path, str(e), time.perf_counter() - started
+
+
+def remove_background_batch(input_dir, output_dir, threshold=245, softness=20, workers=None, recursive=False):
+    """Processes every image under input_dir across a process pool; outputs are PNGs."""
+    input_dir, output_dir = Path(input_dir), Path(output_dir)
+    pattern = "**/*" if recursive else "*"
+    files = sorted(p for p in input_dir.glob(pattern) if p.suffix.lower() in IMAGE_EXTENSIONS)
+
+    jobs = []
+    for path in files:
+        target = (output_dir / path.relative_to(input_dir)).with_suffix(".png")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        jobs.append((str(path), str(target), threshold, softness))
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for input_path, error, seconds in pool.map(_process, jobs):
+            results.append((input_path, error, seconds))
+            print(f"{'❌' if error else '✅'} {input_path} ({seconds * 1000:.0f}ms){': ' + error if error else ''}")
+    return results
 
-def remove_background(input_path, output_path):
-    img = Image.open(input_path)
-    img = img.convert("RGBA")
-    
-    datas = img.getdata()
-    
-    new_data = []
-    # Threshold for considering a pixel as "background white"
-    threshold = 245 
-    
-    for item in datas:
-        # If the pixel is very white, make it transparent
-        if item[0] > threshold and item[1] > threshold and item[2] > threshold:
-            new_data.append((255, 255, 255, 0))
-        else:
-            new_data.append(item)
-            
-    img.putdata(new_data)
-    img.save(output_path, "PNG")
 
 if __name__ == "__main__":
-    input_file = r"C:\Users\ראובן שאנס\.gemini\antigravity\brain\3f5985be-7d1a-4d99-a0fc-b6344ea0fe2f\uploaded_image_1768915676876.png"
-    output_file = r"c:\AnitiGravity Projects\RentMate\src\assets\rentmate-icon-only.png"
-    
+    parser = argparse.ArgumentParser(description="Make white backgrounds transparent")
+    parser.add_argument("input", nargs="?", help="Image file or directory")
+    parser.add_argument("output", nargs="?", help="Output PNG, or output directory for a directory input")
+    parser.add_argument("--threshold", type=int, default=245, help="Darkest channel above this is background")
+    parser.add_argument("--softness", type=int, default=20, help="Levels below the threshold to fade over (0 = hard)")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for directory input")
+    parser.add_argument("--recursive", action="store_true", help="Include subdirectories")
+    args = parser.parse_args()
+
+    if not args.input:
+        input_file = r"C:\Users\ראובן שאנס\.gemini\antigravity\brain\3f5985be-7d1a-4d99-a0fc-b6344ea0fe2f\uploaded_image_1768915676876.png"
+        output_file = r"c:\AnitiGravity Projects\RentMate\src\assets\rentmate-icon-only.png"
+    else:
+        input_file = args.input
+        output_file = args.output
+
+    if os.path.isdir(input_file):
+        output_dir = output_file or os.path.join(input_file, "transparent")
+        started = time.perf_counter()
+        results = remove_background_batch(input_file, output_dir, args.threshold, args.softness,
+                                          args.workers, args.recursive)
+        failed = sum(1 for _, error, _ in results if error)
+        print(f"Processed {len(results)} images in {time.perf_counter() - started:.2f}s -> {output_dir}")
+        sys.exit(1 if failed else 0)
+
     if os.path.exists(input_file):
-        remove_background(input_file, output_file)
+        output_file = output_file or os.path.splitext(input_file)[0] + "_transparent.png"
+        remove_background(input_file, output_file, args.threshold, args.softness)
         print(f"Success: {output_file} created.")
     else:
         print(f"Error: {input_file} not found.")
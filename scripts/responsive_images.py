@@ -0,0 +1,220 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from build_assets import SPEC_FILE, file_digest, load_json, save_json
+
+# Responsive AVIF/WebP variants for the large PNG/JPG images we serve as-is.
+#
+# The "responsive" section of scripts/assets.spec.json lists source globs,
+# target widths and per-format encoder settings. Every source gets one file
+# per (width, format) under output_dir, mirroring its path (without the
+# leading public/), plus an entry in the srcset manifest:
+#
+#   "public/plan-bg.jpg": {
+#     "src": "/plan-bg.jpg", "width": 1920, "height": 1080,
+#     "srcset": {"avif": "/responsive/plan-bg-480.avif 480w, ...", "webp": "..."},
+#     "bytes": {"original": 81234, "avif": 20480, "webp": 30720}
+#   }
+#
+# "bytes" compares the original with each format at the largest width.
+# Sources are re-encoded only when their bytes or the settings change (state in
+# .cache/assets/responsive.json); encoding runs in a process pool.
+#
+#   python scripts/responsive_images.py            # encode new/changed sources
+#   python scripts/responsive_images.py --force    # re-encode everything
+
+STATE_FILE = Path(".cache/assets/responsive.json")
+ENCODER_VERSION = 1  # bump when encoding changes
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+MAX_DIMENSION = {"avif": 65536, "webp": 16383}  # full-page screenshots can exceed WebP's limit
+
+
+def load_config(spec_path=SPEC_FILE):
+    with open(spec_path, encoding="utf-8") as f:
+        config = json.load(f)["responsive"]
+    unknown = set(config["formats"]) - set(MIME_TYPES)
+    if unknown:
+        raise ValueError(f"unsupported responsive formats: {', '.join(sorted(unknown))}")
+    # Everything under public/ ships in dist/, so only sources we serve may be encoded there
+    if Path(config["output_dir"]).as_posix().startswith("public/"):
+        outside = [p for p in config["include"] if not p.startswith("public/")]
+        if outside:
+            raise ValueError(f"responsive sources outside public/ would be deployed: {', '.join(outside)}")
+    return config
+
+
+def find_sources(config):
+    sources = set()
+    for pattern in config["include"]:
+        sources.update(p.as_posix() for p in Path(".").glob(pattern) if p.is_file())
+    excluded = set()
+    for pattern in config.get("exclude", []):
+        excluded.update(p.as_posix() for p in Path(".").glob(pattern))
+    output_dir = Path(config["output_dir"]).as_posix() + "/"
+    return sorted(s for s in sources - excluded if not s.startswith(output_dir))
+
+
+def variant_widths(width, widths):
+    """Configured widths below the original, plus the original capped at the largest one."""
+    largest = min(width, max(widths))
+    return sorted({w for w in widths if w < largest} | {largest})
+
+
+def source_key(source_digest, config):
+    payload = json.dumps({"v": ENCODER_VERSION, "source": source_digest, "widths": config["widths"],
+                          "formats": config["formats"]}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def public_url(source):
+    return "/" + source[len("public/"):] if source.startswith("public/") else None
+
+
+# --- Encoding (runs in worker processes) ---
+
+def encode(job):
+    """Writes every variant of one source; returns (source, manifest entry, outputs, error, seconds)."""
+    source, config = job
+    started = time.perf_counter()
+    try:
+        entry, outputs = encode_variants(source, config)
+        return source, entry, outputs, None, time.perf_counter() - started
+    except Exception as e:
+        return source, None, [], str(e), time.perf_counter() - started
+
+
+def encode_variants(source, config):
+    from PIL import Image
+
+    img = Image.open(source)
+    img.load()
+    has_alpha = img.mode in ("RGBA", "LA") or "transparency" in img.info
+    img = img.convert("RGBA" if has_alpha else "RGB")
+
+    relative = Path(source[len("public/"):] if source.startswith("public/") else source)
+    url_prefix = config["url_prefix"].rstrip("/")
+    widths = variant_widths(img.width, config["widths"])
+    srcset = {fmt: [] for fmt in config["formats"]}
+    sizes = {}
+    outputs = []
+
+    for width in widths:
+        height = max(1, round(img.height * width / img.width))
+        resized = img if width == img.width else img.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt, options in config["formats"].items():
+            if max(width, height) > MAX_DIMENSION[fmt]:
+                continue
+            name = f"{relative.stem}-{width}.{fmt}"
+            output = Path(config["output_dir"]) / relative.parent / name
+            output.parent.mkdir(parents=True, exist_ok=True)
+            tmp = output.with_name(output.name + ".tmp")
+            resized.save(tmp, fmt.upper(), **options)
+            os.replace(tmp, output)
+            outputs.append(output.as_posix())
+            url = "/".join(part for part in (url_prefix, relative.parent.as_posix(), name) if part not in ("", "."))
+            srcset[fmt].append(f"{url} {width}w")
+            if width == widths[-1]:
+                sizes[fmt] = output.stat().st_size
+
+    entry = {
+        "src": public_url(source),
+        "width": img.width,
+        "height": img.height,
+        "srcset": {fmt: ", ".join(items) for fmt, items in srcset.items() if items},
+        "types": {fmt: MIME_TYPES[fmt] for fmt in config["formats"] if srcset[fmt]},
+        "bytes": {"original": os.path.getsize(source), **sizes},
+    }
+    return entry, outputs
+
+
+# --- Stage ---
+
+def is_fresh(built, key, digests):
+    if not built or built["key"] != key:
+        return False
+    return all(os.path.exists(path) and file_digest(path, digests) == sha
+               for path, sha in built["outputs"].items())
+
+
+def build(spec_path=SPEC_FILE, force=False, workers=None):
+    started = time.perf_counter()
+    config = load_config(spec_path)
+    state = load_json(STATE_FILE, {"digests": {}, "sources": {}})
+    digests = state["digests"]
+    sources = find_sources(config)
+
+    keys = {source: source_key(file_digest(source, digests), config) for source in sources}
+    stale = [s for s in sources if force or not is_fresh(state["sources"].get(s), keys[s], digests)]
+
+    failed = []
+    if stale:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for source, entry, outputs, error, seconds in pool.map(encode, [(s, config) for s in stale]):
+                if error:
+                    failed.append(source)
+                    state["sources"].pop(source, None)
+                    print(f"❌ {source}: {error}")
+                    continue
+                state["sources"][source] = {"key": keys[source], "entry": entry,
+                                            "outputs": {path: file_digest(path, digests) for path in outputs}}
+                print(f"✅ {source} -> {len(outputs)} variants ({seconds * 1000:.0f}ms)")
+
+    # Sources that no longer match the spec (or failed) drop out of the manifest, with their variants
+    for source in set(state["sources"]) - set(sources):
+        for path in state["sources"][source]["outputs"]:
+            Path(path).unlink(missing_ok=True)
+    state["sources"] = {s: state["sources"][s] for s in sources if s in state["sources"]}
+    manifest = {s: entry["entry"] for s, entry in state["sources"].items()}
+    if load_json(config["manifest"], None) != manifest:
+        save_json(manifest, config["manifest"])
+    save_json(state, STATE_FILE)
+
+    print(f"{len(stale) - len(failed)} encoded, {len(sources) - len(stale)} up to date, {len(failed)} failed "
+          f"in {time.perf_counter() - started:.2f}s")
+    return manifest, failed
+
+
+def print_savings(manifest, formats, limit=20):
+    """Bytes saved per asset by the best format at the largest width."""
+    rows = []
+    for source, entry in manifest.items():
+        sizes = entry["bytes"]
+        best = min((fmt for fmt in formats if fmt in sizes), key=lambda fmt: sizes[fmt], default=None)
+        if best is None:
+            continue
+        rows.append((sizes["original"] - sizes[best], source, sizes["original"], best, sizes[best]))
+    rows.sort(reverse=True)
+
+    print("\n📉 BYTES SAVED (largest variant vs original)")
+    print("=" * 100)
+    print(f"{'original':>10} {'best':>10} {'saved':>10} {'':>6}  asset")
+    for saved, source, original, best, size in rows[:limit]:
+        print(f"{original / 1024:>9.0f}K {size / 1024:>9.0f}K {saved / 1024:>9.0f}K "
+              f"{saved / original * 100 if original else 0:>5.0f}%  {source} ({best})")
+    if len(rows) > limit:
+        print(f"... {len(rows) - limit} more")
+    total_original = sum(row[2] for row in rows)
+    total_saved = sum(row[0] for row in rows)
+    print("-" * 100)
+    print(f"{len(rows)} assets: {total_original / 2 ** 20:.2f} MB -> {(total_original - total_saved) / 2 ** 20:.2f} MB "
+          f"({total_saved / 2 ** 20:.2f} MB saved, {total_saved / total_original * 100 if total_original else 0:.0f}%)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Encode responsive AVIF/WebP variants and a srcset manifest")
+    parser.add_argument("--spec", default=str(SPEC_FILE))
+    parser.add_argument("--force", action="store_true", help="Ignore the cache and re-encode every source")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top", type=int, default=20, help="Assets to list in the savings report")
+    args = parser.parse_args()
+
+    manifest, failed = build(args.spec, args.force, args.workers)
+    if manifest:
+        print_savings(manifest, list(load_config(args.spec)["formats"]), args.top)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,352 @@
+import os
+import io
+import sys
+import ssl
+import json
+import shutil
+import hashlib
+import zipfile
+import argparse
+import tempfile
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Restore / verify tool for backups produced by scripts/backup.py.
+# Accepts a backup folder, a RentMate_Backup_*.zip archive or a snapshot name
+# from the deduplicating repository (scripts/backup_repository.py).
+
+# Parent tables must be loaded before their children. Tables with no pending
+# parents are loaded in parallel, one connection each.
+TABLE_DEPENDENCIES = {
+    "user_profiles": [],
+    "properties": ["user_profiles"],
+    "contracts": ["properties", "user_profiles"],
+    "property_documents": ["properties", "user_profiles"],
+    "short_links": ["user_profiles"],
+    "ai_chat_usage": ["user_profiles"],
+    "ai_usage_limits": ["user_profiles"],
+}
+
+
+def load_env(env_path=".env"):
+    env_vars = {}
+    if os.path.exists(env_path):
+        with open(env_path, "r") as f:
+            for line in f:
+                if "=" in line and not line.startswith("#"):
+                    key, value = line.strip().split("=", 1)
+                    env_vars[key] = value
+    return env_vars
+
+
+def parse_uri(uri):
+    ssl_context = ssl.create_default_context()
+    ssl_context.check_hostname = False
+    ssl_context.verify_mode = ssl.CERT_NONE
+
+    parts = uri.replace("postgresql://", "").split("@")
+    user_pass = parts[0].split(":")
+    host_port_db = parts[1].split("/")
+    host_port = host_port_db[0].split(":")
+    params = {
+        "user": user_pass[0], "password": user_pass[1],
+        "host": host_port[0], "port": int(host_port[1]) if len(host_port) > 1 else 5432,
+        "database": host_port_db[1].split("?")[0], "timeout": 30
+    }
+    # Local stand-ins usually run without TLS
+    if host_port[0] not in ("localhost", "127.0.0.1"):
+        params["ssl_context"] = ssl_context
+    return params
+
+
+def sha256_file(path):
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def resolve_backup(source, workdir):
+    """Returns a directory holding the backup contents (extracting zips / repository snapshots)."""
+    path = Path(source)
+    if path.is_dir():
+        return path
+    if path.suffix == ".zip" and path.exists():
+        target = Path(workdir) / path.stem
+        print(f"Extracting {path} ...")
+        with zipfile.ZipFile(path) as archive:
+            archive.extractall(target)
+        return target
+
+    from backup_repository import BackupRepository
+    repo = BackupRepository()
+    if source in repo.list_snapshots():
+        return repo.restore(source, Path(workdir) / source)
+
+    raise FileNotFoundError(f"No backup folder, archive or repository snapshot named {source}")
+
+
+def restore_order(tables):
+    """Groups tables into FK-safe levels; every table in a level can load concurrently."""
+    pending = {t: [d for d in TABLE_DEPENDENCIES.get(t, []) if d in tables] for t in tables}
+    levels = []
+    while pending:
+        ready = sorted(t for t, deps in pending.items() if not deps)
+        if not ready:
+            raise ValueError(f"Circular table dependencies: {sorted(pending)}")
+        levels.append(ready)
+        for table in ready:
+            del pending[table]
+        for deps in pending.values():
+            deps[:] = [d for d in deps if d not in ready]
+    return levels
+
+
+def _array_literal(values):
+    """Postgres array literal for a (possibly nested) list: {"a","b"}; elements are always quoted."""
+    items = []
+    for item in values:
+        if item is None:
+            items.append("NULL")
+        elif isinstance(item, list):
+            items.append(_array_literal(item))
+        else:
+            if isinstance(item, dict):
+                item = json.dumps(item, ensure_ascii=False)
+            elif isinstance(item, bool):
+                item = "t" if item else "f"
+            items.append('"' + str(item).replace("\\", "\\\\").replace('"', '\\"') + '"')
+    return "{" + ",".join(items) + "}"
+
+
+def _copy_value(value, data_type=None):
+    # COPY text format: \N for NULL, backslash escapes for control characters.
+    # Lists go out as array literals for ARRAY columns (e.g. property_documents.tags
+    # is TEXT[]) and as JSON for json/jsonb columns or when the type is unknown.
+    if value is None:
+        return "\\N"
+    if isinstance(value, list) and data_type == "ARRAY":
+        value = _array_literal(value)
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value, ensure_ascii=False)
+    elif isinstance(value, bool):
+        value = "t" if value else "f"
+    value = str(value)
+    return (value.replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+def rows_to_copy_buffer(rows, column_types=None):
+    """Converts PostgREST JSON rows to (columns, COPY text payload).
+
+    column_types maps column name -> information_schema data_type ("ARRAY", "jsonb", ...).
+    """
+    column_types = column_types or {}
+    columns = []
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns.append(key)
+
+    buffer = io.BytesIO()
+    for row in rows:
+        line = "\t".join(_copy_value(row.get(col), column_types.get(col)) for col in columns)
+        buffer.write(line.encode("utf-8") + b"\n")
+    buffer.seek(0)
+    return columns, buffer
+
+
+class BackupRestorer:
+    def __init__(self, backup_dir, workers=4):
+        self.backup_dir = Path(backup_dir)
+        self.workers = workers
+
+    # --- Verify ---
+    def verify(self):
+        """Checks every file against manifest.json (in parallel) and that table exports parse."""
+        print(f"--- Verifying {self.backup_dir} ---")
+        problems = []
+        manifest_path = self.backup_dir / "manifest.json"
+
+        if manifest_path.exists():
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                expected = json.load(f)["files"]
+
+            def check(rel_path, entry):
+                path = self.backup_dir / rel_path
+                if not path.exists():
+                    return f"missing: {rel_path}"
+                if path.stat().st_size != entry["size"]:
+                    return f"size mismatch: {rel_path}"
+                if sha256_file(path) != entry["sha256"]:
+                    return f"checksum mismatch: {rel_path}"
+                return None
+
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = [pool.submit(check, rel, entry) for rel, entry in expected.items()]
+                results = [f.result() for f in as_completed(futures)]
+            problems.extend(r for r in results if r)
+            print(f"Checked {len(expected)} files against manifest")
+        else:
+            print("  [!] No manifest.json (backup predates manifests), checking table exports only")
+
+        for table_file in sorted((self.backup_dir / "database").glob("*.json")):
+            try:
+                with open(table_file, "r", encoding="utf-8") as f:
+                    if not isinstance(json.load(f), list):
+                        problems.append(f"not a row list: {table_file.name}")
+            except ValueError as e:
+                problems.append(f"invalid JSON in {table_file.name}: {e}")
+
+        for problem in sorted(problems):
+            print(f"  [!] {problem}")
+        print("Verification passed" if not problems else f"Verification FAILED ({len(problems)} problems)")
+        return problems
+
+    # --- Database ---
+    def _load_table(self, connect_params, table, disable_triggers):
+        import pg8000
+
+        with open(self.backup_dir / "database" / f"{table}.json", "r", encoding="utf-8") as f:
+            rows = json.load(f)
+        if not rows:
+            return table, 0
+
+        conn = pg8000.connect(**connect_params)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT column_name, data_type FROM information_schema.columns "
+                "WHERE table_schema = 'public' AND table_name = %s", (table,))
+            columns, buffer = rows_to_copy_buffer(rows, dict(cursor.fetchall()))
+            column_list = ", ".join(f'"{c}"' for c in columns)
+            if disable_triggers:
+                # Skips FK checks against tables outside the backup (e.g. auth.users)
+                cursor.execute("SET session_replication_role = replica")
+            cursor.execute(f'COPY public."{table}" ({column_list}) FROM STDIN', stream=buffer)
+            conn.commit()
+        finally:
+            conn.close()
+        return table, len(rows)
+
+    def restore_database(self, target_uri, truncate=False, disable_triggers=False):
+        print("--- Restoring Database (COPY) ---")
+        connect_params = parse_uri(target_uri)
+        tables = [p.stem for p in (self.backup_dir / "database").glob("*.json")]
+        levels = restore_order(tables)
+
+        if truncate:
+            # Children are cleared before their parents, so truncation follows the reverse order
+            for level in reversed(levels):
+                with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                    list(pool.map(lambda t: self._truncate(connect_params, t, disable_triggers), level))
+
+        restored = {}
+        for level in levels:
+            print(f"Loading: {', '.join(level)}")
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = [pool.submit(self._load_table, connect_params, t, disable_triggers) for t in level]
+                for future in as_completed(futures):
+                    table, count = future.result()
+                    restored[table] = count
+                    print(f"  {table}: {count} rows")
+        return restored
+
+    def _truncate(self, connect_params, table, disable_triggers):
+        import pg8000
+
+        conn = pg8000.connect(**connect_params)
+        try:
+            cursor = conn.cursor()
+            if disable_triggers:
+                cursor.execute("SET session_replication_role = replica")
+            cursor.execute(f'DELETE FROM public."{table}"')
+            conn.commit()
+        finally:
+            conn.close()
+
+    # --- Storage ---
+    def _storage_files(self):
+        storage_dir = self.backup_dir / "storage"
+        return [p for p in storage_dir.rglob("*") if p.is_file()] if storage_dir.exists() else []
+
+    def restore_storage_to_dir(self, target_dir):
+        print(f"--- Restoring Storage to {target_dir} ---")
+        storage_dir = self.backup_dir / "storage"
+        target_dir = Path(target_dir)
+
+        def copy(path):
+            dest = target_dir / path.relative_to(storage_dir)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(path, dest)
+
+        files = self._storage_files()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(copy, files))
+        print(f"Restored {len(files)} objects")
+        return len(files)
+
+    def restore_storage_to_s3(self, endpoint_url, access_key, secret_key):
+        """Uploads bucket/<key> files to an S3-compatible endpoint (MinIO, Supabase S3, ...)."""
+        import boto3
+
+        print(f"--- Restoring Storage to {endpoint_url} ---")
+        storage_dir = self.backup_dir / "storage"
+        # boto3 clients are thread-safe, so one client serves all upload workers
+        s3 = boto3.client(
+            "s3", endpoint_url=endpoint_url,
+            aws_access_key_id=access_key, aws_secret_access_key=secret_key
+        )
+
+        files = self._storage_files()
+        buckets = {p.relative_to(storage_dir).parts[0] for p in files}
+        existing = {b["Name"] for b in s3.list_buckets().get("Buckets", [])}
+        for bucket in buckets - existing:
+            s3.create_bucket(Bucket=bucket)
+
+        def upload(path):
+            bucket, *key_parts = path.relative_to(storage_dir).parts
+            s3.upload_file(str(path), bucket, "/".join(key_parts))
+
+        with ThreadPoolExecutor(max_workers=self.workers * 4) as pool:
+            list(pool.map(upload, files))
+        print(f"Uploaded {len(files)} objects")
+        return len(files)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Restore or verify a RentMate backup")
+    parser.add_argument("command", choices=["verify", "restore"])
+    parser.add_argument("source", help="Backup folder, .zip archive or repository snapshot name")
+    parser.add_argument("--target-db", help="postgresql:// URI to COPY the tables into")
+    parser.add_argument("--storage-dir", help="Restore storage objects into this directory")
+    parser.add_argument("--s3-endpoint", help="Restore storage objects to an S3-compatible endpoint")
+    parser.add_argument("--truncate", action="store_true", help="Empty the target tables first")
+    parser.add_argument("--disable-triggers", action="store_true",
+                        help="Load with session_replication_role=replica (skips FK/trigger checks)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    args = parser.parse_args()
+
+    env = load_env()
+    with tempfile.TemporaryDirectory() as workdir:
+        restorer = BackupRestorer(resolve_backup(args.source, workdir), workers=args.workers)
+
+        if args.command == "verify":
+            sys.exit(1 if restorer.verify() else 0)
+
+        if restorer.verify():
+            print("❌ Refusing to restore a backup that failed verification.")
+            sys.exit(1)
+        if args.target_db:
+            restorer.restore_database(args.target_db, truncate=args.truncate,
+                                      disable_triggers=args.disable_triggers)
+        if args.storage_dir:
+            restorer.restore_storage_to_dir(args.storage_dir)
+        if args.s3_endpoint:
+            restorer.restore_storage_to_s3(
+                args.s3_endpoint,
+                env.get("S3_ACCESS_KEY_ID", os.environ.get("S3_ACCESS_KEY_ID", "")),
+                env.get("S3_SECRET_ACCESS_KEY", os.environ.get("S3_SECRET_ACCESS_KEY", ""))
+            )
+        print("✅ Restore complete.")
@@ -1,7 +1,13 @@
 import os
+import sys
 import json
-import requests
+import time
+import argparse
+import numpy as np
 from datetime import datetime, timedelta
+from multiprocessing import Pool
+
+from linkage_engine import LinkageEngine, IndexSeries, LINKAGE_TYPES, synthetic_engine, to_day_numbers
 
 # Stress Test Scenarios for RentMate Autopilot
 SCENARIOS = [
@@ -12,7 +18,8 @@ SCENARIOS = [
             "end_date": (datetime.now() + timedelta(days=0)).strftime('%Y-%m-%d'),
             "status": "active"
         },
-        "expected": "Warning: Immediate action required"
+        "expected": "Warning: Immediate action required",
+        "expect_alerts": ["notice_period"]
     },
     {
         "name": "Invalid CPI Reference",
@@ -21,7 +28,9 @@ SCENARIOS = [
             "base_index_value": 0,  # Division by zero risk
             "status": "active"
         },
-        "expected": "Handled gracefully (no crash)"
+        "expected": "Handled gracefully (no crash)",
+        "expect_alerts": [],
+        "expect_flags": ["invalid_base"]
     },
     {
         "name": "Extreme Rent Hike Simulator",
@@ -32,27 +41,213 @@ SCENARIOS = [
             "status": "active"
         },
         "latest_index": 500, # 5x increase
-        "expected": "Alert for significant rent change"
+        "expected": "Alert for significant rent change",
+        "expect_alerts": ["cpi_change"]
     },
     {
         "name": "Missing Notification Settings",
         "user_settings": None, # Force fallback values
-        "expected": "Use default thresholds (100d, 60d)"
+        "contract": {
+            "end_date": (datetime.now() + timedelta(days=100)).strftime('%Y-%m-%d'),
+            "status": "active"
+        },
+        "expected": "Use default thresholds (100d, 60d)",
+        "expect_alerts": ["lease_expiry"]
     }
 ]
 
+# Fallback used by run-automations when user_automation_settings is empty
+DEFAULT_LEASE_EXPIRY_DAYS = 100
+
+
+def evaluate(columns, engine, today):
+    """Applies the autopilot rules to a batch of contracts given as column arrays.
+
+    columns: end_day, notice_period_days, lease_expiry_days (NaN = missing) plus
+    the linkage columns LinkageEngine.revalue() takes.
+    Returns {rule: bool array} and the linkage flags.
+    """
+    end_day = columns["end_day"]
+    notice = columns["notice_period_days"]
+    lease_setting = columns["lease_expiry_days"]
+    days_left = end_day - today
+
+    # A & B. Lease expiry: `notice_period_days || lease_expiry_days || 100`
+    # (JS `||`: 0 and NULL both fall through to the next value)
+    threshold = np.where(notice > 0, notice,
+                         np.where(lease_setting > 0, lease_setting, DEFAULT_LEASE_EXPIRY_DAYS))
+    lease_expiry = days_left == threshold
+
+    # Notice window: contract ends inside its own notice period (0 days = immediate)
+    notice_period = ~np.isnan(notice) & (days_left >= 0) & (days_left <= notice)
+
+    # G. Index linkage monitor
+    linkage = engine.revalue(columns, as_of=today)
+
+    return {
+        "lease_expiry": lease_expiry,
+        "notice_period": notice_period,
+        "cpi_change": linkage["alert"],
+        "invalid_base": linkage["invalid_base"],
+        "missing_index": linkage["missing_index"],
+    }
+
+
+def scenario_columns(scenario, today):
+    contract = scenario.get("contract", {})
+    settings = scenario.get("user_settings", {}) or {}
+
+    def number(value):
+        return np.nan if value is None else float(value)
+
+    end_date = contract.get("end_date")
+    return {
+        "end_day": np.array([to_day_numbers([end_date])[0] if end_date else today + 10_000], dtype=np.int64),
+        "notice_period_days": np.array([number(contract.get("notice_period_days"))]),
+        "lease_expiry_days": np.array([number(settings.get("lease_expiry_days"))]),
+        "base_rent": np.array([number(contract.get("base_rent", 5000))]),
+        "base_index_value": np.array([number(contract.get("base_index_value"))]),
+        "linkage_type": np.array([contract.get("linkage_type") or "none"]),
+    }
+
+
 def run_stress_test():
     print("🚀 Starting Autopilot Stress Test...")
     print("-" * 40)
-    
+    today = int(np.datetime64('today', 'D').astype(np.int32))
+    failures = 0
+
     for scenario in SCENARIOS:
         print(f"Testing Scenario: {scenario['name']}")
-        # In a real environment, we'd insert these into a Test DB
-        # For this simulation, we'll audit the code logic against these values.
-        print(f"  Result: Simulated Logic Passed ✅")
+        latest = scenario.get("latest_index", 100)
+        engine = LinkageEngine({"cpi": IndexSeries(np.array([today - 30], np.int32), np.array([float(latest)]))})
+        try:
+            results = evaluate(scenario_columns(scenario, today), engine, today)
+        except Exception as e:
+            print(f"  Result: CRASHED ❌ ({e})")
+            failures += 1
+            continue
+
+        fired = sorted(rule for rule in ("lease_expiry", "notice_period", "cpi_change") if results[rule][0])
+        flags = sorted(flag for flag in ("invalid_base", "missing_index") if results[flag][0])
+        passed = (fired == sorted(scenario.get("expect_alerts", []))
+                  and all(flag in flags for flag in scenario.get("expect_flags", [])))
+        failures += not passed
+        print(f"  Expected: {scenario['expected']}")
+        print(f"  Alerts: {fired or 'none'}  Flags: {flags or 'none'}")
+        print(f"  Result: {'Passed ✅' if passed else 'FAILED ❌'}")
 
     print("-" * 40)
-    print("✅ Stress Test Complete. All edge cases handled by code fallbacks.")
+    if failures:
+        print(f"❌ Stress Test Failed: {failures} scenario(s) did not behave as expected.")
+    else:
+        print("✅ Stress Test Complete. All edge cases handled.")
+    return failures
+
+
+# --- Synthetic populations & scaling curve ---
+
+def synthetic_population(contracts, first_day, last_day, today, seed=11):
+    """Column arrays for `contracts` active contracts with realistic value spreads."""
+    rng = np.random.default_rng(seed)
+    notice = rng.choice(np.array([np.nan, 0, 30, 60, 90, 100]), contracts, p=[0.3, 0.02, 0.1, 0.28, 0.2, 0.1])
+    return {
+        "end_day": today + rng.integers(-30, 3 * 365, contracts),
+        "notice_period_days": notice,
+        "lease_expiry_days": rng.choice(np.array([np.nan, 60, 90, 100, 120]), contracts),
+        "base_rent": rng.integers(3000, 15000, contracts).astype(np.float64),
+        "base_index_value": np.where(rng.random(contracts) < 0.005, 0, rng.uniform(90, 130, contracts)),
+        "linkage_type": rng.choice(np.array(LINKAGE_TYPES + ("none",)), contracts),
+        "base_index_date": rng.integers(first_day, last_day, contracts).astype(np.float64),
+        "linkage_ceiling": np.where(rng.random(contracts) < 0.3, 5.0, np.nan),
+        "linkage_floor": np.where(rng.random(contracts) < 0.5, 0.0, np.nan),
+    }
+
+
+def split_columns(columns, parts):
+    n = len(columns["end_day"])
+    bounds = np.linspace(0, n, parts + 1, dtype=int)
+    return [{k: v[a:b] for k, v in columns.items()} for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+_worker_engine = None
+
+
+def _init_worker():
+    global _worker_engine
+    _worker_engine, _, _ = synthetic_engine()
+
+
+def _evaluate_chunk(args):
+    chunk, today = args
+    results = evaluate(chunk, _worker_engine, today)
+    return {rule: int(mask.sum()) for rule, mask in results.items()}
+
+
+def run_scaling_curve(contracts=1_000_000, max_workers=None, chunks_per_worker=4, repeats=3):
+    """Runs the rule evaluation at 1, 2, 4 ... N workers; returns [{workers, seconds, contracts_per_s}]."""
+    max_workers = max_workers or os.cpu_count() or 1
+    _, first_day, last_day = synthetic_engine()
+    today = last_day
+    population = synthetic_population(contracts, first_day, last_day, today)
+
+    worker_counts = []
+    w = 1
+    while w < max_workers:
+        worker_counts.append(w)
+        w *= 2
+    worker_counts.append(max_workers)
+
+    print(f"📈 Autopilot scaling curve: {contracts:,} contracts, workers {worker_counts}")
+    curve = []
+    for workers in worker_counts:
+        jobs = [(chunk, today) for chunk in split_columns(population, workers * chunks_per_worker)]
+        with Pool(processes=workers, initializer=_init_worker) as pool:
+            pool.map(_evaluate_chunk, jobs[:workers])  # warm-up: engines built, imports done
+            timings = []
+            for _ in range(repeats):
+                started = time.perf_counter()
+                counts = pool.map(_evaluate_chunk, jobs)
+                timings.append(time.perf_counter() - started)
+        best = min(timings)
+        alerts = {rule: sum(c[rule] for c in counts) for rule in counts[0]}
+        curve.append({"workers": workers, "seconds": round(best, 4),
+                      "contracts_per_s": round(contracts / best), "alerts": alerts,
+                      "timings_s": [round(t, 4) for t in timings]})
+
+    base = curve[0]["contracts_per_s"]
+    print(f"{'workers':>8}{'seconds':>10}{'contracts/s':>14}{'speedup':>9}")
+    for point in curve:
+        print(f"{point['workers']:>8}{point['seconds']:>10}{point['contracts_per_s']:>14,}"
+              f"{point['contracts_per_s'] / base:>8.2f}x")
+    print(f"Alerts (last run): {curve[-1]['alerts']}")
+    return curve
+
 
 if __name__ == "__main__":
-    run_stress_test()
+    parser = argparse.ArgumentParser(description="Autopilot rule harness")
+    parser.add_argument("--scale", action="store_true", help="Also run the throughput-vs-workers curve")
+    parser.add_argument("--contracts", type=int, default=1_000_000)
+    parser.add_argument("--max-workers", type=int, default=None)
+    parser.add_argument("--json", metavar="PATH", help="Write the scaling curve as JSON")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per worker count")
+    parser.add_argument("--record", metavar="SCENARIO",
+                        help="Store the curve in the perf results file (see scripts/perf_results.py)")
+    args = parser.parse_args()
+
+    failed = run_stress_test()
+    if args.scale:
+        curve = run_scaling_curve(args.contracts, args.max_workers, repeats=args.repeats)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(curve, f, indent=2)
+        if args.record:
+            from perf_results import record
+
+            metrics = {f"workers_{p['workers']}": {"seconds": p["seconds"], "contracts_per_s": p["contracts_per_s"]}
+                       for p in curve}
+            samples = {f"workers_{p['workers']}.seconds": p["timings_s"] for p in curve}
+            entry = record(args.record, metrics, samples, tool="stress_test_autopilot",
+                           meta={"contracts": args.contracts, "scenario_failures": failed})
+            print(f"Recorded as {args.record} @ {entry['commit']}")
+    sys.exit(1 if failed else 0)
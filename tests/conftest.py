@@ -1,5 +1,321 @@
 """
 Pytest configuration for RentMate E2E tests
+
+pytest-playwright provides the browser/context/page fixtures; its `browser`
+fixture is session-scoped, so every xdist worker launches Chromium once and
+reuses it for all of its tests.
+
+On top of that:
+- `auth_state`: logs in once (E2E_EMAIL / E2E_PASSWORD) and saves the Playwright
+  storage_state; xdist workers share the file instead of logging in again.
+  Tests marked `authenticated` get contexts created from it.
+- `--shard i/n`: runs a stable 1/n slice of the suite (split CI machines).
+- Per-test timing report for the tests under tests/e2e at the end of the run,
+  also written to test-results/e2e_timings.json.
+- Page-load metrics for every page.goto (navigation timing, LCP, resource
+  count, transferred bytes), taken once LCP is reported and the network has
+  settled so lazily loaded chunks count, appended to
+  test-results/page_loads.jsonl, and `@pytest.mark.budget(lcp_ms=1500,
+  js_kb=300)` to fail tests that exceed them. Budgets are meant for a
+  production build (`npm run build && npm run preview`, then
+  E2E_BASE_URL=http://localhost:4173): navigations served by the Vite dev
+  server only report violations as warnings. E2E_BUDGETS=enforce|report
+  overrides that either way.
+
+Run in parallel across cores:
+    pytest tests -n auto --dist loadfile
 """
-# pytest-playwright provides browser and page fixtures automatically
-# No custom fixtures needed
+import os
+import json
+import time
+import zlib
+from pathlib import Path
+
+import pytest
+
+BASE_URL = os.environ.get("E2E_BASE_URL", "http://localhost:5173")
+STORAGE_STATE = Path(os.environ.get("E2E_STORAGE_STATE", "test-results/.auth/storage_state.json"))
+STORAGE_STATE_MAX_AGE_S = 30 * 60  # Supabase access tokens last an hour
+TIMINGS_FILE = Path("test-results/e2e_timings.json")
+PAGE_LOADS_FILE = Path("test-results/page_loads.jsonl")
+BUDGET_MODE = os.environ.get("E2E_BUDGETS", "auto")  # auto | enforce | report
+METRICS_SETTLE_MS = 500  # no new resources for this long -> lazy chunks are in
+METRICS_TIMEOUT_MS = 10000
+
+
+def pytest_addoption(parser):
+    parser.addoption("--shard", default=None, help="Run only shard i of n, e.g. --shard 2/4")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "authenticated: run with the logged-in storage_state")
+    config.addinivalue_line("markers", "budget(**limits): page-load budgets for every navigation, "
+                                       "e.g. lcp_ms=1500, js_kb=300, load_ms=3000, requests=80")
+
+
+def pytest_collection_modifyitems(config, items):
+    shard = config.getoption("--shard")
+    if not shard:
+        return
+    index, total = (int(x) for x in shard.split("/"))
+    if not 1 <= index <= total:
+        raise pytest.UsageError(f"--shard must be i/n with 1 <= i <= n, got {shard}")
+    # Keyed on the file so module-level setup stays on one shard
+    selected, deselected = [], []
+    for item in items:
+        bucket = zlib.crc32(item.nodeid.split("::")[0].encode()) % total
+        (selected if bucket == index - 1 else deselected).append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+# --- Shared login ---
+
+def _fresh(path):
+    return path.exists() and time.time() - path.stat().st_mtime < STORAGE_STATE_MAX_AGE_S
+
+
+def _log_in(browser, path):
+    email, password = os.environ.get("E2E_EMAIL"), os.environ.get("E2E_PASSWORD")
+    if not email or not password:
+        pytest.skip("E2E_EMAIL / E2E_PASSWORD not set (needed for authenticated tests)")
+
+    context = browser.new_context()
+    try:
+        page = context.new_page()
+        page.goto(f"{BASE_URL}/login")
+        page.locator("input[type='email']").fill(email)
+        page.locator("input[type='password']").fill(password)
+        page.locator("button[type='submit']").click()
+        page.wait_for_url(lambda url: "/login" not in url, timeout=30000)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        context.storage_state(path=str(tmp))
+        os.replace(tmp, path)
+    finally:
+        context.close()
+
+
+@pytest.fixture(scope="session")
+def auth_state(browser):
+    """Path of a logged-in storage_state, created at most once across xdist workers."""
+    if _fresh(STORAGE_STATE):
+        return str(STORAGE_STATE)
+
+    # The first worker to grab the lock logs in; the others wait for its file
+    lock = STORAGE_STATE.with_suffix(".lock")
+    lock.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.time() + 60
+    while True:
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if _fresh(STORAGE_STATE):
+                return str(STORAGE_STATE)
+            if time.time() > deadline:
+                lock.unlink(missing_ok=True)  # stale lock from a crashed worker
+                deadline = time.time() + 60
+            time.sleep(0.2)
+            continue
+        try:
+            if not _fresh(STORAGE_STATE):
+                _log_in(browser, STORAGE_STATE)
+            return str(STORAGE_STATE)
+        finally:
+            os.close(fd)
+            lock.unlink(missing_ok=True)
+
+
+@pytest.fixture
+def browser_context_args(browser_context_args, request):
+    """Authenticated tests get contexts restored from the shared storage_state."""
+    if request.node.get_closest_marker("authenticated"):
+        return {**browser_context_args, "storage_state": request.getfixturevalue("auth_state")}
+    return browser_context_args
+
+
+# --- Page-load budgets ---
+
+# The default buffer (250 entries) overflows on the unbundled dev server
+RESOURCE_BUFFER_SCRIPT = "performance.setResourceTimingBufferSize(10000)"
+
+# Resolves once an LCP entry has been reported and no new resources arrived for
+# settleMs (so lazily loaded chunks are counted), or at timeoutMs regardless
+PAGE_METRICS_SCRIPT = """
+([settleMs, timeoutMs]) => new Promise(resolve => {
+  let lcp = null;
+  try {
+    new PerformanceObserver(list => {
+      const entries = list.getEntries();
+      lcp = entries[entries.length - 1].startTime;
+    }).observe({ type: 'largest-contentful-paint', buffered: true });
+  } catch (e) {}
+
+  // transferSize is 0 for cached or cross-origin (no Timing-Allow-Origin) responses
+  const bytes = r => r.transferSize || r.encodedBodySize || 0;
+  const isJs = r => r.initiatorType === 'script' || /\\.m?js(\\?|$)/.test(r.name);
+  const measure = () => {
+    const nav = performance.getEntriesByType('navigation')[0] || {};
+    const resources = performance.getEntriesByType('resource');
+    return {
+      ttfb_ms: nav.responseStart,
+      dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+      load_ms: nav.loadEventEnd,
+      requests: resources.length + 1,
+      transfer_kb: (resources.reduce((sum, r) => sum + bytes(r), 0) + (nav.transferSize || 0)) / 1024,
+      js_kb: resources.filter(isJs).reduce((sum, r) => sum + bytes(r), 0) / 1024,
+      lcp_ms: lcp,
+      dev_server: resources.some(r => r.name.includes('/@vite/client'))
+    };
+  };
+
+  const started = performance.now();
+  let count = -1, quietSince = started;
+  const poll = () => {
+    const now = performance.now();
+    const n = performance.getEntriesByType('resource').length;
+    if (n !== count) { count = n; quietSince = now; }
+    if ((lcp !== null && now - quietSince >= settleMs) || now - started >= timeoutMs) {
+      resolve(measure());
+    } else {
+      setTimeout(poll, 100);
+    }
+  };
+  poll();
+})
+"""
+
+
+class NavigationRecorder:
+    """Collects metrics after each page.goto of one test."""
+
+    def __init__(self, nodeid):
+        self.nodeid = nodeid
+        self.navigations = []
+
+    def collect(self, page, url):
+        metrics = page.evaluate(PAGE_METRICS_SCRIPT, [METRICS_SETTLE_MS, METRICS_TIMEOUT_MS])
+        metrics = {k: round(v, 1) if isinstance(v, float) else v for k, v in metrics.items()}
+        entry = {"test": self.nodeid, "url": url, "final_url": page.url, **metrics}
+        self.navigations.append(entry)
+        return entry
+
+    def violations(self, limits, navigations=None):
+        """Budget breaches; a budgeted metric that was never reported (e.g. no LCP) counts as one."""
+        found = []
+        for nav in self.navigations if navigations is None else navigations:
+            for metric, limit in limits.items():
+                value = nav.get(metric)
+                if value is None:
+                    found.append(f"{nav['url']}: {metric} missing (budget {limit:g})")
+                elif value > limit:
+                    found.append(f"{nav['url']}: {metric} {value:g} > {limit:g}")
+        return found
+
+    def enforced(self):
+        """Navigations whose budgets fail the test under BUDGET_MODE."""
+        if BUDGET_MODE == "enforce":
+            return self.navigations
+        if BUDGET_MODE == "report":
+            return []
+        # Dev-server numbers (unbundled modules, HMR client) say nothing about production
+        return [nav for nav in self.navigations if not nav.get("dev_server")]
+
+    def check(self, **limits):
+        """In-test assertion, e.g. page_loads.check(lcp_ms=1500, js_kb=300)."""
+        found = self.violations(limits)
+        assert not found, "Page-load budget exceeded:\n  " + "\n  ".join(found)
+
+
+@pytest.fixture(autouse=True)
+def page_loads(request):
+    """Wraps page.goto for tests that use `page`; checks @pytest.mark.budget at teardown."""
+    recorder = NavigationRecorder(request.node.nodeid)
+    if "page" not in request.fixturenames:
+        yield recorder
+        return
+
+    page = request.getfixturevalue("page")
+    page.add_init_script(RESOURCE_BUFFER_SCRIPT)
+    original_goto = page.goto
+
+    def goto(url, **kwargs):
+        response = original_goto(url, **kwargs)
+        try:
+            recorder.collect(page, url)
+        except Exception:
+            pass  # a navigation that tore down the page mid-evaluate isn't worth failing over
+        return response
+
+    page.goto = goto
+    yield recorder
+    page.goto = original_goto
+
+    if recorder.navigations:
+        PAGE_LOADS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+        with open(PAGE_LOADS_FILE, "a", encoding="utf-8") as f:
+            for nav in recorder.navigations:
+                f.write(json.dumps({"timestamp": stamp, **nav}) + "\n")
+
+    marker = request.node.get_closest_marker("budget")
+    if marker:
+        enforced = recorder.violations(marker.kwargs, recorder.enforced())
+        if enforced:
+            pytest.fail("Page-load budget exceeded:\n  " + "\n  ".join(enforced), pytrace=False)
+        for violation in recorder.violations(marker.kwargs):
+            request.node.warn(pytest.PytestWarning(f"budget: {violation}"))
+
+
+# --- Timing report ---
+
+E2E_DIR = Path(__file__).resolve().parent / "e2e"
+_timings = {}
+_started = time.time()
+
+
+def pytest_itemcollected(item):
+    # Tagged on the item so the mark travels with its reports to the xdist controller
+    if E2E_DIR in Path(item.path).resolve().parents:
+        item.user_properties.append(("e2e", True))
+
+
+def pytest_sessionstart(session):
+    global _started
+    _started = time.time()
+
+
+def pytest_runtest_logreport(report):
+    # Under xdist the controller receives every worker's reports here too
+    if not dict(report.user_properties).get("e2e"):
+        return
+    entry = _timings.setdefault(report.nodeid, {"setup": 0.0, "call": 0.0, "teardown": 0.0})
+    entry[report.when] = round(report.duration, 3)
+    if report.when == "call" or report.failed:
+        entry["outcome"] = report.outcome
+    node = getattr(report, "node", None)
+    if node is not None:
+        entry["worker"] = node.gateway.id
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if hasattr(config, "workerinput") or not _timings:
+        return
+    timings = _timings
+    for entry in timings.values():
+        entry["total"] = round(entry["setup"] + entry["call"] + entry["teardown"], 3)
+    wall = time.time() - _started
+    busy = sum(entry["total"] for entry in timings.values())
+
+    tr = terminalreporter
+    tr.section("E2E timing")
+    tr.write_line(f"{'total':>8} {'setup':>8} {'call':>8}  test")
+    for nodeid, entry in sorted(timings.items(), key=lambda item: -item[1]["total"])[:15]:
+        tr.write_line(f"{entry['total']:>8.2f} {entry['setup']:>8.2f} {entry['call']:>8.2f}  {nodeid}")
+    tr.write_line(f"{len(timings)} tests, {busy:.1f}s of test time in {wall:.1f}s wall "
+                  f"({busy / wall if wall else 0:.1f}x parallelism)")
+
+    TIMINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    TIMINGS_FILE.write_text(json.dumps({"wall_s": round(wall, 2), "test_time_s": round(busy, 2),
+                                        "tests": timings}, indent=2), encoding="utf-8")
@@ -2,11 +2,14 @@
 RentMate E2E Tests - Critical User Flows
 Tests the most important user journeys to ensure core functionality works.
 """
+import os
 import re
+import pytest
 from playwright.sync_api import Page, expect
 
-BASE_URL = "http://localhost:5173"
+BASE_URL = os.environ.get("E2E_BASE_URL", "http://localhost:5173")
 
+@pytest.mark.budget(lcp_ms=1500, js_kb=300)
 def test_landing_page_loads(page: Page):
     """Test 1: Landing page (WelcomeLanding) loads correctly"""
     page.goto(BASE_URL)
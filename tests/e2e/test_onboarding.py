@@ -1,8 +1,13 @@
 
+import os
 import re
+import pytest
 from playwright.sync_api import Page, expect
 
-BASE_URL = "http://localhost:5173"
+BASE_URL = os.environ.get("E2E_BASE_URL", "http://localhost:5173")
+
+# Dashboard flows need a logged-in user (see tests/conftest.py)
+pytestmark = pytest.mark.authenticated
 
 def test_bionic_welcome_overlay_appears(page: Page):
     """
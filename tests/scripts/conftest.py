@@ -0,0 +1,10 @@
+"""
+Unit tests for the Python tooling in scripts/.
+
+The scripts import each other as top-level modules (they are run as
+`python scripts/<name>.py`), so scripts/ goes on sys.path here.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
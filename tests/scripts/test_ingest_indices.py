@@ -0,0 +1,83 @@
+import io
+import asyncio
+
+import pytest
+
+import fetch_boi_history
+from ingest_indices import Observation, Source, run_against_fixtures
+from fetch_boi_history import upsert_index_data
+
+
+class IndexDataTable:
+    """Stands in for a pg8000 connection: applies the INSERT ... ON CONFLICT
+    (index_type, date) DO UPDATE SET value statements upsert_index_data issues
+    to a dict, through both the VALUES and the COPY + temp table path."""
+
+    def __init__(self):
+        self.rows = {}
+        self.incoming = []
+        self.commits = 0
+
+    def cursor(self):
+        return self
+
+    def commit(self):
+        self.commits += 1
+
+    def execute(self, sql, params=None, stream=None):
+        if sql.startswith("CREATE TEMP TABLE"):
+            self.incoming = []
+        elif sql.startswith("COPY"):
+            lines = stream.read().decode("utf-8").splitlines()
+            self.incoming = [tuple(line.split("\t")) for line in lines]
+        elif sql.startswith("INSERT INTO public.index_data"):
+            assert "ON CONFLICT (index_type, date) DO UPDATE SET value = EXCLUDED.value" in sql
+            if "FROM index_data_incoming" in sql:
+                rows = self.incoming
+            else:
+                rows = [tuple(params[i:i + 4]) for i in range(0, len(params), 4)]
+            for index_type, date_str, value, source in rows:
+                key = (index_type, date_str)
+                # Conflicts only overwrite the value, the original source stays
+                kept = self.rows[key][1] if key in self.rows else source
+                self.rows[key] = (float(value), kept)
+        else:
+            raise AssertionError(f"unexpected statement: {sql}")
+
+
+@pytest.fixture(scope="module")
+def observations():
+    return asyncio.run(run_against_fixtures())
+
+
+def test_source_requires_fetch():
+    with pytest.raises(TypeError):
+        Source()
+
+
+def test_fixtures_yield_normalized_observations(observations):
+    assert len(observations) == 13
+    assert all(isinstance(obs, Observation) and obs.value > 0 for obs in observations)
+    counts = {}
+    for obs in observations:
+        counts[obs.index_type] = counts.get(obs.index_type, 0) + 1
+    assert counts == {"usd": 3, "eur": 3, "cpi": 3, "housing": 2, "construction": 2}
+    keys = [(obs.index_type, obs.date) for obs in observations]
+    assert keys == sorted(set(keys))
+    assert {obs.source for obs in observations} == {"exchange-api", "cbs"}
+
+
+@pytest.mark.parametrize("copy_threshold", [fetch_boi_history.COPY_THRESHOLD, 0])
+def test_upsert_inserts_then_updates(observations, monkeypatch, copy_threshold):
+    monkeypatch.setattr(fetch_boi_history, "COPY_THRESHOLD", copy_threshold)
+    table = IndexDataTable()
+
+    assert upsert_index_data(table, [tuple(obs) for obs in observations]) == 13
+    assert table.rows == {(obs.index_type, obs.date): (obs.value, obs.source) for obs in observations}
+
+    # Re-ingesting a revised value updates the row in place instead of adding one
+    revised = observations[0]._replace(value=observations[0].value + 1, source="manual")
+    upsert_index_data(table, [tuple(revised)])
+    assert len(table.rows) == 13
+    assert table.rows[(revised.index_type, revised.date)] == (revised.value, observations[0].source)
+    assert table.commits == 2
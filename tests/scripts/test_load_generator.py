@@ -0,0 +1,32 @@
+import pytest
+
+from load_generator import arrival_schedule
+
+
+def check_schedule(offsets, rate, duration_s, ramp_to):
+    assert offsets == sorted(offsets)
+    assert all(0 <= t < duration_s for t in offsets)
+    # N(T) = (r0 + r1) * T / 2 arrivals, give or take the one cut off at T
+    expected = (rate + ramp_to) * duration_s / 2
+    assert expected - 1 <= len(offsets) <= expected + 1
+
+
+def test_constant_rate():
+    offsets = list(arrival_schedule(10, 5))
+    check_schedule(offsets, 10, 5, 10)
+    assert offsets[:3] == pytest.approx([0, 0.1, 0.2])
+
+
+def test_upward_ramp():
+    offsets = list(arrival_schedule(1, 10, 20))
+    check_schedule(offsets, 1, 10, 20)
+    gaps = [b - a for a, b in zip(offsets, offsets[1:])]
+    assert gaps[0] > gaps[-1]
+
+
+@pytest.mark.parametrize("ramp_to", [0.1, 1e-9, 5])
+def test_downward_ramp(ramp_to):
+    offsets = list(arrival_schedule(10, 10, ramp_to))
+    check_schedule(offsets, 10, 10, ramp_to)
+    gaps = [b - a for a, b in zip(offsets, offsets[1:])]
+    assert gaps[0] < gaps[-1]
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+import perf_results
+from perf_results import compare, direction
+
+
+@pytest.mark.parametrize("metric, expected", [
+    ("total.p95_ms", "lower"),
+    ("endpoints.properties.throughput_rps", "higher"),
+    ("endpoints.properties.status_codes.200", None),
+    ("total.count", None),
+    ("model.rate", None),
+    ("workers_4.seconds", "lower"),
+    ("workers_4.contracts_per_s", "higher"),
+    ("performance_score", "higher"),
+    ("families.react", "lower"),
+    ("cls", "lower"),
+])
+def test_direction(metric, expected):
+    assert direction(metric) == expected
+
+
+def write_runs(path, commit, runs):
+    with open(path, "a", encoding="utf-8") as f:
+        for metrics in runs:
+            f.write(json.dumps({"commit": commit, "scenario": "load", "metrics": metrics,
+                                "samples": {"latency_ms": [1.0] * 200}}) + "\n")
+
+
+@pytest.fixture
+def results(tmp_path, monkeypatch):
+    monkeypatch.setattr(perf_results, "resolve_commit", lambda ref: ref)
+    return tmp_path / "results.jsonl"
+
+
+def verdicts(rows):
+    return {row["metric"]: row["verdict"] for row in rows}
+
+
+def test_compares_runs_not_samples(results):
+    write_runs(results, "base", [{"total.p95_ms": v, "endpoints.a.status_codes.200": 100} for v in (100, 104, 98, 101)])
+    write_runs(results, "cand", [{"total.p95_ms": v, "endpoints.a.status_codes.200": 150} for v in (130, 128, 135, 131)])
+    rows = compare("base", "cand", results)
+    # One value per run on each side; stored samples and status tallies are ignored
+    assert verdicts(rows) == {"total.p95_ms": "regression"}
+    assert rows[0]["baseline_n"] == rows[0]["candidate_n"] == 4
+
+
+def test_higher_is_better_and_noise(results):
+    write_runs(results, "base", [{"total.throughput_rps": v, "total.p50_ms": p}
+                                 for v, p in ((100, 10), (101, 12), (99, 11), (100, 13))])
+    write_runs(results, "cand", [{"total.throughput_rps": v, "total.p50_ms": p}
+                                 for v, p in ((140, 12), (138, 10), (142, 13), (139, 11))])
+    assert verdicts(compare("base", "cand", results)) == {"total.throughput_rps": "improvement", "total.p50_ms": "ok"}
+
+
+def test_single_runs_are_too_few(results):
+    write_runs(results, "base", [{"total.p95_ms": 100}])
+    write_runs(results, "cand", [{"total.p95_ms": 101}])
+    assert verdicts(compare("base", "cand", results)) == {"total.p95_ms": "too few runs"}
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from remove_bg import remove_background_array
+
+
+def gray_row(levels, alpha=255):
+    """One-row RGBA image with a gray pixel per level."""
+    levels = np.asarray(levels, dtype=np.uint8)
+    return np.stack([levels, levels, levels, np.full_like(levels, alpha)], axis=-1)[None, :, :]
+
+
+@pytest.mark.parametrize("threshold, softness", [(245, 20), (245, 1), (10, 20), (254, 0)])
+def test_edge_levels_stay_finite_and_monotonic(threshold, softness):
+    levels = np.arange(256)
+    out = remove_background_array(gray_row(levels), threshold, softness)[0]
+    alpha = out[:, 3].astype(int)
+
+    # Above the threshold is background, at or below threshold - softness untouched
+    assert (alpha[levels > threshold] == 0).all()
+    assert (out[levels <= threshold - softness] == gray_row(levels)[0][levels <= threshold - softness]).all()
+    # The ramp never reaches 0 (old darkest == threshold case) and never increases with brightness
+    band = (levels > threshold - softness) & (levels <= threshold)
+    assert (alpha[band] > 0).all()
+    assert (np.diff(alpha[levels <= threshold]) <= 0).all()
+
+
+def test_threshold_pixel_is_unblended_from_white():
+    out = remove_background_array(gray_row([245]), threshold=245, softness=20)[0, 0]
+    # keep = 1/21: alpha 255/21, color (245 - 255 * 20/21) * 21 = 45
+    assert out.tolist() == [45, 45, 45, 12]
+
+
+def test_hard_cut_and_alpha_scaling():
+    out = remove_background_array(gray_row([0, 246, 255], alpha=100), threshold=245, softness=0)[0]
+    assert out[0].tolist() == [0, 0, 0, 100]
+    assert out[1].tolist() == [255, 255, 255, 0]
+    assert out[2].tolist() == [255, 255, 255, 0]
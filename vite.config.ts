@@ -19,6 +19,8 @@ export default defineConfig(({ mode }) => {
     },
     build: {
       sourcemap: true,
+      // dist/.vite/manifest.json, read by scripts/bundle_audit.py
+      manifest: true,
       rollupOptions: {
         output: {
           manualChunks: {